@@ -0,0 +1,119 @@
+"""
+@file bench_persistence.py
+@brief 对比“每次勾选立即写两次 JSON”与 WriteCoalescer 合并写入的开销。
+
+@details
+模拟一次连续勾选（burst）：旧实现每次勾选都重写 status 与 summary 两个文件；
+新实现把同一 burst 内的请求合并，只在防抖结束时各写一次；
+write-behind 列在合并的基础上把写盘交给后台线程，只统计 Tk 线程上的耗时。
+输出每个 burst 的写文件次数与主线程阻塞时间。
+
+用法（在项目根目录执行）：
+    python -m bench.bench_persistence
+"""
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from utils.file_utils import save_json, save_json_async, flush_writes
+from utils.persistence import WriteCoalescer
+
+BURST_SIZES = (1, 5, 20, 50)
+SEGMENTS = 48
+HISTORY_DAYS = 365
+
+
+class ManualScheduler:
+    """
+    @brief 最小化的 after/after_cancel 实现，由基准脚本手动触发到期任务。
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self._next_id = 0
+
+    def after(self, _ms, func):
+        self._next_id += 1
+        self.jobs[self._next_id] = func
+        return self._next_id
+
+    def after_cancel(self, job_id):
+        self.jobs.pop(job_id, None)
+
+    def run_pending(self):
+        jobs, self.jobs = self.jobs, {}
+        for func in jobs.values():
+            func()
+
+
+def legacy_save_json(path, data):
+    """
+    @brief 旧版 save_json：直接覆盖目标文件，无原子替换。
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def make_data():
+    status = {f"{i // 2:02d}:{(i % 2) * 30:02d}-x": False for i in range(SEGMENTS)}
+    start = date.today() - timedelta(days=HISTORY_DAYS)
+    summary = {(start + timedelta(days=i)).isoformat(): 0.5 for i in range(HISTORY_DAYS)}
+    return status, summary
+
+
+def run_legacy(workdir, burst):
+    status, summary = make_data()
+    writes = 0
+    start = time.perf_counter()
+    for i in range(burst):
+        status[list(status)[i % SEGMENTS]] = True
+        legacy_save_json(os.path.join(workdir, "status.json"), status)
+        legacy_save_json(os.path.join(workdir, "summary.json"), summary)
+        writes += 2
+    return writes, time.perf_counter() - start
+
+
+def run_coalesced(workdir, burst):
+    status, summary = make_data()
+    scheduler = ManualScheduler()
+    writer = WriteCoalescer(scheduler)
+    start = time.perf_counter()
+    for i in range(burst):
+        status[list(status)[i % SEGMENTS]] = True
+        writer.schedule("status", lambda: save_json(os.path.join(workdir, "status.json"), status))
+        writer.schedule("summary", lambda: save_json(os.path.join(workdir, "summary.json"), summary))
+    scheduler.run_pending()
+    return writer.writes, time.perf_counter() - start
+
+
+def run_write_behind(workdir, burst):
+    status, summary = make_data()
+    scheduler = ManualScheduler()
+    writer = WriteCoalescer(scheduler)
+    start = time.perf_counter()
+    for i in range(burst):
+        status[list(status)[i % SEGMENTS]] = True
+        writer.schedule("status", lambda: save_json_async(os.path.join(workdir, "status.json"), status))
+        writer.schedule("summary", lambda: save_json_async(os.path.join(workdir, "summary.json"), summary))
+    scheduler.run_pending()
+    elapsed = time.perf_counter() - start
+    flush_writes()
+    return writer.writes, elapsed
+
+
+def main():
+    print(f"{'burst':>6} | {'legacy writes':>13} {'ms':>7} | {'coalesced writes':>16} {'ms':>7} "
+          f"| {'write-behind writes':>19} {'ms':>7}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for burst in BURST_SIZES:
+            lw, lt = run_legacy(workdir, burst)
+            cw, ct = run_coalesced(workdir, burst)
+            ww, wt = run_write_behind(workdir, burst)
+            print(f"{burst:>6} | {lw:>13} {lt * 1000:>7.2f} | {cw:>16} {ct * 1000:>7.2f} "
+                  f"| {ww:>19} {wt * 1000:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
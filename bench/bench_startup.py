@@ -0,0 +1,116 @@
+"""
+@file bench_startup.py
+@brief 启动耗时基准：导入耗时（python -X importtime）与首帧绘制耗时，并与预算比较。
+
+@details
+1. 以 `python -X importtime -c "import main"` 统计 main 模块的累计导入耗时，
+   并检查启动阶段没有导入 matplotlib。
+2. 在临时目录中准备一个最小计划，启动 DailyProgressApp，处理完首批空闲任务
+   （进度条首绘）后立即退出，统计从进程创建到首帧完成的时间。
+任一指标超出预算时以非零状态码退出。需要图形环境与 ttkbootstrap。
+
+用法（在项目根目录执行）：
+    python -m bench.bench_startup [--import-budget-ms 600] [--draw-budget-ms 2500] [--runs 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_DRAW_SNIPPET = """
+import main
+app = main.DailyProgressApp()
+app.update()
+print("FIRST_DRAW", flush=True)
+app._on_close()
+"""
+
+
+def measure_import():
+    """
+    @brief 运行 -X importtime，返回 (main 累计导入微秒, 是否导入了 matplotlib)。
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    main_us = 0
+    has_matplotlib = False
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self_us, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if name == "main":
+            main_us = int(cumulative)
+        if name.startswith("matplotlib"):
+            has_matplotlib = True
+    return main_us, has_matplotlib
+
+
+def measure_first_draw(workdir):
+    """
+    @brief 启动应用直到首帧绘制完成，返回耗时（秒）。
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", FIRST_DRAW_SNIPPET],
+        cwd=workdir, env=env, stdout=subprocess.PIPE, text=True,
+    )
+    for line in proc.stdout:
+        if line.strip() == "FIRST_DRAW":
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        proc.wait()
+        raise RuntimeError("应用未能完成首帧绘制")
+    proc.wait()
+    return elapsed
+
+
+def prepare_workdir(workdir):
+    os.makedirs(os.path.join(workdir, "config"), exist_ok=True)
+    os.makedirs(os.path.join(workdir, "data"), exist_ok=True)
+    plan = {"id": "bench", "tasks": [{"time": f"{h:02d}:00-{h + 1:02d}:00", "task": f"任务{h}"} for h in range(24)]}
+    plan["tasks"][-1]["time"] = "23:00-24:00"
+    with open(os.path.join(workdir, "config", "bench.json"), "w", encoding="utf-8") as f:
+        json.dump(plan, f, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--import-budget-ms", type=float, default=600)
+    parser.add_argument("--draw-budget-ms", type=float, default=2500)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    import_ms = []
+    draw_ms = []
+    matplotlib_loaded = False
+    with tempfile.TemporaryDirectory() as workdir:
+        prepare_workdir(workdir)
+        for _ in range(args.runs):
+            main_us, has_mpl = measure_import()
+            import_ms.append(main_us / 1000)
+            matplotlib_loaded |= has_mpl
+            draw_ms.append(measure_first_draw(workdir) * 1000)
+
+    best_import, best_draw = min(import_ms), min(draw_ms)
+    print(f"import main       : {best_import:8.1f} ms  (budget {args.import_budget_ms:.0f} ms)")
+    print(f"time to first draw: {best_draw:8.1f} ms  (budget {args.draw_budget_ms:.0f} ms)")
+    print(f"matplotlib at startup: {'yes' if matplotlib_loaded else 'no'}")
+
+    failed = matplotlib_loaded or best_import > args.import_budget_ms or best_draw > args.draw_budget_ms
+    if failed:
+        print("FAILED: startup budget exceeded")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+@file bench_stats.py
+@brief 对比统计页切换计划时“清空并重建整张图”与“复用图元只更新数据”的延迟。
+
+@details
+旧实现每次切换都 figure.clear()、重建坐标轴与 colormap、重新创建 30 根柱子
+和 30 个文字标签；新实现（gui.charts.DailyBarChart）只更新柱高、颜色、
+标签文字与标题。两者都在 Agg 画布上完成一次完整绘制，不需要图形环境。
+输出每次切换的数据更新耗时与含绘制的总耗时（中位数）。
+另外测量“全部”范围（多年汇总）从汇总字典到按周/按月合并并更新图表的耗时，
+以及一整年日历热力图（单个 imshow）的更新与绘制耗时。
+
+用法（在项目根目录执行）：
+    python -m bench.bench_stats [--switches 50]
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.figure import Figure
+
+from gui.charts import DailyBarChart, CalendarHeatmap
+from utils.leave import LeaveCalendar
+from utils.stats import RatioSeries, calendar_start, calendar_grid
+
+DAYS = 30
+PLANS = 5
+ALL_TIME_YEARS = 10
+
+
+def make_plans():
+    """
+    @brief 生成若干计划的 30 天完成率（百分比）。
+    """
+    today = date.today()
+    dates = [(today - timedelta(days=i)).isoformat() for i in range(DAYS - 1, -1, -1)]
+    rng = random.Random(0)
+    return dates, [[rng.uniform(0, 100) for _ in dates] for _ in range(PLANS)]
+
+
+def legacy_plot(figure, dates, ratios):
+    """
+    @brief 旧版 plot_daily_bar 的绘制流程（不含 canvas.draw）。
+    """
+    figure.clear()
+    ax = figure.add_subplot(111)
+    cmap = LinearSegmentedColormap.from_list("green_shades", ["#ccffcc", "#006600"], N=100)
+    colors = [cmap(min(int(r), 99)) for r in ratios]
+    bars = ax.bar(dates, ratios, color=colors)
+    for bar, value in zip(bars, ratios):
+        ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 1, f"{int(value)}%",
+                ha='center', va='bottom', fontsize=8)
+    ax.set_ylim(0, 110)
+    ax.set_ylabel("完成率 (%)")
+    ax.set_xticks(dates)
+    ax.set_xticklabels(dates, rotation=45, ha='right')
+    ax.set_title(f"过去30天完成率（平均 {int(sum(ratios) / len(ratios))}%）")
+    figure.subplots_adjust(bottom=0.25, top=0.88)
+
+
+def run(switches, update):
+    """
+    @brief 连续切换 switches 次计划，返回 (更新耗时列表, 含绘制耗时列表)，单位秒。
+    """
+    dates, plans = make_plans()
+    figure = Figure(figsize=(12, 5.5), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    state = update(figure, None, dates, plans[0])
+    canvas.draw()
+
+    update_times, total_times = [], []
+    for i in range(switches):
+        ratios = plans[(i + 1) % PLANS]
+        start = time.perf_counter()
+        state = update(figure, state, dates, ratios)
+        mid = time.perf_counter()
+        canvas.draw()
+        end = time.perf_counter()
+        update_times.append(mid - start)
+        total_times.append(end - start)
+    return update_times, total_times
+
+
+def legacy_update(figure, _state, dates, ratios):
+    legacy_plot(figure, dates, ratios)
+
+
+def reuse_update(figure, chart, dates, ratios):
+    if chart is None:
+        chart = DailyBarChart(figure)
+    chart.update(dates, ratios, f"过去30天完成率（平均 {int(sum(ratios) / len(ratios))}%）")
+    return chart
+
+
+def run_all_time(repeats):
+    """
+    @brief 以 ALL_TIME_YEARS 年的汇总数据测量“全部”范围，返回 (计算+更新耗时, 含绘制耗时) 中位数，单位秒。
+    """
+    today = date.today()
+    rng = random.Random(1)
+    summary = {(today - timedelta(days=i)).isoformat(): rng.random() for i in range(ALL_TIME_YEARS * 365)}
+    figure = Figure(figsize=(12, 5.5), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    chart = DailyBarChart(figure)
+
+    update_times, total_times = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        series = RatioSeries.from_summary(summary, None, today.isoformat())
+        buckets = series.bucketed()
+        chart.update(buckets["labels"], buckets["mean"], "全部完成率", buckets["low"], buckets["high"])
+        mid = time.perf_counter()
+        canvas.draw()
+        end = time.perf_counter()
+        update_times.append(mid - start)
+        total_times.append(end - start)
+    return statistics.median(update_times), statistics.median(total_times)
+
+
+def run_heatmap(repeats):
+    """
+    @brief 测量最近一年日历热力图，返回 (计算+更新耗时, 含绘制耗时) 中位数，单位秒。
+    """
+    today = date.today()
+    rng = random.Random(2)
+    summary = {(today - timedelta(days=i)).isoformat(): rng.random() for i in range(400)}
+    leave = LeaveCalendar([(today - timedelta(days=i)).isoformat() for i in range(3, 400, 17)])
+    figure = Figure(figsize=(12, 5.5), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    heatmap = CalendarHeatmap(figure)
+    heatmap.set_visible(True)
+
+    update_times, total_times = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        series = RatioSeries.from_summary(summary, calendar_start(today.isoformat()), today.isoformat())
+        heatmap.update(calendar_grid(series.exclude_leave(leave)), "最近一年完成率")
+        mid = time.perf_counter()
+        canvas.draw()
+        end = time.perf_counter()
+        update_times.append(mid - start)
+        total_times.append(end - start)
+    return statistics.median(update_times), statistics.median(total_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--switches", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'mode':>8} | {'update ms':>9} | {'update+draw ms':>14}")
+    for name, update in (("rebuild", legacy_update), ("reuse", reuse_update)):
+        update_times, total_times = run(args.switches, update)
+        print(f"{name:>8} | {statistics.median(update_times) * 1000:>9.2f} "
+              f"| {statistics.median(total_times) * 1000:>14.2f}")
+
+    update_time, total_time = run_all_time(10)
+    print(f"all-time ({ALL_TIME_YEARS} years): update {update_time * 1000:.2f} ms, update+draw {total_time * 1000:.2f} ms")
+
+    update_time, total_time = run_heatmap(10)
+    print(f"calendar heatmap (1 year): update {update_time * 1000:.2f} ms, update+draw {total_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+@file bench_validate.py
+@brief 对比旧版 save_config 校验流程与 validate_intervals 单次扫描的耗时。
+
+@details
+旧流程：逐行 strptime 解析，再按字符串开始时间排序，对相邻两行调用 time_overlap
+（每次重新 strptime），最后 is_full_day_covered 再全部解析一遍，并且遇到第一个错误即返回。
+新流程：每行只解析一次为整数分钟，排序后一次扫描报告全部问题。
+输出每种规模下的耗时（中位数）与报告的问题数。
+
+用法（在项目根目录执行）：
+    python -m bench.bench_validate
+"""
+import random
+import statistics
+import time
+from datetime import datetime
+
+from utils.time_utils import (auto_pad_time, is_time_format_valid, time_overlap, is_full_day_covered,
+                              validate_intervals)
+
+REPEATS = 5
+
+
+def legacy_validate(ranges, names):
+    """
+    @brief 旧版 save_config 中的校验逻辑（不含对话框），返回发现的问题数（0 或 1）。
+    """
+    tasks = []
+    for time_text, task in zip(ranges, names):
+        time_range = auto_pad_time(time_text.strip())
+        if not time_range or not task.strip():
+            return 1
+        if not is_time_format_valid(time_range):
+            return 1
+        try:
+            start_str, end_str = time_range.split('-')
+            if end_str == "24:00":
+                end_str = "23:59"
+            start_time = datetime.strptime(start_str, "%H:%M")
+            end_time = datetime.strptime(end_str, "%H:%M")
+        except Exception:
+            return 1
+        if end_time <= start_time:
+            return 1
+        tasks.append({"time": time_range, "task": task})
+
+    sorted_times = sorted(enumerate(t["time"] for t in tasks), key=lambda x: x[1].split('-')[0])
+    for i in range(len(sorted_times) - 1):
+        if time_overlap(sorted_times[i][1], sorted_times[i + 1][1]):
+            return 1
+    return 0 if is_full_day_covered(tasks) else 1
+
+
+def minute_plan(step):
+    """
+    @brief 以 step 分钟为一段、完整覆盖全天的合法计划（打乱行顺序）。
+    """
+    ranges = [f"{m // 60:02d}:{m % 60:02d}-{(m + step) // 60:02d}:{(m + step) % 60:02d}"
+              for m in range(0, 1440, step)]
+    random.Random(step).shuffle(ranges)
+    return ranges, ["任务"] * len(ranges)
+
+
+def messy_plan(rows):
+    """
+    @brief 随机生成的计划：含重叠、空档、颠倒与格式错误的行。
+    """
+    rng = random.Random(rows)
+    ranges = []
+    for _ in range(rows):
+        start = rng.randrange(0, 1430)
+        end = start + rng.randrange(-30, 120)
+        end = min(max(end, 0), 1440)
+        text = f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"
+        if rng.random() < 0.01:
+            text = text.replace(":", "")
+        ranges.append(text)
+    return ranges, ["任务"] * rows
+
+
+def measure(func, ranges, names):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func(ranges, names)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    cases = [
+        ("valid, 5-min rows", minute_plan(5)),
+        ("valid, 1-min rows", minute_plan(1)),
+        ("messy, 2000 rows", messy_plan(2000)),
+        ("messy, 10000 rows", messy_plan(10000)),
+    ]
+    print(f"{'case':>20} {'rows':>6} | {'legacy ms':>9} {'issues':>6} | {'sweep ms':>8} {'issues':>6}")
+    for name, (ranges, names) in cases:
+        legacy_t, legacy_issues = measure(legacy_validate, ranges, names)
+        sweep_t, issues = measure(validate_intervals, ranges, names)
+        print(f"{name:>20} {len(ranges):>6} | {legacy_t * 1000:>9.2f} {legacy_issues:>6} "
+              f"| {sweep_t * 1000:>8.2f} {len(issues):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import time
+
+FRAME_MS = 16           # 帧间隔（约 60 fps）
+SLIDE_DURATION_MS = 200  # 完整滑动一次（隐藏 <-> 展开）的时长
+
+
+def ease_out_cubic(t: float) -> float:
+    """
+    @brief 缓出曲线：开始快、结束慢。
+    @param t 进度 0~1
+    """
+    return 1 - (1 - t) ** 3
+
+
+class SlideAnimator:
+    """
+    @class SlideAnimator
+    @brief 基于时间的窗口纵向滑动动画，可在中途反向。
+
+    @details
+    每帧按已流逝的时间（而非已执行的步数）计算位置，CPU 繁忙导致回调延迟时
+    直接跳到应在的位置，动画总时长保持不变；帧回调按固定帧间隔对齐，
+    超过一个帧间隔才执行的帧计入 dropped_frames。
+    动画进行中调用 slide_to() 指向新目标时，从当前位置出发，
+    时长按剩余距离占完整距离的比例缩放，因此展开/隐藏可随时平滑反向。
+    """
+
+    def __init__(self, window, duration_ms: int = SLIDE_DURATION_MS, frame_ms: int = FRAME_MS, easing=ease_out_cubic):
+        """
+        @param window 要移动的顶层窗口（提供 winfo_x/winfo_y/geometry/after）
+        @param duration_ms 滑过完整距离的时长
+        @param frame_ms 帧间隔
+        @param easing 缓动函数
+        """
+        self.window = window
+        self.duration_ms = duration_ms
+        self.frame_ms = frame_ms
+        self.easing = easing
+
+        self.target = None
+        self.last_y = None       # 最近一次由动画设置的 y 坐标
+        self._current_y = None   # 当前插值位置（未取整），中途反向时从这里出发
+        self._job = None
+        self._on_complete = None
+
+        # 统计
+        self.animations = 0      # 完成的动画次数
+        self.reversals = 0       # 中途反向次数
+        self.frames = 0          # 实际执行的帧数
+        self.dropped_frames = 0  # 因回调延迟而跳过的帧数
+        self.total_ms = 0.0      # 所有动画的累计耗时（含反向前的部分）
+
+    @property
+    def running(self) -> bool:
+        return self._job is not None
+
+    def slide_to(self, to_y: int, full_distance: int, on_complete=None) -> None:
+        """
+        @brief 开始（或中途改向）滑动到 to_y。
+        @param to_y 目标 y 坐标
+        @param full_distance 隐藏与展开两个位置之间的完整距离，用于按比例计算时长
+        @param on_complete 到达目标后的回调
+        """
+        if self.running and to_y == self.target:
+            self._on_complete = on_complete
+            return
+        if self.running:
+            # 中途反向：从当前插值位置出发（winfo_y 可能尚未反映最近一次 geometry，
+            # 第一帧之前反向时即为上一段动画的起点）
+            self.reversals += 1
+            self.window.after_cancel(self._job)
+            self._from_y = self._current_y
+        else:
+            self._began = time.perf_counter()
+            self._from_y = self._current_y = self.last_y = self.window.winfo_y()
+            self._x = self.window.winfo_x()
+
+        self.target = to_y
+        self._on_complete = on_complete
+        distance = abs(to_y - self._from_y)
+        self._duration = self.duration_ms * min(1.0, distance / full_distance) if full_distance else 0
+        self._start = self._last_frame = time.perf_counter()
+        self._job = self.window.after(0, self._frame)
+
+    def _frame(self) -> None:
+        now = time.perf_counter()
+        late = (now - self._last_frame) * 1000 - self.frame_ms
+        if late >= self.frame_ms:
+            self.dropped_frames += int(late // self.frame_ms)
+        self._last_frame = now
+        self.frames += 1
+
+        elapsed = (now - self._start) * 1000
+        progress = 1.0 if elapsed >= self._duration else elapsed / self._duration
+        self._current_y = self._from_y + (self.target - self._from_y) * self.easing(progress)
+        y = round(self._current_y)
+        if y != self.last_y:
+            self.last_y = y
+            self.window.geometry(f"+{self._x}+{y}")
+
+        if progress >= 1.0:
+            self._job = None
+            self.animations += 1
+            self.total_ms += (now - self._began) * 1000
+            on_complete, self._on_complete = self._on_complete, None
+            if on_complete:
+                on_complete()
+            return
+
+        # 对齐到下一个帧时刻，而不是在本帧耗时之后再等一个完整间隔
+        next_frame = self.frame_ms - (elapsed % self.frame_ms)
+        self._job = self.window.after(max(1, round(next_frame)), self._frame)
+
+    def cancel(self) -> None:
+        """
+        @brief 停止动画（停在当前位置，不调用完成回调）。
+        """
+        if self._job is not None:
+            self.window.after_cancel(self._job)
+            self._job = None
+            self._on_complete = None
+
+    def stats(self) -> dict:
+        """
+        @brief 动画统计：次数、反向次数、帧数、丢帧数与累计/平均耗时（毫秒）。
+        """
+        return {
+            "animations": self.animations,
+            "reversals": self.reversals,
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "total_ms": round(self.total_ms, 1),
+            "avg_ms": round(self.total_ms / self.animations, 1) if self.animations else 0.0,
+        }
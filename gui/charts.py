@@ -0,0 +1,152 @@
+import numpy as np
+from matplotlib.colors import LinearSegmentedColormap
+
+# 渐变绿色 colormap（0% -> 浅绿, 100% -> 深绿）
+GREEN_SHADES = LinearSegmentedColormap.from_list("green_shades", ["#ccffcc", "#006600"], N=100)
+
+LABEL_BARS = 31  # 柱数不超过该值时才在柱顶显示数值
+LEAVE_COLOR = "#d9d9d9"  # 热力图中请假日的颜色
+WEEKDAY_LABELS = ["一", "", "三", "", "五", "", "日"]
+
+
+class DailyBarChart:
+    """
+    @class DailyBarChart
+    @brief 可复用图元的每日完成率柱状图。
+
+    @details
+    坐标轴、柱子与数值标签只在柱数变化时创建；切换计划时仅更新
+    柱高、颜色、标签文字、刻度文字与标题，随后由调用方 draw_idle() 重绘。
+    按周/按月合并的数据额外以竖线表示桶内最低~最高完成率。
+    与 Tk 无关，可直接用于 Agg 画布（基准测试）。
+    """
+
+    def __init__(self, figure):
+        """
+        @brief 在给定 Figure 上创建坐标轴。
+        @param figure matplotlib.figure.Figure
+        """
+        self.figure = figure
+        self.ax = figure.add_subplot(111)
+        self.ax.set_ylim(0, 110)
+        self.ax.set_ylabel("完成率 (%)")
+        self.title = self.ax.set_title("")
+        self.ranges = self.ax.vlines([], [], [], colors="#555555", linewidth=1, zorder=3)
+        figure.subplots_adjust(bottom=0.25, top=0.88)
+
+        self.bars = []
+        self.labels = []
+        self._dates = None
+
+    def set_visible(self, visible: bool) -> None:
+        """
+        @brief 显示/隐藏柱状图（与热力图共用同一 Figure）。
+        """
+        self.ax.set_visible(visible)
+
+    def _build_artists(self, count: int) -> None:
+        """
+        @brief 创建 count 根柱子和对应的数值标签（替换旧图元）。
+        """
+        for artist in self.bars + self.labels:
+            artist.remove()
+
+        positions = range(count)
+        self.bars = list(self.ax.bar(positions, [0] * count, color=GREEN_SHADES(0)))
+        self.labels = [
+            self.ax.text(bar.get_x() + bar.get_width() / 2, 1, "", ha='center', va='bottom', fontsize=8)
+            for bar in self.bars
+        ]
+        self.ax.set_xlim(-0.6, count - 0.4)
+        self.ax.set_xticks(list(positions))
+        self._dates = None
+
+    def update(self, dates: list[str], ratios, title: str, low=None, high=None) -> None:
+        """
+        @brief 以新数据更新图表（不重新创建图元，除非柱数变化）。
+        @param dates 日期字符串列表（横轴刻度文字）
+        @param ratios 与 dates 对应的完成率（百分比 0~100，NaN 表示请假）
+        @param title 图表标题
+        @param low 可选，各柱对应区间内的最低完成率
+        @param high 可选，各柱对应区间内的最高完成率
+        """
+        if len(dates) != len(self.bars):
+            self._build_artists(len(dates))
+
+        show_labels = len(dates) <= LABEL_BARS
+        for bar, label, value in zip(self.bars, self.labels, ratios):
+            leave = np.isnan(value)  # 请假日（或整段都是请假日）不画柱子
+            bar.set_height(0 if leave else value)
+            bar.set_color(GREEN_SHADES(0 if leave else min(int(value), 99)))
+            label.set_visible(show_labels)
+            if show_labels:
+                label.set_y(1 if leave else value + 1)
+                label.set_text("假" if leave else f"{int(value)}%")
+
+        if low is not None and high is not None:
+            self.ranges.set_segments([[(x, lo), (x, hi)] for x, lo, hi in zip(range(len(dates)), low, high)
+                                      if not np.isnan(lo)])
+        else:
+            self.ranges.set_segments([])
+
+        if dates != self._dates:
+            step = -(-len(dates) // LABEL_BARS) if dates else 1  # 柱数较多时隔几根显示一个刻度
+            shown = [d if i % step == 0 else "" for i, d in enumerate(dates)]
+            self.ax.set_xticklabels(shown, rotation=45, ha='right')
+            self._dates = list(dates)
+
+        self.title.set_text(title)
+
+
+class CalendarHeatmap:
+    """
+    @class CalendarHeatmap
+    @brief 一年概览的日历热力图（类似 GitHub 贡献图）。
+
+    @details
+    整张图只有一个 imshow 图像（7 行 × 53 列），更新数据只替换像素数组，
+    不会像柱状图那样为每一天创建 patch 和文字。请假日被遮罩并以灰色显示，
+    区间外（如本周尚未到来的日期）完全透明。
+    """
+
+    def __init__(self, figure, weeks: int = 53):
+        """
+        @brief 在给定 Figure 上创建坐标轴与图像（初始隐藏）。
+        @param figure matplotlib.figure.Figure
+        @param weeks 列数（周数）
+        """
+        self.ax = figure.add_subplot(111)
+        cmap = GREEN_SHADES.with_extremes(bad=LEAVE_COLOR)
+        self.image = self.ax.imshow(np.zeros((7, weeks)), cmap=cmap, vmin=0, vmax=100,
+                                    aspect="equal", interpolation="nearest")
+        self.ax.set_yticks(range(7))
+        self.ax.set_yticklabels(WEEKDAY_LABELS)
+        self.ax.tick_params(length=0)
+        for spine in self.ax.spines.values():
+            spine.set_visible(False)
+        self.title = self.ax.set_title("")
+        self._ticks = None
+        self.ax.set_visible(False)
+
+    def set_visible(self, visible: bool) -> None:
+        """
+        @brief 显示/隐藏热力图。
+        """
+        self.ax.set_visible(visible)
+
+    def update(self, grid: dict, title: str) -> None:
+        """
+        @brief 以 utils.stats.calendar_grid() 的结果更新图像。
+        @param grid {"values", "inside", "month_ticks"}
+        @param title 图表标题
+        """
+        self.image.set_data(grid["values"])
+        self.image.set_alpha(grid["inside"].astype(float))
+
+        if grid["month_ticks"] != self._ticks:
+            columns = [c for c, _ in grid["month_ticks"]]
+            self.ax.set_xticks(columns)
+            self.ax.set_xticklabels([label for _, label in grid["month_ticks"]])
+            self._ticks = list(grid["month_ticks"])
+
+        self.title.set_text(title)
@@ -1,23 +1,43 @@
 import os
+import math
 import tkinter as tk
+from bisect import bisect_right
+import tkinter.font as tkfont
 from datetime import datetime, timedelta
-from tkinter import messagebox
-from ttkbootstrap import Frame, Label, Checkbutton, BooleanVar, Button, Combobox
+from tkinter import messagebox, simpledialog
+from ttkbootstrap import Frame, Label, Button, Combobox
 from ttkbootstrap.dialogs import Messagebox
 
-from utils.file_utils import list_config_ids, load_json, save_json, get_today
-from utils.time_utils import time_to_minutes, str_to_datetime
+from utils.file_utils import list_config_ids, load_json, get_today, get_storage
+from utils.time_utils import time_to_minutes, minute_of_day, PlanTimeline
+from utils.persistence import WriteCoalescer
+from utils.history import CompletionBits
+from utils.leave import parse_leave_input
+from utils.metrics import summarize, format_metrics
+from utils.notify import NotificationQueue, load_notified, save_notified, load_notify_settings
+from gui.toast import ToastStack
 
 # ---------- 颜色定义 ----------
 LIGHT_GRAY  = "#e0e0e0"
 LIGHT_RED   = "#ffcccc"
 LIGHT_GREEN = "#ccffcc"
 GRAY_BORDER = "#999999"
+DISABLED_GRAY = "#bbbbbb"
 
 RIGHT_GAP = 0
 BAR_W = 36
 TEXT_W = 160
 
+# ---------- 画布勾选框 ----------
+CHECK_SIZE = 14  # 勾选框边长
+CHECK_HIT = 12   # 点击判定的半径（比勾选框略大，便于点中）
+
+# ---------- 刷新调度 ----------
+TICK_MIN_MS = 20          # 两次唤醒的最小间隔
+TICK_MAX_MS = 60_000      # 最长休眠（兜底，保证至少每分钟对一次时钟）
+TICK_MARGIN_MS = 5        # 在边界之后略微延迟唤醒，避免计时器提前触发
+RESYNC_TOLERANCE_S = 2.0  # 实际唤醒偏离预期超过该值视为挂起/时钟跳变
+
 class ProgressPage(Frame):
     """
     @class ProgressPage
@@ -49,41 +69,37 @@ class ProgressPage(Frame):
             self.plan_data.get("tasks", []),
             key=lambda t: time_to_minutes(t["time"].split("-")[0])
         )
+        self.timeline = PlanTimeline(self.tasks)
 
-        self.status_file = f"data/status_{self.plan_id}.json"
-        self.status = load_json(self.status_file, {})
-
-        # 检查日期是否为今天
-        status_date = self.status.get("_date")
-        today = get_today()
-
-        if status_date != today:
-            self.status = {task["time"]: False for task in self.tasks}
-            self.status["_date"] = today
-            save_json(self.status_file, self.status)
+        self.storage = get_storage()
+        self._load_status()
 
-        self.check_vars: list[tuple[dict, BooleanVar]] = []
+        # 连续勾选时合并写入，静默后一次性保存 status 与 summary
+        self._writer = WriteCoalescer(self)
 
         self.sidebar = None
         self.orientation_btn = None
+        self._ui_update_job = None
+        self._next_wake: datetime | None = None
+        self._wakeups = 0
+        self._resyncs = 0
+
+        # 窗口尺寸缓存：布局键 -> (宽, 高)；_applied_layout 为当前控件已应用的布局键
+        self._layout_cache: dict[tuple, tuple[int, int]] = {}
+        self._applied_layout = None
+        self._layout_applies = 0
+
         self.build_ui()
-        self.after(1000, self.update_ui_periodically)
+        self._schedule_next_tick()
         self.after_idle(self.adjust_layout)
         self._layout_locked = False
-        
-        # 初始化当天已提醒集合
-        self._notified_starts: set[str] = set()
 
-        # 可选：启动时对“当前正在进行的段”的开始做忽略，避免启动即提醒
-        now = datetime.now()
-        today = now.date()
-        for task in self.tasks:
-            s_str, e_str = task["time"].split("-")
-            s_dt = str_to_datetime(today, s_str)
-            e_dt = str_to_datetime(today, e_str)
-            if s_dt <= now < e_dt:
-                self._notified_starts.add(f"{self.date}::{task['time']}")
-                break
+        # 提醒：当天已发出的提醒（持久化，重启后不重复）与待发事件队列；
+        # 程序关闭期间错过、尚未发出的提醒在启动后合并为一条补发
+        self.toasts = ToastStack(self)
+        self._notify_job = None
+        self._notified_starts: set[str] = load_notified(self.plan_id, self.date)
+        self._build_notifications()
 
     # ------------------------------ UI 构建 ------------------------------ #
     def build_ui(self) -> None:
@@ -97,6 +113,7 @@ class ProgressPage(Frame):
 
        @note 此方法应在窗口初始化或切换计划/方向时被调用。
        """
+       self._applied_layout = None  # 控件重建后需重新应用一次尺寸
        if self.vertical:
            self.top_row_frame = Frame(self)
            self.top_row_frame.pack(side=tk.TOP, fill=tk.X, anchor="nw")
@@ -145,6 +162,7 @@ class ProgressPage(Frame):
        else:
            self.canvas = tk.Canvas(self.center_frame, height=130)
            self.canvas.pack(fill=tk.BOTH, expand=True, padx=10)
+       self.canvas.bind("<Button-1>", self._on_canvas_click)
 
        self.right_frame = Frame(self, width=200)
        if self.vertical:
@@ -158,276 +176,509 @@ class ProgressPage(Frame):
        pad_top = 20 if self.vertical else 48
        self.progress_label.pack(pady=(pad_top, 5), anchor="center")
 
+       # 连续达标天数、滚动平均与周环比（随每日汇总增量更新）
+       self.metrics_label = Label(self.right_frame, text="", font=("Helvetica", 9), justify="center")
+       self.metrics_label.pack(pady=(0, 5), anchor="center")
+       self._show_metrics(self._preview_metrics())
+
+       # 新画布需要重新创建保留场景
+       self._scene: list[dict] = []
+       self._seg_starts: list[int] = []
+       self._scene_key = None
+
        self.after_idle(self.draw_progress_bar)
 
     # ------------------------------ 绘制进度 ------------------------------ #
     def draw_progress_bar(self) -> None:
         """
-        @brief 绘制所有任务的进度条、勾选框、时间和任务名。
+        @brief 刷新所有任务的进度条、勾选框、时间和任务名。
 
         @details
-        清除旧内容后，根据当前时间、任务配置与完成状态绘制不同颜色的进度段：
+        采用保留模式绘制：画布图元（矩形、文字、勾选框）在计划/方向/画布尺寸
+        变化时由 _build_scene() 创建一次，之后每次调用只对状态发生变化的段
+        执行 itemconfig/coords：
         - 浅灰：已过去未完成
         - 浅绿：已完成
-        - 浅红：当前任务进行中
+        - 浅红：当前任务进行中（仅更新填充宽度）
         - 白色：未来任务
-        每个任务段附带文字与勾选按钮，支持横向与竖向两种布局方式。
 
         @note 若 Canvas 初次布局尚未就绪，将延迟重新执行此函数。
         """
-        for child in self.canvas.winfo_children():
-            child.destroy()
-        self.canvas.delete("all")
-        self.check_vars.clear()
-
         total = len(self.tasks)
         if total == 0:
             return
 
-        now_dt = datetime.now()
-        today = now_dt.date()
+        extent = self.canvas.winfo_height() if self.vertical else self.canvas.winfo_width()
+        if extent < 100:
+            self.after(100, self.draw_progress_bar)
+            return
 
-        first_start = str_to_datetime(today, self.tasks[0]["time"].split("-")[0])
-        last_end = str_to_datetime(today, self.tasks[-1]["time"].split("-")[1])
-        total_span_seconds = max(1, (last_end - first_start).total_seconds())
-        passed_seconds = min(max(0, (now_dt - first_start).total_seconds()), total_span_seconds)
-        gray_ratio = passed_seconds / total_span_seconds
+        scene_key = (self.vertical, extent, total)
+        rebuilt = self._scene_key != scene_key
+        if rebuilt:
+            self._build_scene(extent)
+            self._scene_key = scene_key
 
-        if not self.vertical:
-            canvas_w = self.canvas.winfo_width()
-            if canvas_w < 100:
-                self.after(100, self.draw_progress_bar)
-                return
+        self._refresh_scene()
+        self.update_progress()
+
+        # 场景尺寸变化会改变填充的像素步长，需重新安排已挂起的唤醒
+        if rebuilt and self._ui_update_job is not None:
+            self._schedule_next_tick()
+
+    def _build_scene(self, extent: int) -> None:
+        """
+        @brief 创建所有任务段的画布图元，仅在计划、方向或画布尺寸变化时调用。
+
+        @param extent 画布在进度方向上的长度（横向为宽度，竖向为高度）
+
+        @details
+        每个任务段包含：底色矩形、进行中填充矩形（默认隐藏）、边框矩形、
+        时间文字、任务名文字与一个画布绘制的勾选框（方框 + 对勾折线）。
+        图元 ID 记录在 self._scene 中，供 _refresh_scene() 按需更新；
+        各段起点记录在 self._seg_starts 中，供点击时二分查找。
+        """
+        self.canvas.delete("all")
+        self._scene = []
+
+        total = len(self.tasks)
+        seg = extent / total
+        self._seg_starts = [int(i * seg) for i in range(total)]
 
+        if not self.vertical:
             bar_top, bar_bottom = 20, 50
-            seg_w = canvas_w / total
-
-            self.canvas.create_rectangle(0, bar_top,
-                                         int(canvas_w * gray_ratio), bar_bottom,
-                                         fill=LIGHT_GRAY, outline="")
-
-            for i, task in enumerate(self.tasks):
-                start_str, end_str = task["time"].split("-")
-                s_dt = str_to_datetime(today, start_str)
-                e_dt = str_to_datetime(today, end_str)
-
-                x0, x1 = int(i * seg_w), int((i + 1) * seg_w)
-                mid_x = (x0 + x1) // 2
-
-                is_now = s_dt <= now_dt < e_dt
-                is_past = e_dt <= now_dt
-                is_future = s_dt > now_dt
-                is_done = bool(self.status.get(task["time"], False))
-
-                if is_done:
-                    outline = "green"
-                elif is_now:
-                    outline = "red"
-                elif is_future:
-                    outline = "black"
-                else:
-                    outline = GRAY_BORDER
-
-                if is_done:
-                    self.canvas.create_rectangle(x0, bar_top, x1, bar_bottom,
-                                                 fill=LIGHT_GREEN, outline=outline, width=2)
-                elif is_now:
-                    seg_total = max(1, (e_dt - s_dt).total_seconds())
-                    seg_passed = (now_dt - s_dt).total_seconds()
-                    ratio = seg_passed / seg_total
-                    fill_x = x0 + int((x1 - x0) * ratio)
-
-                    self.canvas.create_rectangle(x0, bar_top, x1, bar_bottom, fill="white", outline="")
-                    self.canvas.create_rectangle(x0, bar_top, fill_x, bar_bottom, fill=LIGHT_RED, outline="")
-                    self.canvas.create_rectangle(x0, bar_top, x1, bar_bottom, outline=outline, width=2)
-                else:
-                    base = LIGHT_GRAY if is_past else "white"
-                    self.canvas.create_rectangle(x0, bar_top, x1, bar_bottom,
-                                                 fill=base, outline=outline, width=2)
-
-                label_color = "green" if is_done else "red" if is_now else "black"
-                self.canvas.create_text(mid_x, bar_bottom + 15, text=task["time"], font=("Arial", 9),
-                                        anchor="center", fill=label_color)
-
-                var = BooleanVar(value=is_done)
-                cb = Checkbutton(self.canvas, variable=var,
-                                 command=lambda t=task, v=var: self.toggle_task(t, v))
-                cb.state(["!alternate"])
-                if is_future:
-                    cb.state(["disabled"])
-                self.check_vars.append((task, var))
-                self.canvas.create_window(mid_x, bar_bottom + 35, window=cb, anchor="center")
-
-                self.canvas.create_text(mid_x, bar_bottom + 55, text=task["task"],
-                                        font=("Arial", 10), anchor="center")
+            self._gray_item = self.canvas.create_rectangle(0, bar_top, 0, bar_bottom,
+                                                           fill=LIGHT_GRAY, outline="")
         else:
-            canvas_h = self.canvas.winfo_height()
-            if canvas_h < 100:
-                self.after(100, self.draw_progress_bar)
-                return
-
             bar_left, bar_right = 16, 50
-            seg_h = canvas_h / total
-
-            self.canvas.create_rectangle(bar_left, 0,
-                                         bar_right, int(canvas_h * gray_ratio),
-                                         fill=LIGHT_GRAY, outline="")
-
-            for i, task in enumerate(self.tasks):
-                start_str, end_str = task["time"].split("-")
-                s_dt = str_to_datetime(today, start_str)
-                e_dt = str_to_datetime(today, end_str)
-
-                y0, y1 = int(i * seg_h), int((i + 1) * seg_h)
-                mid_y = (y0 + y1) // 2
-
-                is_now = s_dt <= now_dt < e_dt
-                is_past = e_dt <= now_dt
-                is_future = s_dt > now_dt
-                is_done = bool(self.status.get(task["time"], False))
-
-                if is_done:
-                    outline = "green"
-                elif is_now:
-                    outline = "red"
-                elif is_future:
-                    outline = "black"
-                else:
-                    outline = GRAY_BORDER
-
-                if is_done:
-                    self.canvas.create_rectangle(bar_left, y0, bar_right, y1,
-                                                 fill=LIGHT_GREEN, outline=outline, width=2)
-                elif is_now:
-                    seg_total = max(1, (e_dt - s_dt).total_seconds())
-                    seg_passed = (now_dt - s_dt).total_seconds()
-                    ratio = seg_passed / seg_total
-                    fill_y = y0 + int((y1 - y0) * ratio)
-
-                    self.canvas.create_rectangle(bar_left, y0, bar_right, y1, fill="white", outline="")
-                    self.canvas.create_rectangle(bar_left, y0, bar_right, fill_y, fill=LIGHT_RED, outline="")
-                    self.canvas.create_rectangle(bar_left, y0, bar_right, y1, outline=outline, width=2)
-                else:
-                    base = LIGHT_GRAY if is_past else "white"
-                    self.canvas.create_rectangle(bar_left, y0, bar_right, y1,
-                                                 fill=base, outline=outline, width=2)
-
-                label_color = "green" if is_done else "red" if is_now else "black"
+            self._gray_item = self.canvas.create_rectangle(bar_left, 0, bar_right, 0,
+                                                           fill=LIGHT_GRAY, outline="")
+        self._gray_extent = extent
+        self._gray_px = None
+
+        for i, task in enumerate(self.tasks):
+            a0, a1 = int(i * seg), int((i + 1) * seg)
+            mid = (a0 + a1) // 2
+
+            if not self.vertical:
+                box = (a0, bar_top, a1, bar_bottom)
+            else:
+                box = (bar_left, a0, bar_right, a1)
+
+            base = self.canvas.create_rectangle(*box, fill="white", outline="")
+            fill = self.canvas.create_rectangle(*box, fill=LIGHT_RED, outline="", state="hidden")
+            frame = self.canvas.create_rectangle(*box, outline="black", width=2)
+
+            if not self.vertical:
+                time_item = self.canvas.create_text(mid, bar_bottom + 15, text=task["time"],
+                                                    font=("Arial", 9), anchor="center")
+                check_center = (mid, bar_bottom + 35)
+                self.canvas.create_text(mid, bar_bottom + 55, text=task["task"],
+                                        font=("Arial", 10), anchor="center")
+            else:
                 label_x = bar_right + 20
-                self.canvas.create_text(label_x, mid_y - 8, text=task["time"],
-                                        font=("Arial", 9), anchor="w", fill=label_color)
-
-                var = BooleanVar(value=is_done)
-                cb = Checkbutton(self.canvas, variable=var,
-                                 command=lambda t=task, v=var: self.toggle_task(t, v))
-                cb.state(["!alternate"])
-                if is_future:
-                    cb.state(["disabled"])
-                self.check_vars.append((task, var))
-                self.canvas.create_window(label_x + 80, mid_y - 8, window=cb, anchor="w")
-
-                self.canvas.create_text(label_x, mid_y + 8, text=task["task"],
+                time_item = self.canvas.create_text(label_x, mid - 8, text=task["time"],
+                                                    font=("Arial", 9), anchor="w")
+                check_center = (label_x + 80 + CHECK_SIZE // 2, mid - 8)
+                self.canvas.create_text(label_x, mid + 8, text=task["task"],
                                         font=("Arial", 10), anchor="w")
+            check_box, check_mark = self._create_checkbox(*check_center)
+
+            self._scene.append({
+                "box": box,
+                "base": base,
+                "fill": fill,
+                "frame": frame,
+                "time": time_item,
+                "check_box": check_box,
+                "check_mark": check_mark,
+                "check_center": check_center,
+                "state": None,
+                "fill_px": None,
+            })
+
+    def _create_checkbox(self, cx: int, cy: int) -> tuple[int, int]:
+        """
+        @brief 在画布上绘制一个以 (cx, cy) 为中心的勾选框。
+        @return (方框图元 ID, 对勾图元 ID)，对勾默认隐藏
+        """
+        half = CHECK_SIZE // 2
+        box = self.canvas.create_rectangle(cx - half, cy - half, cx + half, cy + half,
+                                           fill="white", outline=GRAY_BORDER, width=1)
+        mark = self.canvas.create_line(cx - half + 3, cy, cx - 1, cy + half - 3, cx + half - 3, cy - half + 3,
+                                       fill="white", width=2, state="hidden")
+        return box, mark
+
+    def _refresh_scene(self) -> None:
+        """
+        @brief 根据当前时间与完成状态，仅更新发生变化的画布图元。
 
-        self.update_progress()
+        @details
+        每段缓存上一次的 (阶段, 是否完成) 状态，只有状态改变时才重设颜色、
+        勾选框值与可用状态；进行中的段仅在填充像素变化时更新 coords。
+        """
+        minute = minute_of_day(datetime.now())
+        timeline = self.timeline
+
+        gray_px = int(self._gray_extent * timeline.span_fraction(minute))
+
+        if gray_px != self._gray_px:
+            x0, y0, x1, y1 = self.canvas.coords(self._gray_item)
+            if not self.vertical:
+                self.canvas.coords(self._gray_item, 0, y0, gray_px, y1)
+            else:
+                self.canvas.coords(self._gray_item, x0, 0, x1, gray_px)
+            self._gray_px = gray_px
+
+        for i, (task, item) in enumerate(zip(self.tasks, self._scene)):
+            phase = timeline.phase(i, minute)
+            is_done = self.done.get(i)
+
+            state = (phase, is_done)
+            if state != item["state"]:
+                self._apply_segment_state(item, phase, is_done)
+                item["state"] = state
+
+            if phase == "now" and not is_done:
+                self._update_active_fill(item, timeline.elapsed_fraction(i, minute))
+
+    def _apply_segment_state(self, item: dict, phase: str, is_done: bool) -> None:
+        """
+        @brief 将单个任务段的颜色、勾选值与可用状态设置为指定状态。
+
+        @param item _scene 中的任务段记录
+        @param phase 所处阶段："past" / "now" / "future"
+        @param is_done 是否已完成
+        """
+        if is_done:
+            base, outline = LIGHT_GREEN, "green"
+        elif phase == "now":
+            base, outline = "white", "red"
+        elif phase == "future":
+            base, outline = "white", "black"
+        else:
+            base, outline = LIGHT_GRAY, GRAY_BORDER
+
+        self.canvas.itemconfig(item["base"], fill=base)
+        self.canvas.itemconfig(item["frame"], outline=outline)
+        label_color = "green" if is_done else "red" if phase == "now" else "black"
+        self.canvas.itemconfig(item["time"], fill=label_color)
+
+        if phase == "now" and not is_done:
+            self.canvas.itemconfig(item["fill"], state="normal")
+        else:
+            self.canvas.itemconfig(item["fill"], state="hidden")
+            item["fill_px"] = None
+
+        if is_done:
+            check_fill, check_outline = "green", "green"
+        elif phase == "future":
+            check_fill, check_outline = "white", DISABLED_GRAY
+        else:
+            check_fill, check_outline = "white", GRAY_BORDER
+        self.canvas.itemconfig(item["check_box"], fill=check_fill, outline=check_outline)
+        self.canvas.itemconfig(item["check_mark"], state="normal" if is_done else "hidden")
+
+    def _update_active_fill(self, item: dict, ratio: float) -> None:
+        """
+        @brief 更新进行中任务段的浅红填充长度，像素未变化时跳过。
+
+        @param item _scene 中的任务段记录
+        @param ratio 当前段已过去的比例（0~1）
+        """
+        x0, y0, x1, y1 = item["box"]
+        if not self.vertical:
+            fill_px = x0 + int((x1 - x0) * ratio)
+            coords = (x0, y0, fill_px, y1)
+        else:
+            fill_px = y0 + int((y1 - y0) * ratio)
+            coords = (x0, y0, x1, fill_px)
+
+        if fill_px != item["fill_px"]:
+            self.canvas.coords(item["fill"], *coords)
+            item["fill_px"] = fill_px
 
     # -------------------------- 状态切换 / 保存 -------------------------- #
-    def toggle_task(self, task: dict, var: BooleanVar) -> None:
+    def _on_canvas_click(self, event) -> None:
+        """
+        @brief 画布点击回调：二分查找点击位置所在的任务段，点中其勾选框时切换完成状态。
+        @param event 鼠标事件
+        """
+        if not self._seg_starts:
+            return
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        along = y if self.vertical else x
+        index = bisect_right(self._seg_starts, along) - 1
+        # 勾选框判定区可能略微越过段边界，同时检查相邻的段
+        for i in (index, index - 1, index + 1):
+            if 0 <= i < len(self._scene):
+                cx, cy = self._scene[i]["check_center"]
+                if abs(x - cx) <= CHECK_HIT and abs(y - cy) <= CHECK_HIT:
+                    self.toggle_task(i)
+                    return
+
+    def toggle_task(self, index: int) -> None:
         """
-        @brief 任务勾选框切换时的回调函数。
+        @brief 切换任务段的完成状态。
 
-        @param task 当前任务的字典信息（含时间段与任务名）
-        @param var 对应的 BooleanVar 绑定变量，表示是否勾选
+        @param index 当前任务在 self.tasks 中的下标
 
         @details
         检查是否尝试勾选未来时间段，如果非法则禁止。
-        否则保存状态，并刷新进度条以更新显示。
+        否则立即更新内存中的状态并刷新进度条，
+        状态与汇总文件的写入交给 WriteCoalescer 合并后延迟执行。
         """
-        now_dt = datetime.now()
-        start_dt = str_to_datetime(now_dt.date(), task["time"].split("-")[0])
-        if start_dt > now_dt and var.get():
+        minute = minute_of_day(datetime.now())
+        done = not self.done.get(index)
+        if self.timeline.phase(index, minute) == "future" and done:
             messagebox.showwarning("提示", "不能勾选未来时间段！")
-            var.set(False)
             return
-        self.save_status()
-        self.save_daily_completion_summary()
+        self.done.set(index, done)
+        self._collect_status()
+        self._writer.schedule("status", self.save_status)
+        self._writer.schedule("summary", self.save_daily_completion_summary)
         self.draw_progress_bar()
 
+    def _collect_status(self) -> None:
+        """
+        @brief 将完成位集同步到内存状态字典，并刷新整体完成度显示。
+        """
+        for task, done in zip(self.tasks, self.done):
+            self.status[task["time"]] = done
+        self.status["_date"] = self.date
+        self.update_progress()
+
+    def _load_status(self) -> None:
+        """
+        @brief 从存储后端加载当前计划的勾选状态。
+
+        @details
+        若记录的日期不是今天，先把那一天的完成情况写入历史，
+        再重置为今天的空白状态并保存。
+        """
+        self.status = self.storage.load_status(self.plan_id)
+        status_date = self.status.get("_date")
+
+        if status_date != self.date:
+            if status_date:
+                self.storage.record_history(self.plan_id, status_date, self._completion_bits(),
+                                            on_done=self._on_write_done)
+            self.status = {task["time"]: False for task in self.tasks}
+            self.status["_date"] = self.date
+            self.storage.save_status(self.plan_id, self.status, on_done=self._on_write_done)
+        self.done = CompletionBits.from_status(self.tasks, self.status)
+
+    def _completion_bits(self) -> list[bool]:
+        """
+        @brief 按任务段顺序返回当前状态字典中的完成情况。
+        """
+        return [bool(self.status.get(task["time"], False)) for task in self.tasks]
+
 
     def save_status(self) -> None:
         """
         @brief 将当前界面的勾选状态保存到本地状态文件中。
 
         @details
-        遍历所有任务与对应变量，将其值写入状态字典并保存为 JSON 文件。
-        同时刷新右上角整体完成度显示。
+        先由 _collect_status() 把完成位集同步到状态字典并刷新右上角整体完成度显示，
+        再交给存储后端在后台线程保存，同时把当天每段的完成位写入历史记录。
         """
-        for task, var in self.check_vars:
-            self.status[task["time"]] = var.get()
-        self.status["_date"] = get_today()
-        save_json(self.status_file, self.status)
-        self.update_progress()
-    
+        self._collect_status()
+        self.storage.save_status(self.plan_id, self.status, on_done=self._on_write_done)
+        self.storage.record_history(self.plan_id, self.date, self._completion_bits(),
+                                    on_done=self._on_write_done)
+
+    def flush_pending(self) -> None:
+        """
+        @brief 立即写入所有被合并延迟的状态/汇总保存请求。
+        """
+        self._writer.flush()
+
+    def _on_write_done(self, error) -> None:
+        """
+        @brief 后台写盘完成回调（在 Tk 线程执行），失败时提示用户。
+        @param error 写入异常；成功时为 None
+        """
+        if error is not None:
+            messagebox.showerror("保存失败", f"数据写入失败：{error}")
+
+    def destroy(self) -> None:
+        """
+        @brief 销毁页面前先落盘尚未写入的修改。
+        """
+        self.flush_pending()
+        if self._notify_job is not None:
+            self.after_cancel(self._notify_job)
+            self._notify_job = None
+        self.toasts.close_all()
+        super().destroy()
+
     # -------------------------- 进度 & 定时刷新 -------------------------- #
     def update_progress(self) -> None:
         """
         @brief 统计并更新右上角显示的整体任务完成百分比。
 
         @details
-        根据当前任务复选框的勾选状态，计算已完成任务数量并更新 UI。
+        根据完成位集统计已完成任务数量并更新 UI（不访问任何 Tcl 变量）。
         """
-        done = sum(var.get() for _, var in self.check_vars)
-        total = len(self.check_vars)
+        done = self.done.done()
+        total = len(self.done)
         percent = int((done / total) * 100) if total else 0
         self.progress_label.config(text=f"进度：{percent:3d}%")
 
     def update_ui_periodically(self) -> None:
         """
-        @brief 每秒刷新一次界面状态，包括当前时间与进度条。
+        @brief 在状态边界处刷新界面，包括当前时间与进度条。
 
         @details
         自动检测日期变更，若跨天则重新加载任务状态并重绘。
         更新时间标签、重绘进度条并调用布局调整。
-        并设定下一次 1000ms 后继续调用自身。
+        若实际唤醒时间与预期相差过大（系统挂起、时钟跳变），
+        丢弃场景中缓存的段状态并完整刷新一次。
+        最后由 _schedule_next_tick() 安排下一次唤醒。
         """
+        self._ui_update_job = None
+        self._wakeups += 1
+
+        if self._next_wake is not None:
+            drift = (datetime.now() - self._next_wake).total_seconds()
+            if abs(drift) > RESYNC_TOLERANCE_S:
+                self._resyncs += 1
+                for item in self._scene:
+                    item["state"] = None
+
         now_str = get_today()
         if now_str != self.date:
+            self.flush_pending()
             self.save_daily_completion_summary()
+            self.storage.record_history(self.plan_id, self.date, self._completion_bits(),
+                                        on_done=self._on_write_done)
 
             self.date = now_str
             self.status = {task["time"]: False for task in self.tasks}
             self.status["_date"] = now_str
-            save_json(self.status_file, self.status)
+            self.done = CompletionBits(len(self.tasks))
+            self.storage.save_status(self.plan_id, self.status, on_done=self._on_write_done)
 
-            self._notified_starts.clear()   # ← 跨天重置提醒
+            # 跨天重置提醒；休眠跨过午夜时，新一天已过去的提醒合并为一条补发
+            self._notified_starts = set()
+            self._build_notifications()
             self.draw_progress_bar()
 
         self.time_label.config(text=datetime.now().strftime("%H:%M"))
 
-        # 检查是否到达某个时间段的开始
-        self._check_and_notify_task_start()
-
         self.draw_progress_bar()
         self.adjust_layout()
-        self._ui_update_job = self.after(1000, self.update_ui_periodically)
+        self._schedule_next_tick()
+
+    def _schedule_next_tick(self) -> None:
+        """
+        @brief 计算下一个会改变界面的时刻，并只为该时刻安排一次 after()。
+        """
+        if self._ui_update_job is not None:
+            self.after_cancel(self._ui_update_job)
+
+        now = datetime.now()
+        wait_s = (self._next_state_change(now) - now).total_seconds()
+        delay_ms = math.ceil(wait_s * 1000) + TICK_MARGIN_MS
+        delay_ms = min(max(delay_ms, TICK_MIN_MS), TICK_MAX_MS)
+
+        self._next_wake = now + timedelta(milliseconds=delay_ms)
+        self._ui_update_job = self.after(delay_ms, self.update_ui_periodically)
+
+    def _next_state_change(self, now: datetime) -> datetime:
+        """
+        @brief 计算从 now 起下一个可见状态发生变化的时刻。
+
+        @param now 当前时间
+        @return 下一分钟、下一个任务段起止、午夜、当前段填充前进一个像素
+                这几者中最早的时刻
+
+        @details
+        段边界与当前段均由 self.timeline 二分查找得到。
+        """
+        midnight = datetime.combine(now.date(), datetime.min.time())
+        minute = minute_of_day(now)
+        candidates = [
+            now.replace(second=0, microsecond=0) + timedelta(minutes=1),
+            midnight + timedelta(days=1),
+        ]
+
+        boundary = self.timeline.next_boundary(minute)
+        if boundary is not None:
+            candidates.append(midnight + timedelta(minutes=boundary))
+
+        current = self.timeline.segment_at(minute)
+        if current >= 0:
+            fill_step = self._next_fill_step(current, minute)
+            if fill_step is not None:
+                candidates.append(midnight + timedelta(minutes=fill_step))
+
+        return min(candidates)
+
+    def _next_fill_step(self, index: int, minute: float):
+        """
+        @brief 计算进行中任务段的浅红填充下一次前进一个像素的时刻。
+
+        @param index 任务段下标
+        @param minute 当前时刻的当天分钟偏移
+        @return 下一像素时刻的分钟偏移；若场景未就绪或该段已完成（无填充）则返回 None
+        """
+        if index >= len(self._scene):
+            return None
+        item = self._scene[index]
+        if item["state"] is not None and item["state"][1]:
+            return None
+
+        x0, y0, x1, y1 = item["box"]
+        seg_px = (y1 - y0) if self.vertical else (x1 - x0)
+        if seg_px <= 0:
+            return None
+
+        start = self.timeline.starts[index]
+        seg_minutes = max(1, self.timeline.ends[index] - start)
+        passed_px = int(seg_px * self.timeline.elapsed_fraction(index, minute))
+        return start + (passed_px + 1) * seg_minutes / seg_px
 
     # ------------------------------ 请假 ------------------------------ #
     def set_leave(self) -> None:
         """
-        @brief 将当前日期标记为请假日。
+        @brief 将当前日期或一段日期（休假）标记为请假日。
 
         @details
-        用户点击“请假”后提示确认，确认后将日期写入 leave_days.json。
-        该日期将不纳入后续统计分析。
+        用户点击“请假”后输入单日或区间（默认为当天），确认后写入存储后端的请假日历。
+        这些日期将不纳入后续统计分析。
         """
-        if messagebox.askyesno("请假确认", f"确认将 {self.date} 标记为请假吗？该日将不会纳入统计。"):
-            leave_data = load_json("data/leave_days.json", [])
-            if self.date not in leave_data:
-                leave_data.append(self.date)
-                save_json("data/leave_days.json", leave_data)
-                messagebox.showinfo("已请假", f"{self.date} 已标记为请假日")
+        text = simpledialog.askstring(
+            "请假", "请输入请假日期（YYYY-MM-DD）或区间（YYYY-MM-DD~YYYY-MM-DD）：",
+            initialvalue=self.date, parent=self)
+        if not text:
+            return
+        try:
+            start, end = parse_leave_input(text)
+        except ValueError as e:
+            messagebox.showerror("日期错误", str(e))
+            return
+
+        label = start if start == end else f"{start} 至 {end}"
+        if messagebox.askyesno("请假确认", f"确认将 {label} 标记为请假吗？该日将不会纳入统计。"):
+            if self.storage.add_leave_range(start, end, on_done=self._on_write_done):
+                messagebox.showinfo("已请假", f"{label} 已标记为请假日")
+            else:
+                messagebox.showinfo("已请假", f"{label} 已全部是请假日")
 
     # -------------------------- 自适应布局 -------------------------- #
+    def _layout_key(self) -> tuple:
+        """
+        @brief 决定窗口尺寸的输入：方向、任务数、默认字体行高与 DPI 缩放。
+        """
+        return (
+            self.vertical,
+            len(self.tasks),
+            tkfont.nametofont("TkDefaultFont").metrics("linespace"),
+            float(self.tk.call("tk", "scaling")),
+        )
+
     def adjust_layout(self) -> None:
         """
         @brief 根据任务数量与布局方向动态调整窗口尺寸。
@@ -435,29 +686,42 @@ class ProgressPage(Frame):
         @details
         计算左右中三栏的高度需求，根据横/竖向分别设置窗口宽高与最小尺寸。
         若是竖向布局，同时设置画布高度以适配任务条数。
+        计算结果按 _layout_key() 缓存：布局键与当前已应用的相同时直接返回，
+        不再 update_idletasks() 或调用 geometry/minsize/maxsize；
+        布局键曾出现过（如来回切换方向）时直接使用缓存的尺寸。
         @note 若用户正展开下拉框，则跳过本次调整以防 UI 闪烁。
         """
-        self.master.update_idletasks()
+        key = self._layout_key()
+        if key == self._applied_layout:
+            return
 
         if self.plan_selector.tk.call(self.plan_selector._w, "state") == "pressed":
             return
 
-        h_left = self.left_frame.winfo_reqheight()
-        h_center = self.center_frame.winfo_reqheight()
-        h_right = self.right_frame.winfo_reqheight()
-
-        if not self.vertical:
-            total_h = max(h_left, h_center, h_right)
-            total_w = max(800, len(self.tasks) * self.min_segment + 200)
-        else:
-            canvas_h = max(len(self.tasks) * BAR_W, 120)
-            total_h = max(300, canvas_h + 200)
-            total_w = 260
-            self.canvas.config(height=canvas_h)
+        size = self._layout_cache.get(key)
+        if size is None:
+            self.master.update_idletasks()
+            h_left = self.left_frame.winfo_reqheight()
+            h_center = self.center_frame.winfo_reqheight()
+            h_right = self.right_frame.winfo_reqheight()
+
+            if not self.vertical:
+                total_h = max(h_left, h_center, h_right)
+                total_w = max(800, len(self.tasks) * self.min_segment + 200)
+            else:
+                total_h = max(300, max(len(self.tasks) * BAR_W, 120) + 200)
+                total_w = 260
+            size = self._layout_cache[key] = (total_w, total_h)
+
+        total_w, total_h = size
+        if self.vertical:
+            self.canvas.config(height=max(len(self.tasks) * BAR_W, 120))
 
         self.master.geometry(f"{total_w}x{total_h}")
         self.master.minsize(total_w, total_h)
         self.master.maxsize(total_w, total_h)
+        self._applied_layout = key
+        self._layout_applies += 1
 
     def create_sidebar(self, parent: tk.Widget):
         """
@@ -499,6 +763,7 @@ class ProgressPage(Frame):
             ("删除", self.delete_plan_confirm, 2, 1 ),
             ("设置", self.open_setting_page, 0, 1),
             ("统计", self.open_stats_page, 1, 0),
+            ("请假", self.set_leave, 2, 0),
             ("竖向" if not self.vertical else "横向", self.toggle_orientation, 0, 0),
         ]
 
@@ -517,12 +782,14 @@ class ProgressPage(Frame):
         @details
         更新 vertical 状态，重新构建界面 UI，并恢复自动刷新与窗口居中。
         """
+        self.flush_pending()
         self.vertical = not self.vertical
         self.master.vertical = self.vertical
 
-        if hasattr(self, "_ui_update_job"):
+        if self._ui_update_job is not None:
             self.after_cancel(self._ui_update_job)
             self._ui_update_job = None
+        self._next_wake = None
 
         for widget in self.winfo_children():
             widget.destroy()
@@ -600,25 +867,28 @@ class ProgressPage(Frame):
         if selected_plan_id == self.plan_id:
             return
 
+        self.flush_pending()
         self.save_daily_completion_summary()  # 保存当前状态
 
         self.plan_id = selected_plan_id
 
-        if hasattr(self, "_ui_update_job"):
+        if self._ui_update_job is not None:
             self.after_cancel(self._ui_update_job)
             self._ui_update_job = None
+        self._next_wake = None
 
         self.date = get_today()
-        self.status_file = f"data/status_{self.plan_id}.json"
-        self.status = load_json(self.status_file, {}) if os.path.exists(self.status_file) else {}
 
         self.plan_data = load_json(f"config/{self.plan_id}.json", {})
         self.tasks = sorted(
             self.plan_data.get("tasks", []),
             key=lambda t: time_to_minutes(t["time"].split("-")[0])
         )
-        self._notified_starts.clear()  # 切换计划后重置提醒
-        self.check_vars.clear()
+        self.timeline = PlanTimeline(self.tasks)
+        self._load_status()
+        self._notified_starts = load_notified(self.plan_id, self.date)  # 切换计划后改用新计划的提醒记录
+        self._build_notifications()
+        self.toasts.close_all()
 
         for widget in self.winfo_children():
             widget.destroy()
@@ -679,60 +949,83 @@ class ProgressPage(Frame):
     
     def save_daily_completion_summary(self):
         """
-        @brief 保存当前计划的每日完成率到统一 summary 文件。
+        @brief 保存当前计划的每日完成率到存储后端。
 
         @details
-        每个计划仅维护一个汇总文件，如 data/summary_default.json，
-        结构为 { "YYYY-MM-DD": ratio }，用于展示统计图。
+        每个计划按天记录一个完成率（JSON 后端为 data/summary_<plan>.json，
+        结构 { "YYYY-MM-DD": ratio }），用于展示统计图。
+        日期取页面当前所属的 self.date，跨天时先以旧日期保存再切换。
+        """
+        date = self.date
+        ratio = self.done.ratio()
+
+        self.storage.save_summary_day(self.plan_id, date, ratio, on_done=self._on_write_done)
+        self._show_metrics(self.storage.update_metrics(self.plan_id, date, ratio, on_done=self._on_write_done))
+
+    def _preview_metrics(self) -> dict:
         """
-        date = get_today()
-        total = len(self.check_vars)
-        done = sum(var.get() for _, var in self.check_vars)
+        @brief 以当前勾选状态预估当天的滚动指标（不写入存储）。
+        """
+        total = len(self.tasks)
+        done = sum(bool(self.status.get(task["time"])) for task in self.tasks)
         ratio = round(done / total, 4) if total > 0 else 0
-    
-        summary_path = f"data/summary_{self.plan_id}.json"
-        summary_data = load_json(summary_path, default={})
-    
-        if summary_data.get(date) == ratio:
-            return  # 防止重复写入
-    
-        summary_data[date] = ratio
-        save_json(summary_path, summary_data)
+        return self.storage.preview_metrics(self.plan_id, self.date, ratio)
+
+    def _show_metrics(self, state: dict) -> None:
+        """
+        @brief 在进度标签下方显示连续天数、7/30 日平均与周环比。
+        @param state 指标状态
+        """
+        label = getattr(self, "metrics_label", None)
+        if label is not None and label.winfo_exists():
+            label.config(text=format_metrics(summarize(state)))
+
+    # ------------------------------ 提醒 ------------------------------ #
+    def _build_notifications(self) -> None:
+        """
+        @brief 由当前计划生成当天的提醒队列，并安排下一次提醒。
+
+        @details
+        队列包含当天全部事件，由已发出的提醒键去重；已过时刻而尚未发出的事件
+        会在下一次处理时作为“错过的提醒”合并显示。
+        """
+        settings = load_notify_settings()
+        self._notify_queue = NotificationQueue(
+            self.timeline, self.tasks, self._notified_starts,
+            lead_minutes=settings["lead_minutes"], end_reminders=settings["end_reminders"])
+        self._schedule_notification()
 
-    def _check_and_notify_task_start(self) -> None:
+    def _schedule_notification(self) -> None:
         """
-        若当前时间位于任一任务开始时刻的“提醒窗口”内（默认60秒），
-        且当天尚未提醒过该时间段，则弹窗提示开始该任务。
+        @brief 只为队列中最早的提醒安排一次 after()（最长休眠 TICK_MAX_MS，以便校正时钟跳变）。
         """
+        if self._notify_job is not None:
+            self.after_cancel(self._notify_job)
+            self._notify_job = None
+
+        minute = self._notify_queue.next_minute()
+        if minute is None:
+            return
         now = datetime.now()
-        today = now.date()
-    
-        # 提醒窗口：开始时刻 ~ 开始时刻 + 60s
-        window_seconds = 60
-    
-        for task in self.tasks:
-            start_str = task["time"].split("-")[0]
-            s_dt = str_to_datetime(today, start_str)
-            key = f"{self.date}::{task['time']}"   # 当天 + 时间段 唯一键
-    
-            if key in self._notified_starts:
-                continue
-            
-            # 命中提醒窗口
-            if s_dt <= now < (s_dt + timedelta(seconds=window_seconds)):
-                self._notified_starts.add(key)
-    
-                # 保证窗口浮到最前
-                try:
-                    self.master.lift()
-                    self.master.attributes("-topmost", True)
-                    # 稍后取消顶置交给现有逻辑（或保留顶置也可）
-                except Exception:
-                    pass
-                
-                # 弹窗提示（使用 tkinter 的 messagebox，避免 ttkbootstrap 兼容性差异）
-                messagebox.showinfo("开始新任务", f"现在 {start_str}，请开始：{task['task']}")
-                break  # 本轮只弹一次，避免同秒多任务时多次弹窗
-            
+        target = datetime.combine(now.date(), datetime.min.time()) + timedelta(minutes=minute)
+        delay_ms = math.ceil((target - now).total_seconds() * 1000) + TICK_MARGIN_MS
+        delay_ms = min(max(delay_ms, TICK_MIN_MS), TICK_MAX_MS)
+        self._notify_job = self.after(delay_ms, self._process_notifications)
 
+    def _process_notifications(self) -> None:
+        """
+        @brief 发出所有已到时的提醒：按时的逐条显示，错过的（如休眠期间）合并为一条。
 
+        @details
+        提醒以非模态的 toast 显示，不阻塞主循环；已发出的提醒键随即在后台持久化。
+        """
+        self._notify_job = None
+        queue = self._notify_queue
+        on_time, missed = queue.due(minute_of_day(datetime.now()))
+        if on_time or missed:
+            save_notified(self.plan_id, self.date, self._notified_starts, on_done=self._on_write_done)
+        for event in on_time:
+            self.toasts.show(*queue.message(event))
+        if missed:
+            self.toasts.show(*queue.missed_message(missed))
+        self._schedule_notification()
@@ -1,10 +1,23 @@
 import tkinter as tk
+from itertools import count
 from tkinter import messagebox
 from ttkbootstrap import Frame, Button, Entry, Label, Scrollbar
 from utils.file_utils import save_json, load_json
-from utils.time_utils import auto_pad_time, is_time_format_valid, time_overlap, is_full_day_covered
+from utils.time_utils import auto_pad_time, validate_intervals, parse_range_minutes, IntervalIndex, DAY_MINUTES
 import os
 
+VALIDATE_DELAY_MS = 250  # 输入停止多久后进行实时校验
+VISIBLE_ROWS = 15        # 同时显示（即实际创建）的行控件数量
+WHEEL_ROWS = 3           # 鼠标滚轮每格滚动的行数
+
+# 保存时各类问题在行尾显示的简短说明
+ISSUE_TEXT = {
+    "empty": "请填写时间段和任务名称",
+    "malformed": "格式应为 HH:MM-HH:MM",
+    "reversed": "结束须晚于开始",
+    "gap": "前后存在未覆盖的空档",
+}
+
 
 class SettingPage(Frame):
     """
@@ -12,6 +25,14 @@ class SettingPage(Frame):
     @brief 时间段任务配置界面。
 
     提供任务时间段添加、编辑、验证、保存等交互功能。
+    输入时间段时实时（防抖）校验：只重新检查被编辑的行，以及时间轴上“此前最远结束时间”
+    因此改变的行（通常只是相邻行，见 IntervalIndex），
+    错误显示在行尾，覆盖率与空档/重叠数量实时更新。
+
+    @details
+    任务保存在 self.tasks 列表中（每项 {"id", "time", "task"}），界面只创建
+    VISIBLE_ROWS 行控件组成的“行池”，滚动时把池中的行重新绑定到列表的另一段，
+    因此任务条数再多，控件数量和内存占用也保持不变。
     """
 
     def __init__(self, master, current_plan_id, on_close=None):
@@ -24,14 +45,25 @@ class SettingPage(Frame):
         super().__init__(master)
         self.pack(fill=tk.BOTH, expand=True)
         self.master = master
-        self.entries = []
         self.current_plan_id = current_plan_id
         self.on_close = on_close
+
+        # 任务列表模型与行池：first 为行池第一行对应的任务下标
+        self.tasks = []
+        self._by_id = {}
+        self._ids = count()
+        self.slots = []
+        self.first = 0
+
+        # 实时校验：按开始时间排序的区间索引（行键为任务 id）、待校验行、保存时发现的问题
+        self.intervals = IntervalIndex()
+        self._pending_rows = set()
+        self._validate_job = None
+        self._save_issues = {}
         
         Label(self, text="时间段设置（格式：HH:MM-HH:MM）", font=("Arial", 12)).pack(pady=5)
-
-        self.task_frame = Frame(self)
-        self.task_frame.pack(pady=10)
+        self.coverage_label = Label(self, text="", font=("Arial", 10))
+        self.coverage_label.pack()
 
         btn_frame = Frame(self)
         btn_frame.pack(side=tk.BOTTOM, pady=10)
@@ -39,68 +71,60 @@ class SettingPage(Frame):
         Button(btn_frame, text="保存", command=self.save_config).pack(side=tk.LEFT, padx=10)
         Button(btn_frame, text="退出", command=self.exit_and_return).pack(side=tk.RIGHT, padx=10)
         self.master.protocol("WM_DELETE_WINDOW", self.exit_and_return)
+
+        self.task_frame = Frame(self)
+        self.task_frame.pack(pady=10, fill=tk.Y, expand=True)
+        self.rows_frame = Frame(self.task_frame)
+        self.rows_frame.pack(side=tk.LEFT, fill=tk.Y)
+        self.scrollbar = Scrollbar(self.task_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._bind_wheel(self.rows_frame)
         
         if current_plan_id:
             self.load_existing()
         else:
             self.add_entry("00:00-24:00", "任务名称")
 
-    def add_entry(self, time_text="", task_text=""):
+    # ---- 任务列表 ---- #
+    def add_entry(self, time_text="", task_text="", scroll=True):
         """
         @brief 添加一个时间段任务条目。
         @param time_text 初始时间段文本
         @param task_text 初始任务描述文本
+        @param scroll 是否滚动到新条目并刷新界面（批量加载时为 False）
         """
-        if not time_text and self.entries:
-            last_time = self.entries[-1][0].get().strip()
+        if not time_text and self.tasks:
+            last_time = self.tasks[-1]["time"].strip()
             if "-" in last_time:
                 _, end = last_time.split("-")
                 time_text = f"{end}-"
-    
-        row = Frame(self.task_frame)
-        row.pack(fill=tk.X, pady=5)
-    
-        inner = Frame(row)
-        inner.pack(anchor="center")
-    
-        time_entry = Entry(inner, width=15)
-        time_entry.insert(0, time_text)
-        time_entry.pack(side=tk.LEFT, padx=5)
-    
-        task_entry = Entry(inner, width=40)
-        task_entry.insert(0, task_text)
-        task_entry.pack(side=tk.LEFT, padx=5)
-    
-        del_btn = Button(inner, text="删除", command=lambda: self.delete_entry(row, (time_entry, task_entry)))
-        del_btn.pack(side=tk.LEFT, padx=5)
-    
-        self.entries.append((time_entry, task_entry))
-        self.after(50, self.expand_window_height)
 
-    def delete_entry(self, row_frame, entry_pair):
+        task = {"id": next(self._ids), "time": time_text, "task": task_text}
+        self.tasks.append(task)
+        self._by_id[task["id"]] = task
+        affected = self._index_row(task)
+
+        if scroll:
+            self.first = max(0, len(self.tasks) - VISIBLE_ROWS)
+            self._refresh_view()
+            self._render_rows(affected)
+            self.after(50, self.expand_window_height)
+
+    def delete_entry(self, task_id):
         """
         @brief 删除指定的任务条目。
-        @param row_frame 行容器 Frame
-        @param entry_pair (time_entry, task_entry) 元组
+        @param task_id 任务 id
         """
-        row_frame.destroy()
-        if entry_pair in self.entries:
-            self.entries.remove(entry_pair)
+        task = self._by_id.pop(task_id, None)
+        if task is None:
+            return
+        self.tasks.remove(task)
+        self._pending_rows.discard(task_id)
+        self._save_issues.pop(task_id, None)
+        self.intervals.set(task_id, None)
+        self._refresh_view()
         self.after(50, self.expand_window_height)
 
-    def expand_window_height(self):
-        """
-        @brief 动态调整窗口高度以适应条目数量。
-        """
-        header_height = 60
-        row_height = 40
-        button_bar_height = 80
-
-        total_height = header_height + button_bar_height + row_height * len(self.entries)
-        new_height = max(min(total_height, 1500), 150)
-        width = max(self.master.winfo_width(), 800)
-        self.master.geometry(f"{width}x{new_height}")
-
     def load_existing(self):
         """
         @brief 加载当前计划 ID 对应的任务配置。
@@ -108,74 +132,236 @@ class SettingPage(Frame):
         path = f"config/{self.current_plan_id}.json"
         data = load_json(path, default={})
         for block in data.get("tasks", []):
-            self.add_entry(block["time"], block["task"])
+            self.add_entry(block["time"], block["task"], scroll=False)
+        self._refresh_view()
+        self.after(50, self.expand_window_height)
 
-    def save_config(self):
+    # ---- 行池 ---- #
+    def _create_slot(self, index: int) -> dict:
         """
-        @brief 保存当前输入的任务配置并进行校验。
+        @brief 创建行池中的一行控件（时间、任务、删除按钮、错误标签）。
+        @param index 行池中的位置
         """
-        from datetime import datetime
-        tasks = []
-
-        for idx, (time_entry, task_entry) in enumerate(self.entries):
-            time_range = auto_pad_time(time_entry.get().strip())
-            task = task_entry.get().strip()
+        frame = Frame(self.rows_frame)
+        time_entry = Entry(frame, width=15)
+        time_entry.pack(side=tk.LEFT, padx=5)
+        task_entry = Entry(frame, width=40)
+        task_entry.pack(side=tk.LEFT, padx=5)
+        del_btn = Button(frame, text="删除", command=lambda: self.delete_entry(slot["id"]))
+        del_btn.pack(side=tk.LEFT, padx=5)
+        error_label = Label(frame, text="", bootstyle="danger", width=22)
+        error_label.pack(side=tk.LEFT, padx=5)
+
+        slot = {"frame": frame, "time": time_entry, "task": task_entry, "error": error_label, "id": None}
+        time_entry.bind("<KeyRelease>", lambda _e: self._on_edit(slot, "time"))
+        task_entry.bind("<KeyRelease>", lambda _e: self._on_edit(slot, "task"))
+        for widget in (frame, time_entry, task_entry, del_btn, error_label):
+            self._bind_wheel(widget)
+        frame.grid(row=index, column=0, pady=5)
+        return slot
+
+    def _refresh_view(self):
+        """
+        @brief 把行池重新绑定到 tasks[first:first+VISIBLE_ROWS]，并更新滚动条。
+        """
+        total = len(self.tasks)
+        visible = min(VISIBLE_ROWS, total)
+        self.first = max(0, min(self.first, total - visible))
+
+        while len(self.slots) < visible:
+            self.slots.append(self._create_slot(len(self.slots)))
+
+        for i, slot in enumerate(self.slots):
+            if i < visible:
+                self._bind_slot(slot, self.tasks[self.first + i])
+                slot["frame"].grid()
+            else:
+                slot["id"] = None
+                slot["frame"].grid_remove()
+
+        if total:
+            self.scrollbar.set(self.first / total, (self.first + visible) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        self._update_coverage()
 
-            if not time_range or not task:
-                messagebox.showwarning(
-                    "输入不完整",
-                    f"第 {idx + 1} 项未填写完整，请填写时间段和任务名称。"
-                )
-                return
+    def _bind_slot(self, slot: dict, task: dict):
+        """
+        @brief 将一行控件绑定到某个任务：填入文本并显示其校验结果。
+        """
+        slot["id"] = task["id"]
+        for field in ("time", "task"):
+            entry = slot[field]
+            if entry.get() != task[field]:
+                entry.delete(0, tk.END)
+                entry.insert(0, task[field])
+        self._render_slot(slot)
+
+    def _slot_of(self, task_id):
+        for slot in self.slots:
+            if slot["id"] == task_id:
+                return slot
+        return None
+
+    def _on_edit(self, slot: dict, field: str):
+        """
+        @brief 输入框内容变化：写回任务列表，时间段变化时安排实时校验。
+        """
+        task = self._by_id.get(slot["id"])
+        if task is None:
+            return
+        text = slot[field].get()
+        if task[field] == text:
+            return
+        task[field] = text
+        if self._save_issues.pop(task["id"], None) is not None:
+            self._render_slot(slot)
+        if field == "time":
+            self.schedule_validation(task["id"])
+
+    # ---- 滚动 ---- #
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", lambda _e: self.scroll_rows(-WHEEL_ROWS))
+        widget.bind("<Button-5>", lambda _e: self.scroll_rows(WHEEL_ROWS))
+
+    def _on_wheel(self, event):
+        self.scroll_rows(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        """
+        @brief 滚动条回调："moveto 比例" 或 "scroll n units/pages"。
+        """
+        if action == "moveto":
+            self.first = int(float(amount) * len(self.tasks))
+            self._refresh_view()
+        elif action == "scroll":
+            step = VISIBLE_ROWS if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def scroll_rows(self, delta: int):
+        """
+        @brief 将可见区域滚动 delta 行。
+        """
+        first = self.first
+        self.first += delta
+        self._refresh_view()
+        return first != self.first
 
-            if not is_time_format_valid(time_range):
-                messagebox.showerror(
-                    "时间格式错误",
-                    f"第 {idx + 1} 项时间段格式错误：{time_range}\n必须为 HH:MM-HH:MM，例如 09:00-12:00。"
-                )
-                return
+    # ---- 实时校验 ---- #
+    def schedule_validation(self, task_id):
+        """
+        @brief 时间段内容变化后，防抖安排一次校验。
+        @param task_id 被编辑的任务 id
+        """
+        self._pending_rows.add(task_id)
+        if self._validate_job is not None:
+            self.after_cancel(self._validate_job)
+        self._validate_job = self.after(VALIDATE_DELAY_MS, self._flush_validation)
+
+    def _flush_validation(self):
+        self._validate_job = None
+        rows, self._pending_rows = self._pending_rows, set()
+        self.validate_rows(rows)
+
+    def _index_row(self, task: dict) -> set:
+        parsed = parse_range_minutes(task["time"])
+        valid = parsed is not None and parsed[1] > parsed[0]
+        return self.intervals.set(task["id"], parsed if valid else None)
+
+    def validate_rows(self, rows):
+        """
+        @brief 增量校验若干行：更新区间索引，并只重绘受影响的可见行与覆盖率。
+        @param rows 任务 id 集合
+        """
+        affected = set()
+        for task_id in rows:
+            task = self._by_id.get(task_id)
+            if task is not None:
+                affected |= self._index_row(task)
+        self._render_rows(affected)
+
+    def _row_state(self, task_id):
+        """
+        @brief 计算某行的行尾错误文本及时间/任务输入框是否标红。
+        @return (error, time_bad, task_bad)
+        """
+        if task_id in self._save_issues:
+            return self._save_issues[task_id]
+
+        text = self._by_id[task_id]["time"].strip()
+        if not text:
+            return "", False, False
+        if task_id not in self.intervals.rows:
+            parsed = parse_range_minutes(text)
+            return ISSUE_TEXT["malformed"] if parsed is None else ISSUE_TEXT["reversed"], True, False
+        conflicts = self.intervals.conflicts(task_id)
+        if conflicts:
+            return f"与 {self._by_id[conflicts[0]]['time'].strip()} 重叠", True, False
+        return "", False, False
+
+    def _render_slot(self, slot: dict):
+        error, time_bad, task_bad = self._row_state(slot["id"])
+        slot["error"].config(text=error)
+        slot["time"].configure(bootstyle="danger" if time_bad else "default")
+        slot["task"].configure(bootstyle="danger" if task_bad else "default")
+
+    def _render_rows(self, rows):
+        """
+        @brief 刷新指定行中当前可见者的错误显示，并更新覆盖率标签。
+        """
+        for slot in self.slots:
+            if slot["id"] is not None and slot["id"] in rows:
+                self._render_slot(slot)
+        self._update_coverage()
+
+    def _update_coverage(self):
+        index = self.intervals
+        covered = DAY_MINUTES - index.gap_minutes
+        ok = index.gap_count == 0 and index.overlap_count == 0 and len(index) == len(self.tasks)
+        self.coverage_label.config(
+            text=f"已覆盖 {covered // 60} 小时 {covered % 60} 分 / 24 小时，"
+                 f"空档 {index.gap_count} 处，重叠 {index.overlap_count} 处",
+            bootstyle="success" if ok else "warning")
 
-            try:
-                start_str, end_str = time_range.split('-')
-                if end_str == "24:00":
-                    end_str = "23:59"
-                start_time = datetime.strptime(start_str, "%H:%M")
-                end_time = datetime.strptime(end_str, "%H:%M")
-            except Exception:
-                messagebox.showerror(
-                    "解析错误",
-                    f"第 {idx + 1} 项时间段无法解析：{time_range}"
-                )
-                return
+    def expand_window_height(self):
+        """
+        @brief 动态调整窗口高度以适应条目数量（超过 VISIBLE_ROWS 行时改为滚动）。
+        """
+        header_height = 90
+        row_height = 40
+        button_bar_height = 80
 
-            if end_time <= start_time:
-                messagebox.showerror(
-                    "时间顺序错误",
-                    f"第 {idx + 1} 项时间段不合理：{time_range}\n结束时间必须晚于开始时间。"
-                )
-                return
+        rows = min(len(self.tasks), VISIBLE_ROWS)
+        total_height = header_height + button_bar_height + row_height * rows
+        new_height = max(total_height, 150)
+        width = max(self.master.winfo_width(), 800)
+        self.master.geometry(f"{width}x{new_height}")
 
-            tasks.append({"time": time_range, "task": task})
-
-        indexed_tasks = [(i, t["time"]) for i, t in enumerate(tasks)]
-        sorted_times = sorted(indexed_tasks, key=lambda x: x[1].split('-')[0])
-        for i in range(len(sorted_times) - 1):
-            idx1, t1 = sorted_times[i]
-            idx2, t2 = sorted_times[i + 1]
-            if time_overlap(t1, t2):
-                messagebox.showerror(
-                    "时间段重叠",
-                    f"第 {idx1 + 1} 项 [{t1}] 与第 {idx2 + 1} 项 [{t2}] 存在重叠，请检查并修改。"
-                )
-                return
+    # ---- 保存 ---- #
+    def save_config(self):
+        """
+        @brief 保存当前输入的任务配置并进行校验。
 
-        if not is_full_day_covered(tasks):
-            messagebox.showerror(
-                "时间覆盖不完整",
-                "所有时间段未能覆盖完整的 00:00 - 24:00。\n请确保无缝衔接，避免有空缺时间。"
-            )
+        @details
+        一次性检查全部条目（未填写、格式错误、先后颠倒、重叠、空档），
+        将所有出问题的行标红并在行尾注明原因（滚动到第一处问题），
+        覆盖率标签处给出问题总数，不再逐条弹出对话框。
+        """
+        times = [task["time"] for task in self.tasks]
+        names = [task["task"] for task in self.tasks]
+
+        issues = validate_intervals(times, names)
+        self.highlight_issues(issues)
+        if issues:
+            gaps = [issue["message"] for issue in issues if issue["kind"] == "gap"]
+            self.coverage_label.config(
+                text=f"无法保存：共 {len(issues)} 处问题（已在行尾标出）" + ("\n" + gaps[0] if gaps else ""),
+                bootstyle="danger")
             return
 
+        tasks = [{"time": auto_pad_time(t.strip()), "task": n.strip()} for t, n in zip(times, names)]
+
         plan_id = self.current_plan_id or self.prompt_plan_id()
         if not plan_id:
             return
@@ -191,6 +377,33 @@ class SettingPage(Frame):
         if self.on_close:
             self.on_close(plan_id)
 
+    def highlight_issues(self, issues):
+        """
+        @brief 记录各行的问题并刷新可见行：标红输入框、在行尾注明原因。
+        @param issues validate_intervals() 返回的问题列表（行号为 self.tasks 下标）
+        """
+        self._save_issues = {}
+        for issue in issues:
+            kind, rows = issue["kind"], issue["rows"]
+            for row in rows:
+                task = self.tasks[row]
+                if kind == "overlap":
+                    other = rows[0] if row == rows[1] else rows[1]
+                    error = f"与 {self.tasks[other]['time'].strip()} 重叠"
+                else:
+                    error = ISSUE_TEXT[kind]
+                time_bad = kind != "empty" or not task["time"].strip()
+                task_bad = kind == "empty" and not task["task"].strip()
+                if task["id"] in self._save_issues:
+                    old_error, old_time_bad, old_task_bad = self._save_issues[task["id"]]
+                    error, time_bad, task_bad = old_error, old_time_bad or time_bad, old_task_bad or task_bad
+                self._save_issues[task["id"]] = (error, time_bad, task_bad)
+
+        rows = [row for issue in issues for row in issue["rows"]]
+        if rows and not any(self.first <= row < self.first + VISIBLE_ROWS for row in rows):
+            self.first = min(rows)
+        self._refresh_view()
+
     def exit_and_return(self):
         """
         @brief 退出设置页并回到主页面，如未保存配置则阻止退出。
@@ -2,25 +2,41 @@ import tkinter as tk
 from ttkbootstrap import Frame, Label, Combobox
 from ttkbootstrap.dialogs import Messagebox
 
-from utils.file_utils import load_json, list_config_ids
+from utils.file_utils import list_config_ids, get_storage
+from utils.stats import (RatioSeries, STATS_WINDOWS, DEFAULT_WINDOW, ALL_TIME_START, BUCKET_UNITS,
+                         calendar_start, calendar_grid)
+from utils.tasks import LatestTaskRunner, raise_if_cancelled
+from utils.metrics import summarize, format_metrics
+import matplotlib
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.figure import Figure
 
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+from gui.charts import DailyBarChart, CalendarHeatmap
+
+from datetime import date, timedelta
+
+VIEW_BAR = "柱状图"
+VIEW_HEATMAP = "日历热力图"
+HEATMAP_WINDOW = "最近一年"
 
 # ---------- Matplotlib 字体配置 ----------
-plt.rcParams['font.family'] = 'SimHei'  # 黑体适配中文
-plt.rcParams['axes.unicode_minus'] = False  # 正确显示负号
+# 只使用面向对象的 Figure 接口，无需导入 pyplot（可明显缩短首次打开统计页的时间）
+matplotlib.rcParams['font.family'] = 'SimHei'  # 黑体适配中文
+matplotlib.rcParams['axes.unicode_minus'] = False  # 正确显示负号
 
 
 class StatsPage(Frame):
     """
     @class StatsPage
-    @brief 统计页面：展示过去30天完成率图表（柱状图）和平均值。
+    @brief 统计页面：展示所选时间范围内的完成率图表（柱状图）和平均值。
     
     @details
     - 支持计划切换
+    - 支持 7/30/90/365 天及全部历史，长范围按周/按月合并显示
+    - 日历热力图：以单个图像显示最近一年每天的完成率，请假日置灰
+    - 请假日（含休假区间）不计入平均值与图表
+    - 显示计划的连续达标天数、7/30 日滚动平均与周环比
+    - 读取与汇总在后台线程完成，新的选择会取代尚未完成的计算，期间显示加载状态
     - 自动加载计划对应的 summary 数据
     - 图表颜色随完成率渐变
     """
@@ -38,6 +54,7 @@ class StatsPage(Frame):
         self.master = master
         self.current_plan_id = current_plan_id
         self.on_close = on_close
+        self._runner = LatestTaskRunner(self)
 
         self._build_ui()
         self.master.protocol("WM_DELETE_WINDOW", self.handle_close)
@@ -55,110 +72,166 @@ class StatsPage(Frame):
         self.plan_selector.pack(anchor="w", padx=10)
         self.plan_selector.bind("<<ComboboxSelected>>", self.refresh_stats)
 
-        self.figure = plt.Figure(figsize=(12, 5.5), dpi=100)
+        Label(self, text="统计范围：").pack(anchor="w", padx=10, pady=5)
+        self.window_selector = Combobox(self, values=list(STATS_WINDOWS), width=20, state="readonly")
+        self.window_selector.set(DEFAULT_WINDOW)
+        self.window_selector.pack(anchor="w", padx=10)
+        self.window_selector.bind("<<ComboboxSelected>>", self.refresh_stats)
+
+        Label(self, text="图表类型：").pack(anchor="w", padx=10, pady=5)
+        self.view_selector = Combobox(self, values=[VIEW_BAR, VIEW_HEATMAP], width=20, state="readonly")
+        self.view_selector.set(VIEW_BAR)
+        self.view_selector.pack(anchor="w", padx=10)
+        self.view_selector.bind("<<ComboboxSelected>>", self.refresh_stats)
+
+        self.figure = Figure(figsize=(12, 5.5), dpi=100)
         self.canvas = FigureCanvasTkAgg(self.figure, master=self)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # 坐标轴、柱子和标签只创建一次，切换计划时仅更新数据
+        self.chart = DailyBarChart(self.figure)
+        self.heatmap = CalendarHeatmap(self.figure)
 
         self.avg_label = Label(self, text="平均完成率：0%", font=("Helvetica", 12))
         self.avg_label.pack(pady=5)
 
+        self.metrics_label = Label(self, text="", font=("Helvetica", 10))
+        self.metrics_label.pack(pady=(0, 5))
+
     def refresh_stats(self, event=None):
         """
-        @brief 刷新图表数据。
+        @brief 刷新图表数据：在后台线程读取并汇总，完成后回到 Tk 线程绘制。
         @param event ComboBox 事件（可忽略）
         """
         plan_id = self.plan_selector.get()
+        view = self.view_selector.get()
+        if view == VIEW_HEATMAP:
+            window = HEATMAP_WINDOW
+            self.window_selector.configure(state="disabled")
+        else:
+            window = self.window_selector.get()
+            if window not in STATS_WINDOWS:
+                window = DEFAULT_WINDOW
+            self.window_selector.configure(state="readonly")
 
-        if plan_id == "总体统计":
-            self.load_aggregated_summary()
-            return
-    
-        today = datetime.now()
-        last_30_days = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(29, -1, -1)]
+        self.avg_label.config(text=f"{window}平均完成率：加载中…")
+        self.configure(cursor="watch")
+        self._runner.submit(lambda cancel: self.compute_stats(plan_id, window, cancel, view),
+                            self._show_stats, self._show_error)
 
-        summary_path = f"data/summary_{plan_id}.json"
-        summary_data = load_json(summary_path, default={})
+    def compute_stats(self, plan_id, window, cancel, view=VIEW_BAR):
+        """
+        @brief 读取汇总数据并计算图表所需的序列（在后台线程执行，不访问任何控件）。
+        @param plan_id 计划 ID 或 "总体统计"
+        @param window 统计范围显示名
+        @param cancel 取消标志，被新的选择取代时置位
+        @param view 图表类型（VIEW_BAR / VIEW_HEATMAP）
+        @return {"view", "window", "series", "metrics", "buckets" 或 "grid"}
+        """
+        end = date.today().isoformat()
+        if view == VIEW_HEATMAP:
+            start = calendar_start(end)
+        else:
+            days = STATS_WINDOWS[window]
+            start = None if days is None else (date.today() - timedelta(days=days - 1)).isoformat()
 
-        daily_data = [{"date": d, "ratio": summary_data.get(d, 0)} for d in last_30_days]
+        metrics = None
+        if plan_id == "总体统计":
+            summary_data = self.load_aggregated_summary(start, end)
+        else:
+            summary_data = get_storage().load_summary(plan_id)
+            metrics = get_storage().load_metrics(plan_id)
+        raise_if_cancelled(cancel)
+
+        series = RatioSeries.from_summary(summary_data, start, end)
+        series.exclude_leave(get_storage().load_leave_calendar())
+        raise_if_cancelled(cancel)
+        if view == VIEW_HEATMAP:
+            grid = calendar_grid(series)
+            return {"view": view, "window": window, "series": series, "metrics": metrics, "grid": grid}
+        return {"view": view, "window": window, "series": series, "metrics": metrics,
+                "buckets": series.bucketed()}
+
+    def _show_stats(self, result):
+        """
+        @brief 后台计算完成后在 Tk 线程中更新平均值标签与图表。
+        @param result compute_stats 的返回值
+        """
+        self.configure(cursor="")
+        window, series = result["window"], result["series"]
+        if series.counted():
+            self.avg_label.config(text=f"{window}平均完成率：{int(series.mean() * 100)}%")
+        else:
+            self.avg_label.config(text=f"{window}平均完成率：无数据")
 
-        if daily_data:
-            avg_ratio = sum(d["ratio"] for d in daily_data) / len(daily_data)
-            self.avg_label.config(text=f"过去30天平均完成率：{int(avg_ratio * 100)}%")
+        metrics = result["metrics"]
+        if metrics and metrics["day"]:
+            summary = summarize(metrics)
+            self.metrics_label.config(text=f"截至 {summary['day']}：" + format_metrics(summary, "　｜　"))
         else:
-            self.avg_label.config(text="过去30天平均完成率：无数据")
+            self.metrics_label.config(text="")
 
-        self.after(20, lambda: self.plot_daily_bar(daily_data))
+        if result["view"] == VIEW_HEATMAP:
+            self.plot_heatmap(series, window, result["grid"])
+        else:
+            self.plot_daily_bar(series, window, result["buckets"])
 
-    def plot_daily_bar(self, daily_data):
+    def _show_error(self, error):
         """
-        @brief 绘制30天完成率柱状图。
-
-        @param daily_data 结构为 [{'date': str, 'ratio': float}, ...]
+        @brief 后台计算失败时显示错误信息。
         """
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        self.configure(cursor="")
+        self.avg_label.config(text=f"统计失败：{error}")
 
-        dates = [d["date"] for d in daily_data]
-        ratios = [d["ratio"] * 100 for d in daily_data]
-
-        # 渐变绿色 colormap（0% -> 浅绿, 100% -> 深绿）
-        cmap = LinearSegmentedColormap.from_list("green_shades", ["#ccffcc", "#006600"], N=100)
-        colors = [cmap(min(int(r), 99)) for r in ratios]
-
-        bars = ax.bar(dates, ratios, color=colors)
+    def plot_daily_bar(self, series, window, buckets=None):
+        """
+        @brief 绘制完成率柱状图（长范围自动按周/按月合并）。
 
-        for bar, value in zip(bars, ratios):
-            ax.text(
-                bar.get_x() + bar.get_width() / 2,
-                bar.get_height() + 1,
-                f"{int(value)}%",
-                ha='center',
-                va='bottom',
-                fontsize=8
-            )
+        @param series RatioSeries 每日完成率
+        @param window 统计范围显示名，用于标题
+        @param buckets 可选，已计算好的 series.bucketed() 结果
+        """
+        if buckets is None:
+            buckets = series.bucketed()
 
-        ax.set_ylim(0, 110)
-        ax.set_ylabel("完成率 (%)")
-        ax.set_xticks(dates)
-        ax.set_xticklabels(dates, rotation=45, ha='right')
+        title = f"{window}完成率"
+        if series.counted():
+            title += f"（{BUCKET_UNITS[buckets['unit']]}，平均 {int(series.mean() * 100)}%）"
 
-        if ratios:
-            avg_value = int(sum(ratios) / len(ratios))
-            ax.set_title(f"过去30天完成率（平均 {avg_value}%）")
+        if buckets["unit"] == "day":
+            self.chart.update(buckets["labels"], buckets["mean"], title)
         else:
-            ax.set_title("过去30天完成率")
+            self.chart.update(buckets["labels"], buckets["mean"], title, buckets["low"], buckets["high"])
+        self.heatmap.set_visible(False)
+        self.chart.set_visible(True)
+        self.canvas.draw_idle()
+
+    def plot_heatmap(self, series, window, grid):
+        """
+        @brief 绘制日历热力图（7 行 × 53 列的单个图像）。
 
-        self.figure.subplots_adjust(bottom=0.25, top=0.88)
-        self.canvas.draw()
+        @param series RatioSeries 每日完成率（从 calendar_start() 开始）
+        @param window 范围显示名，用于标题
+        @param grid utils.stats.calendar_grid() 的结果
+        """
+        title = f"{window}完成率（平均 {int(series.mean() * 100)}%，灰色为请假日）"
+        self.heatmap.update(grid, title)
+        self.chart.set_visible(False)
+        self.heatmap.set_visible(True)
+        self.canvas.draw_idle()
 
     def handle_close(self):
         """
         @brief 窗口关闭事件，触发 on_close 回调并销毁窗口。
         """
+        self._runner.close()
         if self.on_close:
             self.on_close()
         self.master.destroy()
     
-    def load_aggregated_summary(self):
+    def load_aggregated_summary(self, start, end):
         """
-        汇总所有计划的每日最大完成率
+        汇总所有计划的每日最大完成率（读取增量维护的总体统计索引）
+        @param start 起始日期，None 表示全部历史
+        @param end 结束日期
         """
-        from glob import glob
-        all_summaries = glob("data/summary_*.json")
-        all_data = {}
-        for path in all_summaries:
-            data = load_json(path, default={})
-            for day, ratio in data.items():
-                if day not in all_data:
-                    all_data[day] = ratio
-                else:
-                    all_data[day] = max(all_data[day], ratio)
-
-        today = datetime.now()
-        last_30_days = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(29, -1, -1)]
-        daily_data = [{"date": d, "ratio": all_data.get(d, 0)} for d in last_30_days]
-
-        avg_ratio = sum(d["ratio"] for d in daily_data) / len(daily_data)
-        self.avg_label.config(text=f"过去30天平均完成率：{int(avg_ratio * 100)}%")
-
-        self.plot_daily_bar(daily_data)
+        return get_storage().load_aggregate(start or ALL_TIME_START, end)
@@ -0,0 +1,86 @@
+import tkinter as tk
+from ttkbootstrap import Frame, Label
+
+TOAST_MS = 8000        # 提示自动消失的时间
+TOAST_WIDTH = 300
+TOAST_MARGIN = 16      # 与屏幕边缘、相邻提示之间的间距
+MAX_TOASTS = 4         # 同时显示的提示数上限，超过时先关闭最早的
+
+
+class ToastStack:
+    """
+    @class ToastStack
+    @brief 屏幕右下角的非模态提示框（toast）。
+
+    @details
+    每条提示是一个无边框、置顶的 Toplevel，不抢占焦点、不进入嵌套事件循环，
+    显示期间主窗口照常刷新；点击提示或超时后自动关闭，其余提示向下补位。
+    """
+
+    def __init__(self, master: tk.Misc):
+        """
+        @param master 提示框的父控件，同时用于计时；销毁前应调用 close_all()
+        """
+        self.master = master
+        self.toasts = []
+
+    def show(self, title: str, message: str) -> None:
+        """
+        @brief 显示一条提示。
+        @param title 标题
+        @param message 正文（可多行）
+        """
+        while len(self.toasts) >= MAX_TOASTS:
+            self._close(self.toasts[0])
+
+        win = tk.Toplevel(self.master)
+        win.overrideredirect(True)
+        win.attributes("-topmost", True)
+
+        frame = Frame(win, padding=10, bootstyle="info")
+        frame.pack(fill=tk.BOTH, expand=True)
+        Label(frame, text=title, font=("Helvetica", 11, "bold"), bootstyle="inverse-info").pack(anchor="w")
+        Label(frame, text=message, wraplength=TOAST_WIDTH - 20, justify="left",
+              bootstyle="inverse-info").pack(anchor="w", pady=(4, 0))
+
+        toast = {"win": win, "job": None}
+        toast["job"] = self.master.after(TOAST_MS, lambda: self._close(toast))
+        for widget in (win, frame, *frame.winfo_children()):
+            widget.bind("<Button-1>", lambda _e: self._close(toast))
+
+        self.toasts.append(toast)
+        self._place()
+
+    def _close(self, toast: dict) -> None:
+        if toast not in self.toasts:
+            return
+        self.toasts.remove(toast)
+        self.master.after_cancel(toast["job"])
+        if toast["win"].winfo_exists():
+            toast["win"].destroy()
+        self._place()
+
+    def _place(self) -> None:
+        """
+        @brief 自下而上依次排列现有提示，最新的在最下方。
+        """
+        if not self.toasts:
+            return
+        sw = self.master.winfo_screenwidth()
+        bottom = self.master.winfo_screenheight() - TOAST_MARGIN * 3
+        for toast in reversed(self.toasts):
+            win = toast["win"]
+            if not win.winfo_exists():
+                continue
+            win.update_idletasks()
+            h = win.winfo_reqheight()
+            bottom -= h
+            win.geometry(f"{TOAST_WIDTH}x{h}+{sw - TOAST_WIDTH - TOAST_MARGIN}+{bottom}")
+            bottom -= TOAST_MARGIN
+
+    def close_all(self) -> None:
+        """
+        @brief 关闭全部提示（页面销毁时调用）。
+        """
+        for toast in list(self.toasts):
+            self._close(toast)
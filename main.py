@@ -1,4 +1,6 @@
 import os
+import importlib
+import threading
 import tkinter as tk
 from ttkbootstrap import Style
 from ttkbootstrap.dialogs import Messagebox
@@ -6,7 +8,11 @@ from ttkbootstrap.dialogs import Messagebox
 from utils.file_utils import *
 from gui.setting_page import SettingPage
 from gui.progress_page import ProgressPage
-from gui.stats_page import StatsPage
+from gui.animation import SlideAnimator
+
+# 进度条显示后，在后台线程预先导入统计页（matplotlib），使首次打开统计更快
+PREWARM_STATS = True
+PREWARM_DELAY_MS = 2000
 
 
 class DailyProgressApp(tk.Tk):
@@ -27,17 +33,24 @@ class DailyProgressApp(tk.Tk):
         self.resizable(False, False)
         self.style = Style("cosmo")
         ensure_dirs()
+        get_storage().ensure_aggregate()  # 旧数据目录：在创建界面之前一次性生成总体统计索引
+        attach_writer(self)
 
         self._auto_hide_threshold = 100000
         self._visible_edge_height = -20
         self._edge_margin = 50
-        self._slide_step = 10
-        self._slide_interval = 1
         self._hide_delay = 200
 
         self._is_hidden = False
-        self._animating = False
         self._hide_job = None
+        self._animator = SlideAnimator(self)
+
+        # 窗口事件合并：同一空闲周期内的多个事件只触发一次 _evaluate_window()
+        self._window_job = None
+        self._last_geometry = None
+        self._pointer_inside = False
+        self.window_events = 0       # 收到的根窗口事件数
+        self.window_evaluations = 0  # 实际执行的评估次数
 
         self.vertical = False
         self.current_plan_id = None
@@ -50,36 +63,64 @@ class DailyProgressApp(tk.Tk):
             self.withdraw()
             self.show_setting_page()
 
-        self.bind("<Configure>", self._on_configure)
-        self.bind("<Enter>", self._on_pointer_enter)
-        self.bind("<Leave>", self._on_pointer_leave)
+        if PREWARM_STATS:
+            self.after(PREWARM_DELAY_MS, self._prewarm_stats)
+
+        for sequence in ("<Configure>", "<Enter>", "<Leave>"):
+            self.bind(sequence, self._on_window_event)
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
-    def _on_configure(self, _):
+    def _on_window_event(self, event):
         """
-        @brief 窗口位置变化回调，判断是否准备隐藏。
-        @param _ 未使用的事件参数。
+        @brief 根窗口的 <Configure>/<Enter>/<Leave> 回调：只安排一次空闲时的评估。
+        @param event 事件对象
+
+        @details
+        绑定在根窗口上的事件也会收到所有子控件的同类事件（子控件的 bindtags 含根窗口），
+        这些事件一律忽略；根窗口自身的事件也不立即处理，
+        而是合并为一次 after_idle 评估，由它比较几何信息与鼠标位置是否真的变化。
         """
-        if not self._is_hidden and not self._animating and self.winfo_y() <= self._auto_hide_threshold:
-            if self._hide_job is None:
-                self._hide_job = self.after(300, self._try_hide)
+        if event.widget is not self:
+            return
+        self.window_events += 1
+        if self._window_job is None:
+            self._window_job = self.after_idle(self._evaluate_window)
 
-    def _on_pointer_enter(self, _):
+    def _evaluate_window(self):
         """
-        @brief 鼠标进入窗口区域，取消隐藏并立即展开。
-        @param _ 未使用的事件参数。
+        @brief 比较上次记录的窗口几何与鼠标是否在窗口内，按变化决定展开或安排隐藏。
+
+        @details
+        - 鼠标进入：取消待执行的隐藏并展开；
+        - 鼠标离开且窗口贴顶：延迟 _hide_delay 后尝试隐藏；
+        - 仅窗口被移动（非动画造成）且贴顶：延迟 300ms 后尝试隐藏。
         """
-        self._cancel_hide_job()
-        self._animate_show()
+        self._window_job = None
+        self.window_evaluations += 1
+
+        geometry = (self.winfo_x(), self.winfo_y(), self.winfo_width(), self.winfo_height())
+        inside = self._pointer_in_widget()
+        moved = geometry != self._last_geometry
+        entered = inside and not self._pointer_inside
+        left = self._pointer_inside and not inside
+        self._last_geometry, self._pointer_inside = geometry, inside
+
+        if entered:
+            self._cancel_hide_job()
+            self._animate_show()
+        elif left:
+            self._schedule_hide(self._hide_delay)
+        elif moved and not self._animator.running and geometry[1] != self._animator.last_y:
+            # 动画进行中、或位置仍是动画最后设置的位置时，不是用户移动了窗口
+            self._schedule_hide(300)
 
-    def _on_pointer_leave(self, _):
+    def _schedule_hide(self, delay_ms: int):
         """
-        @brief 鼠标离开窗口，若贴顶则准备隐藏。
-        @param _ 未使用的事件参数。
+        @brief 窗口贴顶且未隐藏时，安排一次延迟隐藏（已有待执行的隐藏则不重复安排）。
+        @param delay_ms 延迟毫秒数
         """
-        if self.winfo_y() <= self._auto_hide_threshold and not self._is_hidden:
-            if self._hide_job is None:
-                self._hide_job = self.after(self._hide_delay, self._try_hide)
+        if not self._is_hidden and self.winfo_y() <= self._auto_hide_threshold and self._hide_job is None:
+            self._hide_job = self.after(delay_ms, self._try_hide)
 
     def _try_hide(self):
         """
@@ -89,46 +130,35 @@ class DailyProgressApp(tk.Tk):
         if not self._pointer_in_widget():
             self._animate_hide()
 
+    def _hidden_y(self) -> int:
+        return -(self.winfo_height() - self._visible_edge_height)
+
     def _animate_hide(self):
         """
-        @brief 执行隐藏动画，窗口向上滑动。
+        @brief 执行隐藏动画，窗口向上滑动（展开途中调用时就地反向）。
         """
-        if self._is_hidden or self._animating:
+        if self._is_hidden and not self._animator.running:
             return
-        self._animating = True
         self.update_idletasks()
-        target_y = -(self.winfo_height() - self._visible_edge_height)
-        self._slide(to_y=target_y, on_complete=lambda: setattr(self, "_is_hidden", True))
+        target_y = self._hidden_y()
+        self._animator.slide_to(target_y, abs(target_y), on_complete=lambda: self._on_slide_done(True))
 
     def _animate_show(self):
         """
-        @brief 执行展开动画，窗口滑回顶部。
+        @brief 执行展开动画，窗口滑回顶部（隐藏途中鼠标重新进入时就地反向）。
         """
-        if not self._is_hidden or self._animating:
+        if not self._is_hidden and not self._animator.running:
             return
-        self._animating = True
-        self._slide(to_y=0, on_complete=lambda: setattr(self, "_is_hidden", False))
+        self._animator.slide_to(0, abs(self._hidden_y()), on_complete=lambda: self._on_slide_done(False))
 
-    def _slide(self, to_y: int, on_complete):
+    def _on_slide_done(self, hidden: bool):
         """
-        @brief 执行窗口平滑滑动动画。
-        @param to_y 滑动目标 y 坐标。
-        @param on_complete 动画完成后的回调函数。
+        @brief 滑动到位后记录隐藏状态；若鼠标仍在窗口内则取消待执行的隐藏。
+        @param hidden 是否为隐藏位置
         """
-        cur_x, cur_y = self.winfo_x(), self.winfo_y()
-        step = self._slide_step if to_y > cur_y else -self._slide_step
-        next_y = cur_y + step
-
-        if (step > 0 and next_y >= to_y) or (step < 0 and next_y <= to_y):
-            self.geometry(f"+{cur_x}+{to_y}")
-            self._animating = False
-            on_complete()
-            if self._pointer_in_widget():
-                self._cancel_hide_job()
-            return
-
-        self.geometry(f"+{cur_x}+{next_y}")
-        self.after(self._slide_interval, lambda: self._slide(to_y, on_complete))
+        self._is_hidden = hidden
+        if self._pointer_in_widget():
+            self._cancel_hide_job()
 
     def _pointer_in_widget(self) -> bool:
         """
@@ -149,6 +179,15 @@ class DailyProgressApp(tk.Tk):
             self.after_cancel(self._hide_job)
             self._hide_job = None
 
+    def _prewarm_stats(self):
+        """
+        @brief 在空闲的后台线程中导入统计页模块（含 matplotlib），不阻塞界面。
+        """
+        threading.Thread(
+            target=importlib.import_module, args=("gui.stats_page",),
+            name="stats-prewarm", daemon=True
+        ).start()
+
     def show_setting_page(self):
         """
         @brief 显示设置页面窗口。
@@ -180,6 +219,8 @@ class DailyProgressApp(tk.Tk):
         """
         @brief 显示统计页面。
         """
+        from gui.stats_page import StatsPage
+
         self.clear_center_frames()
         self.attributes("-topmost", False)
         StatsPage(self, self.current_plan_id)
@@ -226,12 +267,14 @@ class DailyProgressApp(tk.Tk):
 
     def _on_close(self):
         """
-        @brief 在关闭主窗口时保存统计
+        @brief 在关闭主窗口时落盘未写入的状态并保存统计
         """
         for w in self.winfo_children():
             if isinstance(w, ProgressPage):
+                w.flush_pending()
                 w.save_daily_completion_summary()
         self.destroy()
+        shutdown_writer()
 
 
 
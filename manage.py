@@ -0,0 +1,149 @@
+import argparse
+import sys
+from datetime import date
+
+from utils.file_utils import (ensure_dirs, get_storage, shutdown_writer, storage_backend_name, set_storage_backend,
+                              list_config_ids)
+from utils.plan_io import read_plans, save_plan, write_plans
+from utils.storage import JsonStorage, SqliteStorage, SQLITE_PATH
+
+
+def cmd_import_json(args):
+    """
+    @brief 将 data/ 下现有 JSON 文件一次性导入 SQLite 数据库。
+    @param args 命令行参数（db, switch）
+    """
+    target = SqliteStorage(args.db)
+    counts = target.import_from(JsonStorage())
+    print(f"已导入：勾选状态 {counts['status']} 条，每日汇总 {counts['summary']} 条，请假日 {counts['leave']} 条 -> {args.db}")
+    if args.switch:
+        set_storage_backend("sqlite")
+        print("存储后端已切换为 sqlite")
+
+
+def cmd_rebuild_aggregate(_args):
+    """
+    @brief 从各计划汇总重新生成“总体统计”索引。
+    """
+    storage = get_storage()
+    days = storage.rebuild_aggregate()
+    print(f"总体统计索引已重建（{storage.name}）：共 {days} 天")
+
+
+def cmd_use(args):
+    """
+    @brief 切换存储后端（写入 data/settings.json，下次启动生效）。
+    @param args 命令行参数（backend）
+    """
+    set_storage_backend(args.backend)
+    print(f"存储后端已切换为 {args.backend}")
+
+
+def cmd_show(_args):
+    """
+    @brief 显示当前生效的存储后端。
+    """
+    print(storage_backend_name())
+
+
+def cmd_import_plans(args):
+    """
+    @brief 从 CSV / .ics 文件批量导入计划（与设置页保存时相同的校验）。
+    @param args 命令行参数（files, overwrite, dry_run）
+    @return 有计划未导入时返回 1
+    """
+    failed = 0
+    for path in args.files:
+        try:
+            for plan_id, rows in read_plans(path):
+                result = save_plan(plan_id, rows, overwrite=args.overwrite, dry_run=args.dry_run)
+                status = result["status"]
+                if status == "saved":
+                    print(f"已导入 {plan_id}：{result['rows']} 项")
+                elif status == "valid":
+                    print(f"校验通过 {plan_id}：{result['rows']} 项")
+                elif status == "exists":
+                    failed += 1
+                    print(f"已跳过 {plan_id}：计划已存在（可使用 --overwrite 覆盖）")
+                else:
+                    failed += 1
+                    print(f"未导入 {plan_id}：共 {len(result['issues'])} 处问题")
+                    for issue in result["issues"]:
+                        print(f"  {issue['message']}")
+        except (OSError, ValueError) as e:
+            failed += 1
+            print(f"读取失败 {path}：{e}")
+    return 1 if failed else 0
+
+
+def cmd_export_plans(args):
+    """
+    @brief 将计划导出为 CSV / .ics 文件。
+    @param args 命令行参数（output, plans, date）
+    @return 指定的计划不存在时返回 1
+    """
+    existing = set(list_config_ids())
+    missing = [plan_id for plan_id in args.plans or [] if plan_id not in existing]
+    if missing:
+        print(f"计划不存在：{'、'.join(missing)}")
+        return 1
+    plan_ids = args.plans or sorted(existing)
+    on_date = date.fromisoformat(args.date) if args.date else None
+    count = write_plans(args.output, plan_ids, on_date)
+    print(f"已导出 {len(plan_ids)} 个计划，共 {count} 项 -> {args.output}")
+    return 0
+
+
+def build_parser():
+    """
+    @brief 构建命令行解析器。
+    @return argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(description="Daily Progress Tracker 数据维护工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import-json", help="将 JSON 数据导入 SQLite")
+    p.add_argument("--db", default=SQLITE_PATH, help=f"SQLite 数据库路径（默认 {SQLITE_PATH}）")
+    p.add_argument("--switch", action="store_true", help="导入后将存储后端切换为 sqlite")
+    p.set_defaults(func=cmd_import_json)
+
+    p = sub.add_parser("rebuild-aggregate", help="重建总体统计索引")
+    p.set_defaults(func=cmd_rebuild_aggregate)
+
+    p = sub.add_parser("use", help="切换存储后端")
+    p.add_argument("backend", choices=["json", "sqlite"])
+    p.set_defaults(func=cmd_use)
+
+    p = sub.add_parser("import-plans", help="从 CSV（time,task 或 plan,time,task）或 .ics 文件导入计划")
+    p.add_argument("files", nargs="+", help="要导入的文件，可指定多个")
+    p.add_argument("--overwrite", action="store_true", help="覆盖已存在的同名计划")
+    p.add_argument("--dry-run", action="store_true", help="只校验，不写入")
+    p.set_defaults(func=cmd_import_plans)
+
+    p = sub.add_parser("export-plans", help="将计划导出为 CSV 或 .ics 文件（按扩展名）")
+    p.add_argument("output", help="输出文件路径（*.csv / *.ics）")
+    p.add_argument("--plan", dest="plans", action="append", help="要导出的计划 ID，可重复；默认全部")
+    p.add_argument("--date", help="iCalendar 事件的起始日期 YYYY-MM-DD（默认今天）")
+    p.set_defaults(func=cmd_export_plans)
+
+    p = sub.add_parser("show-storage", help="显示当前存储后端")
+    p.set_defaults(func=cmd_show)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    @brief 命令行入口。
+    @param argv 参数列表，默认取 sys.argv[1:]
+    """
+    ensure_dirs()
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    finally:
+        shutdown_writer()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
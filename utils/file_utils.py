@@ -1,7 +1,135 @@
 import os
 import json
+import tempfile
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+from utils.persistence import PersistenceWorker, clone_json as _clone
+
+# 进程内唯一的后台写盘线程
+_writer = PersistenceWorker()
+_MISSING = object()
+
+# 存储后端选择
+STORAGE_ENV = 'DAILY_PROGRESS_STORAGE'
+SETTINGS_PATH = 'data/settings.json'
+_storage = None
+
+
+class JsonCache:
+    """
+    @class JsonCache
+    @brief 进程内共享的 JSON 解析结果缓存。
+
+    @details
+    - 以路径为键，记录文件的 (mtime_ns, size) 签名；读取时用 os.stat 校验，
+      文件被外部修改后自动失效。
+    - 写入（save_json）成功后直接以新数据和新签名更新缓存，保存不会引发重新读取。
+    - 以文件大小估算占用，总量超过 max_bytes 时按 LRU 淘汰。
+    - get() 默认返回副本，调用方可自由修改；只读调用方可传 copy=False 省去复制。
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        """
+        @brief 构造缓存。
+        @param max_bytes 缓存总量上限（按文件字节数估算）
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (signature, size, data)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def signature(path):
+        """
+        @brief 获取文件签名 (mtime_ns, size)。
+        @throws OSError 文件不存在或无法访问
+        """
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, path, signature, copy=True):
+        """
+        @brief 查找签名一致的缓存数据。
+        @param path 文件路径
+        @param signature 当前文件签名
+        @param copy 是否返回副本；为 False 时返回缓存中的对象本身，调用方不得修改
+        @return 缓存数据（或其副本）；未命中返回 _MISSING
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                data = entry[2]
+            else:
+                self.misses += 1
+                return _MISSING
+        return _clone(data) if copy else data
+
+    def put(self, path, signature, data):
+        """
+        @brief 写入/替换缓存项，并按 LRU 淘汰超出上限的项。
+        @param path 文件路径
+        @param signature 文件签名
+        @param data 解析后的数据（缓存保存其副本）
+        """
+        data = _clone(data)
+        size = signature[1]
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[path] = (signature, size, data)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, old_size, _) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def discard(self, path):
+        """
+        @brief 移除某路径的缓存项（文件被删除时调用）。
+        """
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def stats(self):
+        """
+        @brief 获取缓存统计信息。
+        @return dict：hits、misses、evictions、entries、bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+
+# 进程内共享的 JSON 缓存
+_cache = JsonCache()
+
+
+def json_cache_stats():
+    """
+    @brief 查看 JSON 缓存的命中/未命中等统计信息。
+    @return dict：hits、misses、evictions、entries、bytes
+    """
+    return _cache.stats()
+
+
 def ensure_dirs():
     """
     @brief 确保所需的目录存在。
@@ -14,33 +142,132 @@ def ensure_dirs():
     os.makedirs('data', exist_ok=True)
 
 
-def load_json(path, default=None):
+def load_json(path, default=None, copy=True):
     """
     @brief 从指定路径加载 JSON 文件。
 
     @param path 文件路径
     @param default 文件不存在时返回的默认值，默认为空字典 {}
+    @param copy 为 False 时直接返回缓存/待写队列中的对象（只读用途，省去复制），调用方不得修改
 
-    @return 成功读取返回解析后的 JSON 对象；若文件不存在或错误，则返回 default。
+    @return 成功读取返回解析后的 JSON 对象；若文件不存在或内容损坏，则返回 default。
+
+    @note 若该路径有尚未落盘的异步写入，直接返回其最新数据的副本；
+          否则优先使用签名（mtime、大小）未变的缓存结果。
     """
-    if os.path.exists(path):
+    pending = _writer.pending(path, _MISSING)
+    if pending is not _MISSING:
+        return _clone(pending) if copy else pending
+
+    try:
+        signature = JsonCache.signature(path)
+    except OSError:
+        _cache.discard(path)
+        return default if default is not None else {}
+
+    data = _cache.get(path, signature, copy)
+    if data is not _MISSING:
+        return data
+
+    try:
         with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return default if default is not None else {}
+            data = json.load(f)
+    except (OSError, ValueError):
+        return default if default is not None else {}
+    _cache.put(path, signature, data)
+    return data
 
 
-def save_json(path, data):
+def save_json(path, data, fsync=False):
     """
-    @brief 将数据保存为 JSON 文件。
+    @brief 将数据原子地保存为 JSON 文件。
 
     @param path 文件保存路径
     @param data 要保存的 Python 对象（通常为 dict 或 list）
+    @param fsync 是否在替换前将临时文件刷入磁盘，默认 False
 
     @details
     数据将以 UTF-8 编码保存，并使用 4 空格缩进和非 ASCII 字符直写。
+    先写入同目录下的临时文件，再通过 os.replace 替换目标文件，
+    写入中途崩溃不会留下半截 JSON。
     """
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _cache.put(path, JsonCache.signature(path), data)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def save_json_async(path, data, on_done=None):
+    """
+    @brief 将 JSON 写入交给后台线程，立即返回。
+
+    @param path 文件保存路径
+    @param data 要保存的 Python 对象，提交时即做快照
+    @param on_done 可选回调 on_done(error)，写入完成后在 Tk 线程调用
+
+    @details
+    同一路径尚未开始的写入会被新的请求覆盖；写入前 load_json 读取该路径
+    会得到最新提交的数据。
+    """
+    _writer.submit(path, data, save_json, on_done)
+
+
+def submit_write(key, data, writer, on_done=None):
+    """
+    @brief 提交任意后台写入任务（供存储后端使用）。
+
+    @param key 排队键，同一键的写入按提交顺序执行，未开始的旧请求会被覆盖
+    @param data 写入数据，提交时即做快照
+    @param writer 写入函数 writer(key, data)，在后台线程执行
+    @param on_done 可选回调 on_done(error)，写入完成后在 Tk 线程调用
+    """
+    _writer.submit(key, data, writer, on_done)
+
+
+def pending_writes(prefix):
+    """
+    @brief 获取以 prefix 开头、尚未落盘的后台写入数据。
+    @param prefix 排队键前缀
+    @return {键: 待写数据}
+    """
+    return _writer.pending_items(prefix)
+
+
+def attach_writer(widget):
+    """
+    @brief 绑定用于回传异步写入完成通知的 Tk 控件（通常为根窗口）。
+    @param widget 提供 after/after_cancel 的控件
+    """
+    _writer.attach(widget)
+
+
+def flush_writes(timeout=None):
+    """
+    @brief 等待所有异步写入落盘。
+    @param timeout 最长等待秒数，None 表示一直等待
+    @return 队列是否已清空
+    """
+    return _writer.flush(timeout)
+
+
+def shutdown_writer(timeout=None):
+    """
+    @brief 写完所有排队数据后停止后台写盘线程，应在程序退出前调用。
+    @param timeout 最长等待秒数，None 表示一直等待
+    """
+    _writer.shutdown(timeout)
 
 
 def list_config_ids():
@@ -59,3 +286,39 @@ def get_today():
     @return 当前日期，格式为 "YYYY-MM-DD"。
     """
     return datetime.now().strftime('%Y-%m-%d')
+
+
+def get_storage():
+    """
+    @brief 获取进程内共享的状态/汇总/请假存储后端。
+
+    @return utils.storage.Storage 实例，首次调用时按配置创建
+
+    @details
+    后端由环境变量 DAILY_PROGRESS_STORAGE 或 data/settings.json 中的
+    "storage" 字段选择，可选 "json"（默认）与 "sqlite"。
+    """
+    global _storage
+    if _storage is None:
+        from utils.storage import create_storage
+        _storage = create_storage(storage_backend_name())
+    return _storage
+
+
+def storage_backend_name():
+    """
+    @brief 读取当前配置的存储后端名称。
+    @return "json" 或 "sqlite"
+    """
+    name = os.environ.get(STORAGE_ENV) or load_json(SETTINGS_PATH, {}).get("storage", "json")
+    return name.strip().lower()
+
+
+def set_storage_backend(name):
+    """
+    @brief 将存储后端写入 data/settings.json，下次启动生效。
+    @param name "json" 或 "sqlite"
+    """
+    settings = load_json(SETTINGS_PATH, {})
+    settings["storage"] = name
+    save_json(SETTINGS_PATH, settings)
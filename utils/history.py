@@ -0,0 +1,246 @@
+import os
+import struct
+from datetime import date
+
+# 文件头：魔数、版本号、每条记录的位图字节数
+_HEADER = struct.Struct("<4sBH")
+_MAGIC = b"DPTH"
+_VERSION = 1
+
+# 记录头：日期序数（date.toordinal）、当天的段数
+_RECORD_HEAD = struct.Struct("<IH")
+
+DEFAULT_WIDTH = 8  # 默认 64 段，超过时自动加宽
+
+
+def _ordinal(day: str) -> int:
+    return date.fromisoformat(day).toordinal()
+
+
+def pack_bits(bits) -> bytes:
+    """
+    @brief 将布尔序列打包为位图（第 i 段对应第 i 位，小端）。
+    @param bits 可迭代的布尔值
+    @return 位图字节串
+    """
+    value = 0
+    count = 0
+    for i, bit in enumerate(bits):
+        if bit:
+            value |= 1 << i
+        count = i + 1
+    return value.to_bytes((count + 7) // 8, "little")
+
+
+def unpack_bits(data: bytes, count: int) -> list[bool]:
+    """
+    @brief 将位图还原为长度为 count 的布尔列表。
+    @param data 位图字节串
+    @param count 段数
+    @return 布尔列表
+    """
+    value = int.from_bytes(data, "little")
+    return [bool(value >> i & 1) for i in range(count)]
+
+
+class CompletionBits:
+    """
+    @class CompletionBits
+    @brief 当天各任务段完成情况的位集（第 i 段对应整数的第 i 位）。
+
+    @details
+    界面勾选、进度统计与写历史都只读写这个 Python 整数：
+    统计完成数为一次 bit_count()，不需要逐段访问 Tcl 变量。
+    """
+
+    def __init__(self, count: int, value: int = 0):
+        """
+        @param count 段数
+        @param value 初始位图
+        """
+        self.count = count
+        self.value = value & ((1 << count) - 1)
+
+    @classmethod
+    def from_status(cls, tasks: list[dict], status: dict) -> "CompletionBits":
+        """
+        @brief 由状态字典（{时间段: 是否完成}）按任务顺序构建。
+        """
+        value = 0
+        for i, task in enumerate(tasks):
+            if status.get(task["time"]):
+                value |= 1 << i
+        return cls(len(tasks), value)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return (bool(self.value >> i & 1) for i in range(self.count))
+
+    def get(self, index: int) -> bool:
+        return bool(self.value >> index & 1)
+
+    def set(self, index: int, done: bool) -> None:
+        if done:
+            self.value |= 1 << index
+        else:
+            self.value &= ~(1 << index)
+
+    def done(self) -> int:
+        """
+        @brief 已完成的段数。
+        """
+        return self.value.bit_count()
+
+    def ratio(self) -> float:
+        """
+        @brief 完成率（保留 4 位小数），没有任务段时为 0。
+        """
+        return round(self.done() / self.count, 4) if self.count else 0
+
+
+class CompletionHistory:
+    """
+    @class CompletionHistory
+    @brief 以定长记录保存某计划每天每段完成情况的二进制历史文件。
+
+    @details
+    文件由一个文件头和按日期升序排列的定长记录组成，每条记录为
+    (日期序数 uint32, 段数 uint16, 位图 width 字节)。默认位图宽 8 字节
+    （64 段以内），每天仅占 14 字节，一年约 5 KB。
+    - 写入当天或追加新的一天只需覆盖/追加一条记录；
+    - 按日期区间查询时二分定位起点，只读取区间内的记录。
+    """
+
+    def __init__(self, path: str):
+        """
+        @brief 打开（不存在时延迟创建）历史文件。
+        @param path 文件路径，如 data/history_default.bin
+        """
+        self.path = path
+
+    # ------------------------------ 内部工具 ------------------------------ #
+    def _read_header(self, f):
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            return None
+        magic, version, width = _HEADER.unpack(raw)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"无法识别的历史文件：{self.path}")
+        return width
+
+    @staticmethod
+    def _record_size(width: int) -> int:
+        return _RECORD_HEAD.size + width
+
+    def _count(self, f, width: int) -> int:
+        f.seek(0, os.SEEK_END)
+        return (f.tell() - _HEADER.size) // self._record_size(width)
+
+    def _ordinal_at(self, f, width: int, index: int) -> int:
+        f.seek(_HEADER.size + index * self._record_size(width))
+        return _RECORD_HEAD.unpack(f.read(_RECORD_HEAD.size))[0]
+
+    def _bisect(self, f, width: int, count: int, ordinal: int) -> int:
+        """
+        @brief 返回第一个日期序数 >= ordinal 的记录下标。
+        """
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ordinal_at(f, width, mid) < ordinal:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _pack_record(self, width: int, ordinal: int, bits: list) -> bytes:
+        return _RECORD_HEAD.pack(ordinal, len(bits)) + pack_bits(bits).ljust(width, b"\0")
+
+    def _read_all(self):
+        """
+        @brief 读取全部记录，返回 (width, [(ordinal, bits), ...])，仅在加宽或乱序插入时使用。
+        """
+        with open(self.path, "rb") as f:
+            width = self._read_header(f)
+            if width is None:
+                return DEFAULT_WIDTH, []
+            size = self._record_size(width)
+            records = []
+            while True:
+                raw = f.read(size)
+                if len(raw) < size:
+                    break
+                ordinal, count = _RECORD_HEAD.unpack_from(raw)
+                records.append((ordinal, unpack_bits(raw[_RECORD_HEAD.size:], count)))
+        return width, records
+
+    def _rewrite(self, width: int, records) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, width))
+            for ordinal, bits in records:
+                f.write(self._pack_record(width, ordinal, bits))
+        os.replace(tmp_path, self.path)
+
+    # ------------------------------ 公共接口 ------------------------------ #
+    def record(self, day: str, bits: list) -> None:
+        """
+        @brief 写入某天各段的完成情况（已存在则覆盖）。
+        @param day 日期 "YYYY-MM-DD"
+        @param bits 按任务段顺序排列的布尔列表
+        """
+        ordinal = _ordinal(day)
+        bits = [bool(b) for b in bits]
+        needed = (len(bits) + 7) // 8
+
+        if not os.path.exists(self.path):
+            self._rewrite(max(DEFAULT_WIDTH, needed), [(ordinal, bits)])
+            return
+
+        with open(self.path, "r+b") as f:
+            width = self._read_header(f)
+            if width is not None and needed <= width:
+                count = self._count(f, width)
+                index = self._bisect(f, width, count, ordinal)
+                if index == count or self._ordinal_at(f, width, index) == ordinal:
+                    # 常见情况：追加新的一天，或覆盖已存在的某天
+                    f.seek(_HEADER.size + index * self._record_size(width))
+                    f.write(self._pack_record(width, ordinal, bits))
+                    return
+
+        # 位图需要加宽，或在中间插入新的一天：整体重写
+        width, records = self._read_all()
+        records = [r for r in records if r[0] != ordinal] + [(ordinal, bits)]
+        records.sort(key=lambda r: r[0])
+        self._rewrite(max(width, needed), records)
+
+    def query(self, start: str, end: str):
+        """
+        @brief 查询日期区间内（含两端）每天每段的完成情况。
+        @param start 起始日期 "YYYY-MM-DD"
+        @param end 结束日期 "YYYY-MM-DD"
+        @return (dates, rows)：有记录的日期列表，以及对应的布尔列表矩阵
+        """
+        dates, rows = [], []
+        if not os.path.exists(self.path):
+            return dates, rows
+
+        lo, hi = _ordinal(start), _ordinal(end)
+        with open(self.path, "rb") as f:
+            width = self._read_header(f)
+            if width is None:
+                return dates, rows
+            count = self._count(f, width)
+            index = self._bisect(f, width, count, lo)
+            size = self._record_size(width)
+            f.seek(_HEADER.size + index * size)
+            for _ in range(index, count):
+                raw = f.read(size)
+                ordinal, seg_count = _RECORD_HEAD.unpack_from(raw)
+                if ordinal > hi:
+                    break
+                dates.append(date.fromordinal(ordinal).isoformat())
+                rows.append(unpack_bits(raw[_RECORD_HEAD.size:], seg_count))
+        return dates, rows
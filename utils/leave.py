@@ -0,0 +1,123 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+
+
+def parse_leave_input(text: str) -> tuple[str, str]:
+    """
+    @brief 解析请假输入：单日 "YYYY-MM-DD" 或区间 "YYYY-MM-DD~YYYY-MM-DD"。
+    @param text 用户输入（区间分隔符可为 ~ 或 至）
+    @return (起始日期, 结束日期)，均为 "YYYY-MM-DD"
+    @exception ValueError 日期格式错误或起始晚于结束
+    """
+    parts = [p.strip() for p in text.replace("至", "~").split("~")]
+    if len(parts) == 1:
+        parts = parts * 2
+    if len(parts) != 2:
+        raise ValueError(f"无法识别的请假日期：{text}")
+    start, end = (date.fromisoformat(p).isoformat() for p in parts)
+    if start > end:
+        raise ValueError(f"起始日期晚于结束日期：{text}")
+    return start, end
+
+
+class LeaveCalendar:
+    """
+    @class LeaveCalendar
+    @brief 请假日历：按起始日期排序、互不重叠的闭区间列表。
+
+    @details
+    - 相邻或重叠的区间在添加时自动合并，单日请假即起止相同的区间；
+    - contains() 对起始日期二分查找，O(log n)；
+    - 日期统一为 "YYYY-MM-DD" 字符串，可直接按字典序比较；
+    - 兼容旧格式：entries 中的字符串视为单日。
+    """
+
+    def __init__(self, entries=()):
+        """
+        @param entries 区间 [start, end] 或单日 "YYYY-MM-DD" 组成的序列
+        """
+        self.starts = []
+        self.ends = []
+        for entry in sorted(_as_range(e) for e in entries):
+            self._append(*entry)
+
+    def _append(self, start: str, end: str) -> None:
+        # 仅在按起始日期升序追加时使用：与最后一个区间重叠或相邻则合并
+        if self.ends and start <= _next_day(self.ends[-1]):
+            self.ends[-1] = max(self.ends[-1], end)
+        else:
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(zip(self.starts, self.ends))
+
+    def contains(self, day: str) -> bool:
+        """
+        @brief 判断某天是否为请假日。
+        @param day 日期 "YYYY-MM-DD"
+        """
+        i = bisect_right(self.starts, day) - 1
+        return i >= 0 and day <= self.ends[i]
+
+    def covers(self, start: str, end: str) -> bool:
+        """
+        @brief 判断区间内每一天是否都已是请假日。
+        """
+        i = bisect_right(self.starts, start) - 1
+        return i >= 0 and end <= self.ends[i]
+
+    def add(self, start: str, end: str | None = None) -> bool:
+        """
+        @brief 添加请假区间（闭区间），与已有区间重叠或相邻时合并。
+        @param start 起始日期
+        @param end 结束日期，默认与起始相同（单日）
+        @return 是否有新增的请假日
+        """
+        end = end or start
+        if self.covers(start, end):
+            return False
+
+        # 找出所有与 [start-1, end+1] 相交的区间并合并为一个
+        lo = bisect_left(self.ends, _prev_day(start))
+        hi = bisect_right(self.starts, _next_day(end))
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+        return True
+
+    def days(self) -> list[str]:
+        """
+        @brief 展开为升序的单日列表。
+        """
+        result = []
+        for start, end in self:
+            first, last = date.fromisoformat(start), date.fromisoformat(end)
+            result.extend((first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1))
+        return result
+
+    def entries(self) -> list:
+        """
+        @brief 序列化为 JSON 友好的列表：单日为字符串，区间为 [start, end]。
+        """
+        return [s if s == e else [s, e] for s, e in self]
+
+
+def _as_range(entry) -> tuple[str, str]:
+    if isinstance(entry, str):
+        return entry, entry
+    start, end = entry
+    return start, end
+
+
+def _next_day(day: str) -> str:
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+
+def _prev_day(day: str) -> str:
+    return (date.fromisoformat(day) - timedelta(days=1)).isoformat()
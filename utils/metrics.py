@@ -0,0 +1,195 @@
+from datetime import date, timedelta
+
+STREAK_THRESHOLD = 0.8  # 完成率达到该值的一天计入连续达标
+WINDOW = 30             # 保留最近多少天的完成率（滚动平均与周环比只需要这些）
+
+
+def empty_metrics() -> dict:
+    """
+    @brief 尚无记录时的指标状态。
+
+    @details
+    状态为 JSON 友好的字典：
+    - day：最近一次记录的日期
+    - recent：截至 day 的最近 WINDOW 天完成率（旧 -> 新），请假日（无论是否有记录）为 None
+    - streak_before：截至 day 前一天的连续达标天数
+    - longest_before：day 之前出现过的最长连续达标天数
+    - base：recent 第一天之前的结转值 {"streak", "longest"}，
+      新增请假日时据此只重算最近 WINDOW 天（见 apply_leave）
+    """
+    return {"day": None, "recent": [], "streak_before": 0, "longest_before": 0,
+            "base": {"streak": 0, "longest": 0}}
+
+
+def _ok(ratio) -> bool:
+    return ratio is not None and ratio >= STREAK_THRESHOLD
+
+
+def _fold(base: dict, ratios) -> dict:
+    """
+    @brief 在结转值 {"streak", "longest"} 之后依次计入若干天的完成率，返回新的结转值（不修改 base）。
+    """
+    streak, longest = base["streak"], base["longest"]
+    for ratio in ratios:
+        if _ok(ratio):
+            streak += 1
+            longest = max(longest, streak)
+        elif ratio is not None:
+            streak = 0
+    return {"streak": streak, "longest": longest}
+
+
+def _current_streak(state) -> int:
+    # 当天未达标时不算中断（当天尚未结束），显示截至昨天的连续天数
+    last = state["recent"][-1] if state["recent"] else None
+    return state["streak_before"] + (1 if _ok(last) else 0)
+
+
+def update_metrics(state: dict, day: str, ratio: float, leave=None) -> bool:
+    """
+    @brief 记录某天的完成率并增量更新指标（原地修改）。
+    @param state 指标状态（见 empty_metrics）
+    @param day 日期 "YYYY-MM-DD"，不早于 state["day"]
+    @param ratio 完成率 0~1（当天为请假日时按 None 记录）
+    @param leave 可选 LeaveCalendar，用于判断当天及两次记录之间的空缺日期是否为请假
+    @return 状态是否有变化；day 早于最近记录时返回 None，调用方应改用 rebuild_metrics
+
+    @details
+    覆盖当天只改写最后一个元素；跨到新的一天时先结算上一天的连续天数，
+    再补齐中间的空缺日期（请假日不中断也不延长连续天数，其余空缺视为 0），
+    所有操作只涉及最近 WINDOW 天，与历史长度无关。
+    有记录的请假日同样记为 None，不参与平均值与连续天数。
+    """
+    if leave is not None and leave.contains(day):
+        ratio = None
+
+    last_day = state["day"]
+    if last_day == day:
+        if state["recent"][-1] == ratio:
+            return False
+        state["recent"][-1] = ratio
+        return True
+    if last_day is not None and day < last_day:
+        return None
+
+    recent = state["recent"]
+    if last_day is not None:
+        current = _current_streak(state)
+        state["longest_before"] = max(state["longest_before"], current)
+        if _ok(recent[-1]):
+            state["streak_before"] = current
+        elif recent[-1] is not None:
+            state["streak_before"] = 0
+
+        first_gap = date.fromisoformat(last_day) + timedelta(days=1)
+        gap = (date.fromisoformat(day) - first_gap).days
+        if gap > 0:
+            gap_start, gap_end = first_gap.isoformat(), (first_gap + timedelta(days=gap - 1)).isoformat()
+            if leave is None or not leave.covers(gap_start, gap_end):
+                state["streak_before"] = 0
+            # 只需补齐最后 WINDOW 天的空缺；更早的空缺连同旧窗口直接并入结转值
+            skipped = max(0, gap - WINDOW)
+            if skipped:
+                state["base"] = _fold(state["base"], recent)
+                recent.clear()
+                skipped_end = (first_gap + timedelta(days=skipped - 1)).isoformat()
+                if leave is None or not leave.covers(gap_start, skipped_end):
+                    state["base"] = dict(state["base"], streak=0)
+            for i in range(skipped, gap):
+                gap_day = (first_gap + timedelta(days=i)).isoformat()
+                recent.append(None if leave is not None and leave.contains(gap_day) else 0)
+
+    recent.append(ratio)
+    if len(recent) > WINDOW:
+        state["base"] = _fold(state["base"], recent[:-WINDOW])
+        del recent[:-WINDOW]
+    state["day"] = day
+    return True
+
+
+def apply_leave(state: dict, start: str, end: str) -> bool:
+    """
+    @brief 新增请假区间 [start, end] 后就地修正指标状态，不读取完整汇总。
+    @param state 指标状态（见 empty_metrics）
+    @param start 请假区间起始日期 "YYYY-MM-DD"
+    @param end 请假区间结束日期 "YYYY-MM-DD"
+    @return 状态是否有变化；区间早于最近 WINDOW 天且之前有过达标日时返回 None，
+            调用方应改用 rebuild_metrics
+
+    @details
+    把 recent 中落在区间内的日期改记为 None，再从结转值 base 起重新累计
+    streak_before 与 longest_before，只涉及最近 WINDOW 天。
+    """
+    day, recent = state["day"], state["recent"]
+    if day is None or day < start:
+        return False
+    last = date.fromisoformat(day)
+    first = last - timedelta(days=len(recent) - 1)
+    if start < first.isoformat() and (state["base"]["streak"] or state["base"]["longest"]):
+        return None
+
+    changed = False
+    for i, ratio in enumerate(recent):
+        if ratio is not None and start <= (first + timedelta(days=i)).isoformat() <= end:
+            recent[i] = None
+            changed = True
+    if changed:
+        carried = _fold(state["base"], recent[:-1])
+        state["streak_before"], state["longest_before"] = carried["streak"], carried["longest"]
+    return changed
+
+
+def rebuild_metrics(summary: dict, leave=None) -> dict:
+    """
+    @brief 从完整的每日汇总重新计算指标（仅在指标文件缺失或补写过去日期时使用）。
+    @param summary {"YYYY-MM-DD": ratio}
+    @param leave 可选 LeaveCalendar
+    @return 新的指标状态
+    """
+    state = empty_metrics()
+    for day in sorted(summary):
+        update_metrics(state, day, summary[day], leave)
+    return state
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def summarize(state: dict) -> dict:
+    """
+    @brief 由指标状态计算展示用的数值。
+    @return {"day", "streak", "longest", "avg7", "avg30", "wow"}，
+            平均值为 0~1，没有可统计的日期时为 None；wow 为最近 7 天与前 7 天平均值之差
+    """
+    recent = state["recent"]
+    streak = _current_streak(state) if recent else 0
+    avg7 = _mean(recent[-7:])
+    previous7 = _mean(recent[-14:-7])
+    return {
+        "day": state["day"],
+        "streak": streak,
+        "longest": max(state["longest_before"], streak),
+        "avg7": avg7,
+        "avg30": _mean(recent),
+        "wow": None if avg7 is None or previous7 is None else avg7 - previous7,
+    }
+
+
+def format_metrics(summary: dict, separator: str = "\n") -> str:
+    """
+    @brief 将 summarize() 的结果格式化为简短文本。
+    @param summary summarize() 的返回值
+    @param separator 各项之间的分隔符
+    """
+    def percent(value):
+        return "--" if value is None else f"{int(value * 100)}%"
+
+    wow = summary["wow"]
+    wow_text = "--" if wow is None else f"{'+' if wow >= 0 else ''}{int(round(wow * 100))}%"
+    return separator.join([
+        f"连续达标 {summary['streak']} 天（最长 {summary['longest']}）",
+        f"7日均 {percent(summary['avg7'])} · 30日均 {percent(summary['avg30'])}",
+        f"周环比 {wow_text}",
+    ])
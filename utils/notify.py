@@ -0,0 +1,135 @@
+import heapq
+
+from utils.file_utils import load_json, save_json_async, SETTINGS_PATH
+
+MISSED_AFTER_MINUTES = 1  # 事件晚于该时长才被处理时视为“错过”，合并为一条补发提醒
+
+# 提醒种类：开始、开始前提前量、结束
+KIND_START = "start"
+KIND_BEFORE = "before"
+KIND_END = "end"
+
+DEFAULT_SETTINGS = {"lead_minutes": 0, "end_reminders": False}
+
+
+def load_notify_settings() -> dict:
+    """
+    @brief 读取提醒设置（data/settings.json 中的 "notify" 项）。
+    @return {"lead_minutes": 开始前多少分钟预先提醒（0 为关闭）, "end_reminders": 是否在结束时提醒}
+    """
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(load_json(SETTINGS_PATH, {}).get("notify", {}))
+    return settings
+
+
+def _notified_path(plan_id: str) -> str:
+    return f"data/notified_{plan_id}.json"
+
+
+def load_notified(plan_id: str, day: str) -> set:
+    """
+    @brief 读取某计划当天已发出的提醒键；记录不是当天的则视为空。
+    @param plan_id 计划 ID
+    @param day 日期 "YYYY-MM-DD"
+    """
+    data = load_json(_notified_path(plan_id), {})
+    return set(data.get("keys", [])) if data.get("date") == day else set()
+
+
+def save_notified(plan_id: str, day: str, keys: set, on_done=None) -> None:
+    """
+    @brief 后台保存当天已发出的提醒键（重启后不会重复提醒）。
+    """
+    save_json_async(_notified_path(plan_id), {"date": day, "keys": sorted(keys)}, on_done)
+
+
+class NotificationQueue:
+    """
+    @class NotificationQueue
+    @brief 当天待发提醒的小顶堆，按触发分钟排序。
+
+    @details
+    由 PlanTimeline 一次性生成每段的开始提醒，以及可选的开始前/结束提醒，
+    之后每次只需查看堆顶即可得知下一次需要唤醒的时刻；
+    due() 弹出所有已到时的事件，并把迟到超过 MISSED_AFTER_MINUTES 的事件
+    （如系统休眠或程序关闭期间）与按时的事件分开返回，便于合并为一条补发提醒。
+    每个事件的键为 "种类::时间段"，已在 notified 中的事件不会再次返回。
+    """
+
+    def __init__(self, timeline, tasks: list[dict], notified: set,
+                 lead_minutes: int = 0, end_reminders: bool = False):
+        """
+        @param timeline PlanTimeline
+        @param tasks 按开始时间排序的任务列表（与 timeline 下标一致）
+        @param notified 当天已发出的提醒键集合（原地更新）
+        @param lead_minutes 开始前多少分钟预先提醒，0 为关闭
+        @param end_reminders 是否在每段结束时提醒
+        """
+        self.tasks = tasks
+        self.notified = notified
+        events = []
+        for index in range(len(timeline)):
+            start, end = timeline.starts[index], timeline.ends[index]
+            events.append((start, 1, KIND_START, index))
+            if lead_minutes > 0 and start - lead_minutes >= 0:
+                events.append((start - lead_minutes, 2, KIND_BEFORE, index))
+            if end_reminders:
+                # 同一时刻的结束提醒排在开始提醒之前
+                events.append((end, 0, KIND_END, index))
+        self._heap = [event for event in events if self.key(event) not in notified]
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def key(self, event) -> str:
+        """
+        @brief 事件的持久化键："种类::时间段"。
+        """
+        return f"{event[2]}::{self.tasks[event[3]]['time']}"
+
+    def next_minute(self):
+        """
+        @brief 下一个事件的触发分钟；没有待发事件时返回 None。
+        """
+        return self._heap[0][0] if self._heap else None
+
+    def due(self, minute: float) -> tuple[list, list]:
+        """
+        @brief 弹出所有触发时刻不晚于 minute 的事件，并记入 notified。
+        @param minute 当前时刻的当天分钟偏移
+        @return (按时事件, 错过的事件)，事件为 (分钟, 优先级, 种类, 任务下标)
+        """
+        on_time, missed = [], []
+        while self._heap and self._heap[0][0] <= minute:
+            event = heapq.heappop(self._heap)
+            key = self.key(event)
+            if key in self.notified:
+                continue
+            self.notified.add(key)
+            (missed if minute - event[0] >= MISSED_AFTER_MINUTES else on_time).append(event)
+        return on_time, missed
+
+    def message(self, event) -> tuple[str, str]:
+        """
+        @brief 单个事件的提醒标题与正文。
+        """
+        _, _, kind, index = event
+        task = self.tasks[index]
+        start, end = task["time"].split("-")
+        if kind == KIND_BEFORE:
+            return "即将开始", f"{start} 开始：{task['task']}"
+        if kind == KIND_END:
+            return "任务结束", f"{end} 结束：{task['task']}"
+        return "开始新任务", f"现在 {start}，请开始：{task['task']}"
+
+    def missed_message(self, events: list) -> tuple[str, str]:
+        """
+        @brief 将错过的若干事件合并为一条补发提醒，只列出最近的开始事件。
+        """
+        starts = [event for event in events if event[2] == KIND_START]
+        lines = [f"错过 {len(events)} 条提醒"]
+        if starts:
+            task = self.tasks[starts[-1][3]]
+            lines.append(f"最近开始的任务：{task['time']} {task['task']}")
+        return "错过的提醒", "\n".join(lines)
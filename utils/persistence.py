@@ -0,0 +1,268 @@
+import threading
+import time
+from collections import deque
+
+
+def clone_json(obj):
+    """
+    @brief 复制由 JSON 解析得到的对象（dict/list 递归复制，标量直接共享）。
+
+    @details
+    比 copy.deepcopy 快得多，用于缓存副本与提交写入时的数据快照，使之后对原对象的修改互不影响。
+    """
+    if isinstance(obj, dict):
+        return {k: clone_json(v) if isinstance(v, (dict, list)) else v for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [clone_json(v) if isinstance(v, (dict, list)) else v for v in obj]
+    return obj
+
+
+class WriteCoalescer:
+    """
+    @class WriteCoalescer
+    @brief 合并短时间内的重复保存请求，只在静默一段时间后落盘一次。
+
+    @details
+    以 key 区分不同的保存目标（如 "status"、"summary"），同一 key 在防抖
+    窗口内多次 schedule 只保留最后一个写入函数。窗口结束后由宿主控件的
+    after() 触发 flush()，依次执行所有待写函数。
+    宿主关闭时应主动调用 flush()，确保没有遗留的未保存修改。
+    """
+
+    def __init__(self, widget, delay_ms: int = 400):
+        """
+        @brief 构造合并写入器。
+        @param widget 提供 after/after_cancel 的宿主（通常为 Tk 控件）
+        @param delay_ms 防抖窗口（毫秒），最后一次请求后静默该时长再写入
+        """
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self._pending = {}  # key -> 写入函数（保持登记顺序）
+        self._job = None
+
+        # 统计信息：请求次数、实际写入次数、flush 次数、写入累计耗时（秒）
+        self.requests = 0
+        self.writes = 0
+        self.flushes = 0
+        self.write_seconds = 0.0
+
+    def schedule(self, key: str, writer) -> None:
+        """
+        @brief 登记一次保存请求，并（重新）开始防抖计时。
+        @param key 保存目标标识，相同 key 的请求会被合并
+        @param writer 无参写入函数，在 flush 时调用
+        """
+        self.requests += 1
+        self._pending[key] = writer
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+        self._job = self.widget.after(self.delay_ms, self.flush)
+
+    def has_pending(self) -> bool:
+        """
+        @brief 是否存在尚未落盘的保存请求。
+        """
+        return bool(self._pending)
+
+    def flush(self) -> None:
+        """
+        @brief 立即执行所有待写函数，并取消尚未触发的防抖计时。
+        """
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        self.flushes += 1
+        start = time.perf_counter()
+        for writer in pending.values():
+            writer()
+            self.writes += 1
+        self.write_seconds += time.perf_counter() - start
+
+
+class PersistenceWorker:
+    """
+    @class PersistenceWorker
+    @brief 后台写盘线程：按文件排队写入，Tk 线程提交后立即返回。
+
+    @details
+    - 每个路径最多保留一个“待写快照”，同一路径的新请求覆盖尚未开始的旧请求，
+      不同路径按提交顺序依次写入，同一路径的写入顺序始终与提交顺序一致。
+    - pending() 返回某路径最新提交但尚未落盘的数据，供读取方实现
+      “读到自己刚写的内容”（read-your-writes）。
+    - 写入完成后的回调不会在后台线程执行，而是由 attach() 绑定的 Tk 控件
+      通过 after() 轮询取回，并在 Tk 线程中调用；仅在有写入进行时才轮询。
+    - shutdown() 会等待队列清空后停止线程。
+    """
+
+    POLL_MS = 50
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._order = deque()     # 待写路径（按提交顺序）
+        self._queued = {}         # path -> [data, writer, callbacks]
+        self._inflight = {}       # path -> data（正在写入）
+        self._done = deque()      # (callbacks, path, error)
+        self._thread = None
+        self._stopping = False
+
+        self._widget = None
+        self._poll_job = None
+
+        # 统计信息：提交次数、被合并的提交次数、完成写入次数、失败次数
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+
+    # ---------------------------- Tk 线程接口 ---------------------------- #
+    def attach(self, widget) -> None:
+        """
+        @brief 绑定用于回传完成通知的 Tk 控件（通常为根窗口）。
+        @param widget 提供 after/after_cancel 的控件
+        """
+        self._widget = widget
+
+    def submit(self, path: str, data, writer, on_done=None) -> None:
+        """
+        @brief 提交一次写入请求并立即返回。
+        @param path 目标文件路径，同时作为排队键
+        @param data 要写入的数据；调用方之后修改原对象不会影响本次写入
+        @param writer 写入函数 writer(path, data)，在后台线程执行
+        @param on_done 可选回调 on_done(error)，写入完成后在 Tk 线程调用，
+                       成功时 error 为 None
+        """
+        snapshot = clone_json(data)
+        with self._cond:
+            self._ensure_thread()
+            self.submitted += 1
+            entry = self._queued.get(path)
+            if entry is not None:
+                self.coalesced += 1
+                entry[0], entry[1] = snapshot, writer
+                if on_done:
+                    entry[2].append(on_done)
+            else:
+                self._queued[path] = [snapshot, writer, [on_done] if on_done else []]
+                self._order.append(path)
+            self._cond.notify_all()
+        self._arm_poll()
+
+    def pending(self, path: str, default=None):
+        """
+        @brief 获取某路径已提交但尚未落盘的最新数据。
+        @param path 文件路径
+        @param default 无待写数据时的返回值
+        @return 待写数据（内部快照，调用方不应修改）或 default
+        """
+        with self._cond:
+            entry = self._queued.get(path)
+            if entry is not None:
+                return entry[0]
+            return self._inflight.get(path, default)
+
+    def pending_items(self, prefix: str) -> dict:
+        """
+        @brief 获取所有以 prefix 开头、尚未落盘的待写数据。
+        @param prefix 路径/键前缀
+        @return {键: 最新待写数据}（内部快照，调用方不应修改）
+        """
+        with self._cond:
+            items = {k: v for k, v in self._inflight.items() if k.startswith(prefix)}
+            items.update((k, e[0]) for k, e in self._queued.items() if k.startswith(prefix))
+        return items
+
+    def flush(self, timeout=None) -> bool:
+        """
+        @brief 阻塞等待所有已提交的写入完成，并在当前线程执行完成回调。
+        @param timeout 最长等待秒数，None 表示一直等待
+        @return 队列是否已清空
+        """
+        with self._cond:
+            drained = self._cond.wait_for(lambda: not self._order and not self._inflight, timeout)
+        self._drain_done()
+        return drained
+
+    def shutdown(self, timeout=None) -> None:
+        """
+        @brief 写完所有排队数据后停止后台线程。
+        @param timeout 最长等待秒数，None 表示一直等待
+        """
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if self._poll_job is not None and self._widget is not None:
+            try:
+                self._widget.after_cancel(self._poll_job)
+            except Exception:
+                pass
+            self._poll_job = None
+
+    def _arm_poll(self) -> None:
+        if self._widget is None or self._poll_job is not None:
+            return
+        try:
+            self._poll_job = self._widget.after(self.POLL_MS, self._poll)
+        except Exception:
+            self._widget = None
+
+    def _poll(self) -> None:
+        self._poll_job = None
+        self._drain_done()
+        with self._cond:
+            busy = bool(self._order or self._inflight or self._done)
+        if busy:
+            self._arm_poll()
+
+    def _drain_done(self) -> None:
+        while True:
+            with self._cond:
+                if not self._done:
+                    return
+                callbacks, _path, error = self._done.popleft()
+            for callback in callbacks:
+                callback(error)
+
+    # ----------------------------- 后台线程 ----------------------------- #
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="persistence-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._order or self._stopping)
+                if not self._order:
+                    return
+                path = self._order.popleft()
+                data, writer, callbacks = self._queued.pop(path)
+                self._inflight[path] = data
+
+            error = None
+            try:
+                writer(path, data)
+            except Exception as e:
+                error = e
+
+            with self._cond:
+                if self._inflight.get(path) is data:
+                    del self._inflight[path]
+                self.completed += 1
+                if error is not None:
+                    self.failed += 1
+                if callbacks:
+                    self._done.append((callbacks, path, error))
+                self._cond.notify_all()
@@ -0,0 +1,356 @@
+import csv
+import os
+from datetime import date, datetime, timedelta, timezone
+
+from utils.file_utils import save_json, load_json, list_config_ids
+from utils.time_utils import auto_pad_time, validate_intervals, parse_range_minutes, DAY_MINUTES
+
+PLAN_PROPERTY = "X-DPT-PLAN"   # 导出的 VEVENT 中记录所属计划 ID 的扩展属性
+ICS_LINE_OCTETS = 75           # RFC 5545 规定的单行最大字节数（超出需折行）
+
+
+# ---- 计划校验与保存 ---- #
+def check_plan(rows) -> tuple[list[dict], list[dict]]:
+    """
+    @brief 按 SettingPage.save_config 的规则校验一张计划并生成配置中的任务列表。
+    @param rows [(时间段文本, 任务名称), ...]
+    @return (tasks, issues)：tasks 为 [{"time", "task"}]；issues 为 validate_intervals() 的问题列表，
+            非空时 tasks 不应保存
+    """
+    times = [time_text for time_text, _ in rows]
+    names = [task for _, task in rows]
+    issues = validate_intervals(times, names)
+    tasks = [{"time": auto_pad_time(t.strip()), "task": n.strip()} for t, n in zip(times, names)]
+    return tasks, issues
+
+
+def plan_id_issue(plan_id: str):
+    """
+    @brief 检查计划 ID 能否安全地用作 config/、data/ 下的文件名。
+    @param plan_id 计划 ID
+    @return 不可用时返回与 validate_intervals() 相同格式的问题 {"kind": "plan_id", "rows": [], "message"}，
+            否则返回 None
+
+    @details
+    拒绝空 ID 与含路径分隔符或 ".." 的 ID（导入文件中的 ID 不能写到 config/ 之外）。
+    """
+    if not plan_id:
+        message = "计划 ID 为空"
+    elif any(sep in plan_id for sep in ("/", "\\", os.sep)) or ".." in plan_id:
+        message = f"计划 ID“{plan_id}”不能包含路径分隔符或“..”"
+    else:
+        return None
+    return {"kind": "plan_id", "rows": [], "message": message}
+
+
+def save_plan(plan_id: str, rows, overwrite: bool = False, dry_run: bool = False) -> dict:
+    """
+    @brief 校验并保存一张计划到 config/<plan_id>.json。
+    @param plan_id 计划 ID
+    @param rows [(时间段文本, 任务名称), ...]
+    @param overwrite 计划已存在时是否覆盖
+    @param dry_run 只校验不写入
+    @return {"plan", "rows", "status", "issues"}，status 为 "saved"、"valid"（dry_run）、
+            "invalid" 或 "exists"；计划 ID 不可用（见 plan_id_issue()）时为 "invalid"
+    """
+    tasks, issues = check_plan(rows)
+    id_issue = plan_id_issue(plan_id)
+    if id_issue is not None:
+        issues = [id_issue, *issues]
+    result = {"plan": plan_id, "rows": len(tasks), "issues": issues}
+    if issues:
+        result["status"] = "invalid"
+    elif not overwrite and os.path.exists(f"config/{plan_id}.json"):
+        result["status"] = "exists"
+    elif dry_run:
+        result["status"] = "valid"
+    else:
+        save_json(f"config/{plan_id}.json", {"id": plan_id, "tasks": tasks})
+        result["status"] = "saved"
+    return result
+
+
+# ---- CSV ---- #
+def read_csv_plans(path: str):
+    """
+    @brief 逐行读取 CSV，按计划逐个产出 (plan_id, rows)。
+    @param path CSV 文件路径，列为 "time,task" 或 "plan,time,task"（首行可为表头）
+    @exception ValueError 列数不对，或同一计划的行不连续
+
+    @details
+    没有 plan 列时整个文件为一张计划，ID 取文件名（不含扩展名）。
+    有 plan 列时同一计划的行须连续出现：计划 ID 一变化就产出上一张计划，
+    因此任意时刻内存中只保留一张计划（一天的时间表）的行，与文件大小无关。
+    """
+    default_id = os.path.splitext(os.path.basename(path))[0]
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        columns = None
+        current, rows, seen = None, [], set()
+        for record in reader:
+            if not record or not any(cell.strip() for cell in record):
+                continue
+            if columns is None:
+                columns = len(record)
+                if columns not in (2, 3):
+                    raise ValueError(f"{path} 第 {reader.line_num} 行：应为 time,task 或 plan,time,task 两种列格式之一")
+                header = [cell.strip().lower() for cell in record]
+                if header in (["time", "task"], ["plan", "time", "task"]):
+                    continue
+            if len(record) != columns:
+                raise ValueError(f"{path} 第 {reader.line_num} 行：列数应为 {columns}，实际为 {len(record)}")
+
+            plan_id = record[0].strip() if columns == 3 else default_id
+            if plan_id != current:
+                if current is not None:
+                    yield current, rows
+                if plan_id in seen:
+                    raise ValueError(f"{path} 第 {reader.line_num} 行：计划“{plan_id}”的行不连续")
+                seen.add(plan_id)
+                current, rows = plan_id, []
+            rows.append((record[-2], record[-1]))
+        if current is not None:
+            yield current, rows
+
+
+def write_csv_plans(path: str, plan_ids) -> int:
+    """
+    @brief 将若干计划导出为一个 "plan,time,task" CSV 文件（逐个计划读取、逐行写出）。
+    @param path 输出文件路径
+    @param plan_ids 计划 ID 序列
+    @return 写出的任务行数
+    """
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["plan", "time", "task"])
+        for plan_id in plan_ids:
+            for block in load_json(f"config/{plan_id}.json", {}).get("tasks", []):
+                writer.writerow([plan_id, block["time"], block["task"]])
+                written += 1
+    return written
+
+
+# ---- iCalendar ---- #
+def _unfold_lines(f):
+    """
+    @brief 逐行读取 .ics 并展开折行（以空格或制表符开头的行接在上一行之后）。
+    """
+    pending = None
+    for raw in f:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            if pending is not None:
+                pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+
+def _split_property(line: str) -> tuple[str, dict, str]:
+    # "DTSTART;TZID=Asia/Shanghai:20261016T090000" -> ("DTSTART", {"TZID": ...}, "20261016T090000")
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    return name.upper(), dict(p.split("=", 1) for p in params if "=" in p), value
+
+
+def _parse_ics_datetime(value: str, params: dict):
+    """
+    @brief 解析 DTSTART/DTEND 的值，取其中的日期与墙上时间（不做时区换算）。
+    @return datetime；全天事件（VALUE=DATE）返回 None
+    """
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or "T" not in value:
+        return None
+    return datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+
+
+def _parse_duration(value: str) -> timedelta:
+    # 解析由 W/D/H/M/S 组成的时长，如 "PT1H30M"、"P1D"
+    value = value.strip().lstrip("+")
+    days = hours = minutes = seconds = 0
+    number = ""
+    in_time = False
+    for ch in value[1:]:
+        if ch.isdigit():
+            number += ch
+        elif ch == "T":
+            in_time = True
+        else:
+            n = int(number or 0)
+            number = ""
+            if ch == "W":
+                days += 7 * n
+            elif ch == "D":
+                days += n
+            elif ch == "H" and in_time:
+                hours = n
+            elif ch == "M" and in_time:
+                minutes = n
+            elif ch == "S" and in_time:
+                seconds = n
+    return timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
+
+
+def _unescape(text: str) -> str:
+    result, i = [], 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and i + 1 < len(text):
+            i += 1
+            ch = "\n" if text[i] in "nN" else text[i]
+        result.append(ch)
+        i += 1
+    return "".join(result)
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _event_range(start: datetime, end: datetime) -> str:
+    """
+    @brief 将事件起止时间转换为当天的 "HH:MM-HH:MM"；跨过午夜的事件截止到 24:00。
+    """
+    start_minute = start.hour * 60 + start.minute
+    if end.date() > start.date():
+        end_minute = DAY_MINUTES
+    else:
+        end_minute = end.hour * 60 + end.minute
+    return f"{start_minute // 60:02d}:{start_minute % 60:02d}-{end_minute // 60:02d}:{end_minute % 60:02d}"
+
+
+def read_ics_plans(path: str):
+    """
+    @brief 逐行解析 .ics 中的 VEVENT，按计划产出 (plan_id, rows)。
+    @param path .ics 文件路径
+
+    @details
+    事件所属计划：有 X-DPT-PLAN 属性（本工具导出的文件）时取其值，
+    否则为 "<文件名>-<事件日期>"，即每一天的事件组成一张计划。
+    文件按行流式读取，每个事件解析完即只保留 (开始分钟, 时间段, 名称) 三元组，
+    不保存原始文本；各计划的行按开始时间排序后产出。
+    全天事件与缺少开始时间的事件被忽略。
+    """
+    default_id = os.path.splitext(os.path.basename(path))[0]
+    plans = {}
+    event = None
+    with open(path, encoding="utf-8-sig") as f:
+        for line in _unfold_lines(f):
+            name, params, value = _split_property(line)
+            if name == "BEGIN" and value.upper() == "VEVENT":
+                event = {}
+            elif name == "END" and value.upper() == "VEVENT":
+                if event is not None:
+                    _collect_event(plans, event, default_id)
+                event = None
+            elif event is not None and name in ("DTSTART", "DTEND", "DURATION", "SUMMARY", PLAN_PROPERTY):
+                event[name] = (params, value)
+
+    for plan_id, rows in plans.items():
+        rows.sort(key=lambda row: row[0])
+        yield plan_id, [(time_text, task) for _, time_text, task in rows]
+
+
+def _collect_event(plans: dict, event: dict, default_id: str) -> None:
+    if "DTSTART" not in event:
+        return
+    start = _parse_ics_datetime(event["DTSTART"][1], event["DTSTART"][0])
+    if start is None:
+        return
+    if "DTEND" in event:
+        end = _parse_ics_datetime(event["DTEND"][1], event["DTEND"][0]) or start
+    elif "DURATION" in event:
+        end = start + _parse_duration(event["DURATION"][1])
+    else:
+        end = start
+
+    if PLAN_PROPERTY in event:
+        plan_id = _unescape(event[PLAN_PROPERTY][1]).strip()
+    else:
+        plan_id = f"{default_id}-{start.date().isoformat()}"
+    summary = _unescape(event.get("SUMMARY", ({}, ""))[1])
+    plans.setdefault(plan_id, []).append((start.hour * 60 + start.minute, _event_range(start, end), summary))
+
+
+def _fold(line: str) -> str:
+    """
+    @brief 按 RFC 5545 将超过 75 字节的行折行（不拆开多字节字符）。
+    """
+    parts, current, size = [], "", 0
+    for ch in line:
+        width = len(ch.encode("utf-8"))
+        limit = ICS_LINE_OCTETS if not parts else ICS_LINE_OCTETS - 1
+        if size + width > limit:
+            parts.append(current)
+            current, size = "", 0
+        current += ch
+        size += width
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def write_ics_plans(path: str, plan_ids, on_date: date) -> int:
+    """
+    @brief 将若干计划导出为 .ics：每个任务一个每天重复的 VEVENT，从 on_date 开始。
+    @param path 输出文件路径
+    @param plan_ids 计划 ID 序列
+    @param on_date 事件的首个日期
+    @return 写出的事件数
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(_fold("BEGIN:VCALENDAR"))
+        f.write(_fold("VERSION:2.0"))
+        f.write(_fold("PRODID:-//Daily Progress Tracker//Plan Export//ZH"))
+        for plan_id in plan_ids:
+            for i, block in enumerate(load_json(f"config/{plan_id}.json", {}).get("tasks", [])):
+                parsed = parse_range_minutes(block["time"])
+                if parsed is None:
+                    continue
+                base = datetime.combine(on_date, datetime.min.time())
+                start = base + timedelta(minutes=parsed[0])
+                end = base + timedelta(minutes=parsed[1])
+                for line in (
+                    "BEGIN:VEVENT",
+                    f"UID:{_escape(plan_id)}-{i}@daily-progress-tracker",
+                    f"DTSTAMP:{stamp}",
+                    f"DTSTART:{start:%Y%m%dT%H%M%S}",
+                    f"DTEND:{end:%Y%m%dT%H%M%S}",
+                    "RRULE:FREQ=DAILY",
+                    f"SUMMARY:{_escape(block['task'])}",
+                    f"{PLAN_PROPERTY}:{_escape(plan_id)}",
+                    "END:VEVENT",
+                ):
+                    f.write(_fold(line))
+                written += 1
+        f.write(_fold("END:VCALENDAR"))
+    return written
+
+
+# ---- 入口 ---- #
+def read_plans(path: str):
+    """
+    @brief 按扩展名选择读取方式（.ics 为 iCalendar，其余按 CSV）。
+    """
+    if path.lower().endswith(".ics"):
+        return read_ics_plans(path)
+    return read_csv_plans(path)
+
+
+def write_plans(path: str, plan_ids=None, on_date: date | None = None) -> int:
+    """
+    @brief 按扩展名导出计划（.ics 为 iCalendar，其余按 CSV）。
+    @param path 输出文件路径
+    @param plan_ids 要导出的计划 ID，默认为全部
+    @param on_date iCalendar 事件的首个日期，默认为今天
+    @return 写出的行（事件）数
+    """
+    plan_ids = list_config_ids() if plan_ids is None else plan_ids
+    if path.lower().endswith(".ics"):
+        return write_ics_plans(path, plan_ids, on_date or date.today())
+    return write_csv_plans(path, plan_ids)
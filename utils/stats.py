@@ -0,0 +1,213 @@
+from datetime import date
+
+import numpy as np
+
+# 统计范围：显示名 -> 天数（None 表示全部历史）
+STATS_WINDOWS = {
+    "最近7天": 7,
+    "最近30天": 30,
+    "最近90天": 90,
+    "最近365天": 365,
+    "全部": None,
+}
+DEFAULT_WINDOW = "最近30天"
+
+MAX_BARS = 60  # 图表最多绘制的柱数，超过时按周/按月合并
+ALL_TIME_START = date.min.isoformat()  # “全部”范围查询使用的起始日期
+
+BUCKET_UNITS = {"day": "按天", "week": "按周", "month": "按月"}
+
+
+def day_numbers(days) -> np.ndarray:
+    """
+    @brief 将 "YYYY-MM-DD" 序列批量转换为日期序数（自 1970-01-01 起的天数）。
+    @param days 日期字符串序列
+    @return int64 数组
+    """
+    return np.array(list(days), dtype="datetime64[D]").astype(np.int64)
+
+
+def leave_mask(calendar, first: int, count: int) -> np.ndarray:
+    """
+    @brief 计算连续 count 天（从日期序数 first 起）中哪些是请假日。
+    @param calendar utils.leave.LeaveCalendar
+    @param first 第一天的日期序数
+    @param count 天数
+    @return 布尔数组，请假日为 True
+
+    @details
+    对请假区间的起始序数做一次 searchsorted，找到每天之前最近的区间，
+    再与该区间的结束序数比较，整个过程与区间数量无关地向量化完成。
+    """
+    days = np.arange(first, first + count, dtype=np.int64)
+    if not len(calendar) or not count:
+        return np.zeros(count, dtype=bool)
+    starts = day_numbers(calendar.starts)
+    ends = day_numbers(calendar.ends)
+    index = np.searchsorted(starts, days, side="right") - 1
+    return (index >= 0) & (days <= ends[np.maximum(index, 0)])
+
+
+class RatioSeries:
+    """
+    @class RatioSeries
+    @brief 以日期序数为下标的每日完成率数组。
+
+    @details
+    ratios[i] 为第 first + i 天的完成率（0~1），没有记录的日期为 0，
+    请假日（exclude_leave 之后）为 NaN，不参与平均值与合并计算。
+    由汇总字典一次性向量化构建，按周/按月合并时使用 reduceat，
+    不再逐天 strftime 或在 Python 中循环。
+    """
+
+    def __init__(self, first: int, ratios: np.ndarray):
+        """
+        @param first 第一天的日期序数
+        @param ratios 每日完成率数组
+        """
+        self.first = first
+        self.ratios = ratios
+
+    @classmethod
+    def from_summary(cls, summary: dict, start: str | None, end: str) -> "RatioSeries":
+        """
+        @brief 由 {"YYYY-MM-DD": ratio} 构建区间内（含两端）的连续序列。
+        @param summary 每日完成率字典
+        @param start 起始日期；None 表示从最早的记录开始
+        @param end 结束日期
+        @return RatioSeries（start 为 None 且没有记录时为空序列）
+        """
+        last = int(day_numbers([end])[0])
+        keys = day_numbers(summary.keys())
+        values = np.fromiter(summary.values(), dtype=np.float64, count=len(summary))
+
+        if start is not None:
+            first = int(day_numbers([start])[0])
+        elif len(keys):
+            first = min(int(keys.min()), last)
+        else:
+            return cls(last + 1, np.zeros(0))
+
+        ratios = np.zeros(max(last - first + 1, 0))
+        mask = (keys >= first) & (keys <= last)
+        ratios[keys[mask] - first] = values[mask]
+        return cls(first, ratios)
+
+    def __len__(self):
+        return len(self.ratios)
+
+    def exclude_leave(self, calendar) -> "RatioSeries":
+        """
+        @brief 将请假日的完成率置为 NaN（原地修改）。
+        @param calendar utils.leave.LeaveCalendar
+        @return self
+        """
+        self.ratios[leave_mask(calendar, self.first, len(self.ratios))] = np.nan
+        return self
+
+    def counted(self) -> int:
+        """
+        @brief 参与统计的天数（不含请假日）。
+        """
+        return int(np.count_nonzero(~np.isnan(self.ratios)))
+
+    def mean(self) -> float:
+        """
+        @brief 区间平均完成率（0~1，不含请假日），没有可统计的日期时返回 0。
+        """
+        return float(np.nanmean(self.ratios)) if self.counted() else 0.0
+
+    def _bucket_ids(self, unit: str) -> np.ndarray:
+        days = np.arange(self.first, self.first + len(self.ratios), dtype=np.int64)
+        if unit == "day":
+            return days
+        if unit == "week":
+            return (days + 3) // 7  # 1970-01-01 是周四，+3 后按周一对齐
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+    def bucketed(self, max_bars: int = MAX_BARS) -> dict:
+        """
+        @brief 按天/周/月合并，保证桶数不超过 max_bars。
+        @param max_bars 最大桶数
+        @return {"unit", "labels", "mean", "low", "high"}，后三者为百分比数组
+
+        @details
+        依次尝试按天、按周、按月，选用第一个桶数不超过上限的粒度；
+        若按月仍超过上限（多年数据），则把相邻的若干个月合并为一个桶。
+        请假日不计入桶内统计；整个桶都是请假日时三项均为 NaN。
+        """
+        if not len(self.ratios):
+            empty = np.zeros(0)
+            return {"unit": "day", "labels": [], "mean": empty, "low": empty, "high": empty}
+
+        for unit in ("day", "week", "month"):
+            ids = self._bucket_ids(unit)
+            if ids[-1] - ids[0] + 1 <= max_bars:
+                break
+        else:
+            ids = (ids - ids[0]) // -(-(ids[-1] - ids[0] + 1) // max_bars)
+
+        starts = np.flatnonzero(np.diff(ids, prepend=ids[0] - 1))
+        percent = self.ratios * 100
+        valid = ~np.isnan(percent)
+        counts = np.add.reduceat(valid.astype(np.int64), starts)
+        sums = np.add.reduceat(np.where(valid, percent, 0.0), starts)
+        first_days = (self.first + starts).astype("datetime64[D]")
+        labels = np.datetime_as_string(first_days, unit="M" if unit == "month" else "D")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(counts > 0, sums / counts, np.nan)
+        return {
+            "unit": unit,
+            "labels": labels.tolist(),
+            "mean": mean,
+            "low": np.fmin.reduceat(percent, starts),   # fmin/fmax 忽略 NaN
+            "high": np.fmax.reduceat(percent, starts),
+        }
+
+
+# ---- 日历热力图 ---- #
+CALENDAR_WEEKS = 53
+
+
+def calendar_start(end: str) -> str:
+    """
+    @brief 日历热力图的起始日期：end 所在周的周一再往前 52 周。
+    @param end 结束日期 "YYYY-MM-DD"
+    @return 起始日期（周一）
+    """
+    last = date.fromisoformat(end)
+    return date.fromordinal(last.toordinal() - last.weekday() - 7 * (CALENDAR_WEEKS - 1)).isoformat()
+
+
+def calendar_grid(series: RatioSeries) -> dict:
+    """
+    @brief 将从周一开始的序列排成 7×53 的日历网格（行：周一~周日，列：周）。
+    @param series 由 calendar_start() 起始、已 exclude_leave() 的 RatioSeries，
+                  请假日（NaN）的格子被遮罩，不参与着色
+    @return {"values": 掩码数组（百分比，请假/区间外被遮罩）,
+             "inside": 布尔网格（是否在区间内）,
+             "month_ticks": [(列号, "M月"), ...]}
+    """
+    cells = 7 * CALENDAR_WEEKS
+    count = min(len(series), cells)
+    days = series.first + np.arange(cells, dtype=np.int64)
+
+    values = np.zeros(cells)
+    values[:count] = series.ratios[:count] * 100
+    inside = np.arange(cells) < count
+    leave = np.isnan(values)
+
+    # 按周排列后转置：第 c 列为第 c 周，第 r 行为星期 r
+    shape = (CALENDAR_WEEKS, 7)
+    values = values.reshape(shape).T
+    inside = inside.reshape(shape).T
+    leave = leave.reshape(shape).T
+
+    mondays = days[::7].astype("datetime64[D]")
+    months = mondays.astype("datetime64[M]").astype(np.int64)
+    columns = np.flatnonzero(np.diff(months, prepend=months[0] - 1))
+    return {
+        "values": np.ma.masked_array(values, mask=leave | ~inside),
+        "inside": inside,
+        "month_ticks": [(int(c), f"{months[c] % 12 + 1}月") for c in columns],
+    }
@@ -0,0 +1,642 @@
+import json
+import os
+import sqlite3
+import threading
+from glob import glob
+
+from utils.file_utils import load_json, save_json, save_json_async, submit_write, pending_writes
+from utils.history import CompletionHistory
+from utils.leave import LeaveCalendar
+from utils.metrics import update_metrics, rebuild_metrics, apply_leave
+
+LEAVE_PATH = "data/leave_days.json"
+SQLITE_PATH = "data/progress.db"
+AGGREGATE_DIR = "aggregate"  # JSON 后端中总体统计索引所在的子目录（与计划文件不共用文件名空间）
+AGGREGATE_VERSION = 2        # 索引格式版本：2 为按月分片
+LEGACY_AGGREGATE_ID = "_all"  # 旧版本把索引保存为 summary__all*.json，重建时删除
+
+
+class Storage:
+    """
+    @class Storage
+    @brief 状态、每日汇总与请假日的存储接口。
+
+    @details
+    ProgressPage 与 StatsPage 只通过该接口读写数据，具体落盘方式由子类决定。
+    写入方法均立即返回，由后台写盘线程执行；读取方法能读到已提交但尚未
+    落盘的数据。可选的 on_done(error) 回调在写入完成后于 Tk 线程调用。
+    """
+
+    name = ""
+    history_dir = "data"
+
+    def load_status(self, plan_id: str) -> dict:
+        """
+        @brief 读取计划最近一天的勾选状态。
+        @param plan_id 计划 ID
+        @return {"_date": "YYYY-MM-DD", "HH:MM-HH:MM": bool, ...}；无记录时为 {}
+        """
+        raise NotImplementedError
+
+    def save_status(self, plan_id: str, status: dict, on_done=None) -> None:
+        """
+        @brief 保存计划当天的勾选状态。
+        @param plan_id 计划 ID
+        @param status 结构同 load_status() 的返回值，必须包含 "_date"
+        @param on_done 可选完成回调
+        """
+        raise NotImplementedError
+
+    def load_summary(self, plan_id: str) -> dict:
+        """
+        @brief 读取计划的每日完成率。
+        @param plan_id 计划 ID
+        @return {"YYYY-MM-DD": ratio}
+        """
+        raise NotImplementedError
+
+    def save_summary_day(self, plan_id: str, date: str, ratio: float, on_done=None) -> None:
+        """
+        @brief 写入计划某一天的完成率（已存在则覆盖）。
+        @param plan_id 计划 ID
+        @param date 日期 "YYYY-MM-DD"
+        @param ratio 完成率 0~1
+        @param on_done 可选完成回调
+        """
+        raise NotImplementedError
+
+    def summary_plan_ids(self) -> list[str]:
+        """
+        @brief 列出所有存在汇总记录的计划 ID（包括已删除配置的计划）。
+        """
+        raise NotImplementedError
+
+    def load_aggregate(self, start: str, end: str) -> dict:
+        """
+        @brief 读取日期区间内（含两端）所有计划每天的最大完成率。
+        @param start 起始日期 "YYYY-MM-DD"
+        @param end 结束日期 "YYYY-MM-DD"
+        @return {"YYYY-MM-DD": 最大完成率}，仅包含有记录的日期
+
+        @details
+        由 save_summary_day 增量维护，读取代价只与区间长度有关，
+        不随计划数量和历史长度增长。
+        """
+        raise NotImplementedError
+
+    def rebuild_aggregate(self) -> int:
+        """
+        @brief 从各计划的汇总数据重新生成总体统计索引。
+        @return 索引包含的天数
+        """
+        raise NotImplementedError
+
+    def ensure_aggregate(self) -> bool:
+        """
+        @brief 启动时检查总体统计索引，缺失或为旧格式时全量重建一次。
+        @return 是否执行了重建
+
+        @details
+        在程序启动、界面创建之前调用；保存与读取汇总时不再检查，
+        因此 Tk 线程与统计页后台线程都不会触发全量重建。
+        默认实现无需索引，直接返回 False。
+        """
+        return False
+
+    def load_leave_calendar(self) -> LeaveCalendar:
+        """
+        @brief 读取请假日历（有序、已合并的日期区间）。
+        """
+        raise NotImplementedError
+
+    def add_leave_range(self, start: str, end: str, on_done=None) -> bool:
+        """
+        @brief 将闭区间 [start, end] 内的日期标记为请假日（如休假）。
+        @param start 起始日期 "YYYY-MM-DD"
+        @param end 结束日期 "YYYY-MM-DD"
+        @param on_done 可选完成回调
+        @return 是否有新增（区间内已全部是请假日时返回 False 且不写入）
+        @note 实现在写入后应调用 _refresh_metrics_for_leave()，使已计入的滚动指标排除新请假日
+        """
+        raise NotImplementedError
+
+    def load_leave_days(self) -> list[str]:
+        """
+        @brief 读取所有请假日期。
+        @return 升序排列的 "YYYY-MM-DD" 列表
+        """
+        return self.load_leave_calendar().days()
+
+    def add_leave_day(self, date: str, on_done=None) -> bool:
+        """
+        @brief 将日期标记为请假日。
+        @param date 日期 "YYYY-MM-DD"
+        @param on_done 可选完成回调
+        @return 是否为新增（已是请假日时返回 False 且不写入）
+        """
+        return self.add_leave_range(date, date, on_done)
+
+    # ------------------------------ 指标 ------------------------------ #
+    def load_metrics(self, plan_id: str) -> dict | None:
+        """
+        @brief 读取计划的滚动指标状态（连续天数、最近 30 天完成率等）。
+        @param plan_id 计划 ID
+        @return 指标状态（见 utils.metrics.empty_metrics），尚未生成时为 None
+        """
+        raise NotImplementedError
+
+    def save_metrics(self, plan_id: str, state: dict, on_done=None) -> None:
+        """
+        @brief 保存计划的滚动指标状态。
+        @param plan_id 计划 ID
+        @param state 指标状态
+        @param on_done 可选完成回调
+        """
+        raise NotImplementedError
+
+    def _metrics_state(self, plan_id: str, leave) -> dict:
+        """
+        @brief 读取指标状态；不存在或缺少结转值 base 时（旧数据目录）从汇总全量生成一次并保存。
+        """
+        state = self.load_metrics(plan_id)
+        if state is None or "base" not in state:
+            state = rebuild_metrics(self.load_summary(plan_id), leave)
+            self.save_metrics(plan_id, state)
+        return state
+
+    def update_metrics(self, plan_id: str, date: str, ratio: float, on_done=None) -> dict:
+        """
+        @brief 在写入某天完成率后增量更新滚动指标。
+        @param plan_id 计划 ID
+        @param date 日期 "YYYY-MM-DD"
+        @param ratio 完成率 0~1
+        @param on_done 可选完成回调
+        @return 更新后的指标状态
+
+        @details
+        常规情况下只改动最近 30 天的窗口；仅当补写早于最近记录的日期时
+        才从完整汇总重新计算。
+        """
+        leave = self.load_leave_calendar()
+        state = self._metrics_state(plan_id, leave)
+        changed = update_metrics(state, date, ratio, leave)
+        if changed is None:
+            state = rebuild_metrics(self.load_summary(plan_id), leave)
+            changed = True
+        if changed:
+            self.save_metrics(plan_id, state, on_done)
+        return state
+
+    def _refresh_metrics_for_leave(self, start: str, end: str, calendar: LeaveCalendar) -> None:
+        """
+        @brief 新增请假区间后，修正已把区间内日期计入滚动指标的计划。
+        @param start 新请假区间的起始日期
+        @param end 新请假区间的结束日期
+        @param calendar 已包含新区间的请假日历
+
+        @details
+        只读取各计划的指标状态，由 apply_leave() 在最近 30 天的窗口内重算；
+        仅当区间早于该窗口且会影响结转的连续天数时，才从完整汇总重新计算该计划。
+        尚无指标或指标为旧格式的计划无需处理，下次读取时会按新日历生成。
+        """
+        for plan_id in self.summary_plan_ids():
+            state = self.load_metrics(plan_id)
+            if state is None or "base" not in state:
+                continue
+            changed = apply_leave(state, start, end)
+            if changed is None:
+                state, changed = rebuild_metrics(self.load_summary(plan_id), calendar), True
+            if changed:
+                self.save_metrics(plan_id, state)
+
+    def preview_metrics(self, plan_id: str, date: str, ratio: float) -> dict:
+        """
+        @brief 计算“假如某天完成率为 ratio”时的指标，不写入存储（用于打开页面时显示）。
+        @return 指标状态副本
+        """
+        leave = self.load_leave_calendar()
+        state = self._metrics_state(plan_id, leave)
+        preview = dict(state, recent=list(state["recent"]))
+        if update_metrics(preview, date, ratio, leave) is None:
+            return state
+        return preview
+
+    # ------------------------------ 历史 ------------------------------ #
+    def _history_path(self, plan_id: str) -> str:
+        return os.path.join(self.history_dir, f"history_{plan_id}.bin")
+
+    def record_history(self, plan_id: str, date: str, bits: list, on_done=None) -> None:
+        """
+        @brief 记录计划某天每段的完成情况（保存在 data/history_<plan>.bin 位图文件中）。
+        @param plan_id 计划 ID
+        @param date 日期 "YYYY-MM-DD"
+        @param bits 按任务段顺序排列的布尔列表
+        @param on_done 可选完成回调
+        """
+        path = self._history_path(plan_id)
+        history = CompletionHistory(path)
+        submit_write(f"{path}#{date}", (date, list(bits)),
+                     lambda _key, data: history.record(*data), on_done)
+
+    def query_history(self, plan_id: str, start: str, end: str):
+        """
+        @brief 查询计划在日期区间内（含两端）每天每段的完成矩阵。
+        @param plan_id 计划 ID
+        @param start 起始日期 "YYYY-MM-DD"
+        @param end 结束日期 "YYYY-MM-DD"
+        @return (dates, rows)：有记录的日期升序列表与对应的布尔列表
+        """
+        path = self._history_path(plan_id)
+        dates, rows = CompletionHistory(path).query(start, end)
+        pending = [d for d in pending_writes(f"{path}#").values() if start <= d[0] <= end]
+        if not pending:
+            return dates, rows
+
+        merged = dict(zip(dates, rows))
+        merged.update((day, list(bits)) for day, bits in pending)
+        dates = sorted(merged)
+        return dates, [merged[d] for d in dates]
+
+
+class JsonStorage(Storage):
+    """
+    @class JsonStorage
+    @brief 基于 data/ 目录下 JSON 文件的存储后端（默认）。
+
+    @details
+    - data/status_<plan>.json：当天勾选状态
+    - data/summary_<plan>.json：{ "YYYY-MM-DD": ratio }
+    - data/aggregate/<YYYY-MM>.json：总体统计索引的月分片 { "YYYY-MM-DD": { plan: ratio } }
+    - data/aggregate/index.json：索引清单 {"version", "months": [有分片的月份]}
+    - data/metrics_<plan>.json：滚动指标（连续天数、最近 30 天完成率）
+    - data/leave_days.json：请假日历，单日为 "YYYY-MM-DD"，区间为 [start, end]
+    """
+
+    name = "json"
+
+    def __init__(self, data_dir: str = "data"):
+        self.data_dir = data_dir
+        self.history_dir = data_dir
+
+    def _status_path(self, plan_id):
+        return os.path.join(self.data_dir, f"status_{plan_id}.json")
+
+    def _summary_path(self, plan_id):
+        return os.path.join(self.data_dir, f"summary_{plan_id}.json")
+
+    def _leave_path(self):
+        return os.path.join(self.data_dir, "leave_days.json")
+
+    def _aggregate_path(self, month=None):
+        """
+        @brief 索引清单路径；给出 month（"YYYY-MM"）时为该月分片的路径。
+        """
+        return os.path.join(self.data_dir, AGGREGATE_DIR, f"{month or 'index'}.json")
+
+    def _metrics_path(self, plan_id):
+        return os.path.join(self.data_dir, f"metrics_{plan_id}.json")
+
+    def load_status(self, plan_id):
+        return load_json(self._status_path(plan_id), {})
+
+    def save_status(self, plan_id, status, on_done=None):
+        save_json_async(self._status_path(plan_id), status, on_done=on_done)
+
+    def load_summary(self, plan_id):
+        return load_json(self._summary_path(plan_id), {})
+
+    def save_summary_day(self, plan_id, date, ratio, on_done=None):
+        path = self._summary_path(plan_id)
+        summary = load_json(path, {}, copy=False)
+        if summary.get(date) == ratio:
+            return  # 防止重复写入
+        summary = {**summary, date: ratio}  # 值均为数字，浅复制即可，不修改缓存中的对象
+        save_json_async(path, summary, on_done=on_done)
+
+        month = date[:7]
+        manifest = self._load_aggregate_manifest()
+        shard_path = self._aggregate_path(month)
+        shard = load_json(shard_path, {})
+        shard.setdefault(date, {})[plan_id] = ratio
+        save_json_async(shard_path, shard)
+        if month not in manifest["months"]:
+            manifest["months"] = sorted(manifest["months"] + [month])
+            save_json_async(self._aggregate_path(), manifest)
+
+    def _load_aggregate_manifest(self):
+        """
+        @brief 读取索引清单（不存在时视为空索引；旧数据的迁移由 ensure_aggregate() 在启动时完成）。
+        """
+        manifest = load_json(self._aggregate_path(), {})
+        return {"version": AGGREGATE_VERSION, "months": manifest.get("months", [])}
+
+    def ensure_aggregate(self):
+        if load_json(self._aggregate_path(), {}).get("version") == AGGREGATE_VERSION:
+            return False
+        self.rebuild_aggregate()
+        return True
+
+    def summary_plan_ids(self):
+        prefix = os.path.join(self.data_dir, "summary_")
+        paths = set(glob(f"{prefix}*.json")) | set(pending_writes(prefix))
+        return sorted(os.path.basename(p)[len("summary_"):-len(".json")] for p in paths)
+
+    def load_aggregate(self, start, end):
+        # 只读取区间覆盖到的月分片，且不复制缓存中的分片数据
+        first_month, last_month = start[:7], end[:7]
+        result = {}
+        for month in self._load_aggregate_manifest()["months"]:
+            if not first_month <= month <= last_month:
+                continue
+            for day, ratios in load_json(self._aggregate_path(month), {}, copy=False).items():
+                if ratios and start <= day <= end:
+                    result[day] = max(ratios.values())
+        return result
+
+    def rebuild_aggregate(self):
+        self._remove_legacy_aggregate()
+        shards = {}
+        for plan_id in self.summary_plan_ids():
+            for day, ratio in self.load_summary(plan_id).items():
+                shards.setdefault(day[:7], {}).setdefault(day, {})[plan_id] = ratio
+
+        os.makedirs(os.path.join(self.data_dir, AGGREGATE_DIR), exist_ok=True)
+        for path in glob(self._aggregate_path("[0-9]*")):
+            if os.path.basename(path)[:-len(".json")] not in shards:
+                os.remove(path)
+        for month, shard in shards.items():
+            save_json(self._aggregate_path(month), dict(sorted(shard.items())))
+        save_json(self._aggregate_path(), {"version": AGGREGATE_VERSION, "months": sorted(shards)})
+        return sum(len(shard) for shard in shards.values())
+
+    def _remove_legacy_aggregate(self):
+        """
+        @brief 删除旧版本留在 data/ 下的索引文件 summary__all*.json。
+
+        @details
+        计划汇总至少有一天且值都是数字，旧索引（清单或 { 日期: { plan: ratio } }）则不是，
+        据此区分，恰好名为 "_all…" 的计划的汇总不会被误删。
+        """
+        for path in glob(self._summary_path(f"{LEGACY_AGGREGATE_ID}*")):
+            data = load_json(path, {}, copy=False)
+            if not data or not all(isinstance(value, (int, float)) for value in data.values()):
+                os.remove(path)
+
+    def load_metrics(self, plan_id):
+        return load_json(self._metrics_path(plan_id), {}) or None
+
+    def save_metrics(self, plan_id, state, on_done=None):
+        save_json_async(self._metrics_path(plan_id), state, on_done=on_done)
+
+    def load_leave_calendar(self):
+        return LeaveCalendar(load_json(self._leave_path(), []))
+
+    def add_leave_range(self, start, end, on_done=None):
+        calendar = self.load_leave_calendar()
+        if not calendar.add(start, end):
+            return False
+        save_json_async(self._leave_path(), calendar.entries(), on_done=on_done)
+        self._refresh_metrics_for_leave(start, end, calendar)
+        return True
+
+
+class SqliteStorage(Storage):
+    """
+    @class SqliteStorage
+    @brief 基于标准库 sqlite3 的存储后端。
+
+    @details
+    表结构：
+    - summary(plan, day, ratio)：主键 (plan, day)，另有 day 索引
+    - segment_status(plan, day, segment, done)：主键 (plan, day, segment)，
+      每天每段一行，历史天数的状态不会被覆盖
+    - leave_day(day)：主键 day
+    - plan_metrics(plan, state)：滚动指标状态（JSON 文本）
+
+    写入在后台写盘线程中执行（每个线程使用各自的连接，数据库为 WAL 模式），
+    读取前会叠加尚未落盘的写入，保证读到自己刚写的数据。
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS summary (
+            plan  TEXT NOT NULL,
+            day   TEXT NOT NULL,
+            ratio REAL NOT NULL,
+            PRIMARY KEY (plan, day)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS summary_day ON summary (day);
+
+        CREATE TABLE IF NOT EXISTS segment_status (
+            plan    TEXT NOT NULL,
+            day     TEXT NOT NULL,
+            segment TEXT NOT NULL,
+            done    INTEGER NOT NULL,
+            PRIMARY KEY (plan, day, segment)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS leave_day (
+            day TEXT PRIMARY KEY
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS plan_metrics (
+            plan  TEXT PRIMARY KEY,
+            state TEXT NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self.history_dir = os.path.dirname(path) or "."
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """
+        @brief 获取当前线程专用的数据库连接。
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # 后台写入键：sqlite/<表>/<计划>[/<日期>]（计划 ID 来自文件名，不含 "/"）
+    @staticmethod
+    def _key(*parts):
+        return "/".join(("sqlite",) + parts)
+
+    # ------------------------------ 状态 ------------------------------ #
+    def load_status(self, plan_id):
+        key = self._key("status", plan_id)
+        pending = pending_writes(key).get(key)  # 按前缀匹配，需取完全相同的键
+        if pending is not None:
+            return dict(pending)
+
+        conn = self._conn()
+        row = conn.execute("SELECT MAX(day) FROM segment_status WHERE plan = ?", (plan_id,)).fetchone()
+        if not row or row[0] is None:
+            return {}
+        day = row[0]
+        status = {"_date": day}
+        for segment, done in conn.execute(
+                "SELECT segment, done FROM segment_status WHERE plan = ? AND day = ?", (plan_id, day)):
+            status[segment] = bool(done)
+        return status
+
+    def save_status(self, plan_id, status, on_done=None):
+        submit_write(self._key("status", plan_id), status,
+                     lambda _key, data: self._write_status(plan_id, data), on_done)
+
+    def _write_status(self, plan_id, status):
+        day = status["_date"]
+        rows = [(plan_id, day, seg, int(bool(done))) for seg, done in status.items() if seg != "_date"]
+        with self._conn() as conn:
+            conn.execute("DELETE FROM segment_status WHERE plan = ? AND day = ?", (plan_id, day))
+            conn.executemany("INSERT INTO segment_status VALUES (?, ?, ?, ?)", rows)
+
+    # ------------------------------ 汇总 ------------------------------ #
+    def load_summary(self, plan_id):
+        summary = dict(self._conn().execute("SELECT day, ratio FROM summary WHERE plan = ?", (plan_id,)))
+        for day, ratio in pending_writes(self._key("summary", plan_id, "")).values():
+            summary[day] = ratio
+        return summary
+
+    def save_summary_day(self, plan_id, date, ratio, on_done=None):
+        submit_write(self._key("summary", plan_id, date), (date, ratio),
+                     lambda _key, data: self._write_summary(plan_id, *data), on_done)
+
+    def _write_summary(self, plan_id, date, ratio):
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO summary VALUES (?, ?, ?)", (plan_id, date, ratio))
+
+    def load_aggregate(self, start, end):
+        conn = self._conn()
+        result = dict(conn.execute(
+            "SELECT day, MAX(ratio) FROM summary WHERE day BETWEEN ? AND ? GROUP BY day", (start, end)))
+
+        # 尚未落盘的写入可能降低某天的最大值，按天重新计算受影响的日期
+        prefix = self._key("summary", "")
+        pending = {}
+        for key, (day, ratio) in pending_writes(prefix).items():
+            if start <= day <= end:
+                plan_id = key[len(prefix):].rsplit("/", 1)[0]
+                pending.setdefault(day, {})[plan_id] = ratio
+        for day, overrides in pending.items():
+            ratios = dict(conn.execute("SELECT plan, ratio FROM summary WHERE day = ?", (day,)))
+            ratios.update(overrides)
+            result[day] = max(ratios.values())
+        return result
+
+    def rebuild_aggregate(self):
+        # 总体统计直接由 summary(day) 索引查询得到，这里只需刷新查询规划统计信息
+        conn = self._conn()
+        with conn:
+            conn.execute("ANALYZE summary")
+        return conn.execute("SELECT COUNT(DISTINCT day) FROM summary").fetchone()[0]
+
+    def summary_plan_ids(self):
+        plans = {row[0] for row in self._conn().execute("SELECT DISTINCT plan FROM summary")}
+        prefix = self._key("summary", "")
+        plans.update(k[len(prefix):].rsplit("/", 1)[0] for k in pending_writes(prefix))
+        return sorted(plans)
+
+    # ------------------------------ 指标 ------------------------------ #
+    def load_metrics(self, plan_id):
+        key = self._key("metrics", plan_id)
+        pending = pending_writes(key).get(key)
+        if pending is not None:
+            return json.loads(json.dumps(pending))
+        row = self._conn().execute("SELECT state FROM plan_metrics WHERE plan = ?", (plan_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_metrics(self, plan_id, state, on_done=None):
+        submit_write(self._key("metrics", plan_id), state,
+                     lambda _key, data: self._write_metrics(plan_id, data), on_done)
+
+    def _write_metrics(self, plan_id, state):
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO plan_metrics VALUES (?, ?)", (plan_id, json.dumps(state)))
+
+    # ------------------------------ 请假 ------------------------------ #
+    def load_leave_calendar(self):
+        days = {row[0] for row in self._conn().execute("SELECT day FROM leave_day")}
+        for pending in pending_writes(self._key("leave", "")).values():
+            days.update(pending)
+        return LeaveCalendar(days)
+
+    def add_leave_range(self, start, end, on_done=None):
+        calendar = self.load_leave_calendar()
+        if calendar.covers(start, end):
+            return False
+        days = LeaveCalendar([[start, end]]).days()
+        submit_write(self._key("leave", start, end), days, lambda _key, data: self._write_leave(data), on_done)
+        calendar.add(start, end)
+        self._refresh_metrics_for_leave(start, end, calendar)
+        return True
+
+    def _write_leave(self, days):
+        with self._conn() as conn:
+            conn.executemany("INSERT OR IGNORE INTO leave_day VALUES (?)", [(d,) for d in days])
+
+    # ------------------------------ 导入 ------------------------------ #
+    def import_from(self, source: Storage) -> dict:
+        """
+        @brief 一次性从另一个后端（通常为 JsonStorage）导入全部数据。
+
+        @param source 数据来源后端
+        @return 各类记录的导入条数 {"status": n, "summary": n, "leave": n}
+
+        @details
+        同步执行并在单个事务中提交，已存在的同键记录会被覆盖。
+        """
+        counts = {"status": 0, "summary": 0, "leave": 0}
+        conn = self._conn()
+        with conn:
+            for plan_id in source.summary_plan_ids():
+                rows = [(plan_id, d, r) for d, r in source.load_summary(plan_id).items()]
+                conn.executemany("INSERT OR REPLACE INTO summary VALUES (?, ?, ?)", rows)
+                counts["summary"] += len(rows)
+
+            for plan_id in _status_plan_ids(source):
+                status = source.load_status(plan_id)
+                day = status.get("_date")
+                if not day:
+                    continue
+                rows = [(plan_id, day, seg, int(bool(done))) for seg, done in status.items() if seg != "_date"]
+                conn.execute("DELETE FROM segment_status WHERE plan = ? AND day = ?", (plan_id, day))
+                conn.executemany("INSERT INTO segment_status VALUES (?, ?, ?, ?)", rows)
+                counts["status"] += len(rows)
+
+            leave_days = source.load_leave_days()
+            conn.executemany("INSERT OR IGNORE INTO leave_day VALUES (?)", [(d,) for d in leave_days])
+            counts["leave"] += len(leave_days)
+        return counts
+
+
+def _status_plan_ids(source: Storage) -> list[str]:
+    """
+    @brief 列出来源后端中存在勾选状态的计划 ID。
+    """
+    if isinstance(source, JsonStorage):
+        prefix = os.path.join(source.data_dir, "status_")
+        return sorted(os.path.basename(p)[len("status_"):-len(".json")] for p in glob(f"{prefix}*.json"))
+    return source.summary_plan_ids()
+
+
+def create_storage(name: str) -> Storage:
+    """
+    @brief 按名称创建存储后端。
+    @param name "json" 或 "sqlite"
+    @return Storage 实例
+    @throws ValueError 未知的后端名称
+    """
+    if name == "json":
+        return JsonStorage()
+    if name == "sqlite":
+        return SqliteStorage()
+    raise ValueError(f"未知的存储后端：{name}")
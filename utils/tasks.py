@@ -0,0 +1,168 @@
+import threading
+
+
+class Cancelled(Exception):
+    """
+    @brief 后台任务被更新的提交取代时，由任务函数抛出以提前结束。
+    """
+
+
+def raise_if_cancelled(cancel) -> None:
+    """
+    @brief 任务函数在各阶段之间调用：已被取代时抛出 Cancelled。
+    @param cancel 任务收到的 threading.Event
+    """
+    if cancel.is_set():
+        raise Cancelled()
+
+
+class LatestTaskRunner:
+    """
+    @class LatestTaskRunner
+    @brief “只保留最新一次”的后台计算线程，结果通过 after() 回到 Tk 线程。
+
+    @details
+    - 同一时刻最多一个任务在执行、一个任务在排队；新的提交会替换排队中的任务，
+      并通知正在执行的任务取消（任务函数通过 raise_if_cancelled(cancel) 自行退出）。
+    - 只有最新一次提交的结果会被回调，被取代的任务结果直接丢弃。
+    - 回调不在后台线程执行，而是由绑定的 Tk 控件以 after() 轮询取回，
+      仅在有任务未完成时才轮询；控件销毁后请调用 close()。
+    """
+
+    POLL_MS = 30
+
+    def __init__(self, widget, name="stats-worker"):
+        """
+        @param widget 提供 after/after_cancel 的 Tk 控件
+        @param name 后台线程名
+        """
+        self._widget = widget
+        self._name = name
+        self._cond = threading.Condition()
+        self._queued = None       # (generation, func, cancel)
+        self._running = None      # (generation, cancel)
+        self._result = None       # (generation, value, error)
+        self._generation = 0
+        self._thread = None
+        self._closed = False
+        self._poll_job = None
+        self._callbacks = {}      # generation -> (on_result, on_error)
+
+        # 统计信息：提交次数、被取代次数、完成次数
+        self.submitted = 0
+        self.superseded = 0
+        self.completed = 0
+
+    # ---------------------------- Tk 线程接口 ---------------------------- #
+    def submit(self, func, on_result, on_error=None) -> int:
+        """
+        @brief 提交一个后台任务，取代之前尚未完成的任务。
+        @param func 任务函数 func(cancel)，cancel 为 threading.Event，在后台线程执行
+        @param on_result 成功回调 on_result(value)，在 Tk 线程调用
+        @param on_error 可选失败回调 on_error(error)，在 Tk 线程调用
+        @return 本次提交的序号
+        """
+        cancel = threading.Event()
+        with self._cond:
+            self._generation += 1
+            generation = self._generation
+            self.submitted += 1
+            if self._queued is not None:
+                self.superseded += 1
+            if self._running is not None and not self._running[1].is_set():
+                self._running[1].set()
+                self.superseded += 1
+            self._queued = (generation, func, cancel)
+            self._callbacks = {generation: (on_result, on_error)}
+            self._ensure_thread()
+            self._cond.notify_all()
+        self._arm_poll()
+        return generation
+
+    def cancel(self) -> None:
+        """
+        @brief 取消排队中和执行中的任务，丢弃其结果。
+        """
+        with self._cond:
+            self._generation += 1
+            if self._running is not None:
+                self._running[1].set()
+            self._queued = None
+            self._callbacks = {}
+
+    @property
+    def busy(self) -> bool:
+        """
+        @brief 最新提交的任务是否仍未回调。
+        """
+        with self._cond:
+            return bool(self._callbacks)
+
+    def close(self) -> None:
+        """
+        @brief 取消所有任务并停止后台线程（不等待当前任务结束）。
+        """
+        self.cancel()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._poll_job is not None:
+            try:
+                self._widget.after_cancel(self._poll_job)
+            except Exception:
+                pass
+            self._poll_job = None
+
+    def _arm_poll(self) -> None:
+        if self._poll_job is not None or self._closed:
+            return
+        self._poll_job = self._widget.after(self.POLL_MS, self._poll)
+
+    def _poll(self) -> None:
+        self._poll_job = None
+        with self._cond:
+            result, self._result = self._result, None
+            callbacks = None
+            if result is not None:
+                callbacks = self._callbacks.pop(result[0], None)
+            pending = bool(self._callbacks)
+
+        if callbacks is not None:
+            on_result, on_error = callbacks
+            _generation, value, error = result
+            if error is None:
+                on_result(value)
+            elif on_error is not None:
+                on_error(error)
+        if pending:
+            self._arm_poll()
+
+    # ----------------------------- 后台线程 ----------------------------- #
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queued is not None or self._closed)
+                if self._closed:
+                    return
+                generation, func, cancel = self._queued
+                self._queued = None
+                self._running = (generation, cancel)
+
+            value = error = None
+            try:
+                value = func(cancel)
+            except Cancelled:
+                cancel.set()
+            except Exception as e:
+                error = e
+
+            with self._cond:
+                self._running = None
+                if not cancel.is_set() and generation == self._generation:
+                    self.completed += 1
+                    self._result = (generation, value, error)
@@ -1,8 +1,14 @@
+from array import array
+from bisect import bisect_right
 from datetime import datetime, time, timedelta
 import re
 
 # 匹配严格的 HH:MM-HH:MM 格式
 time_pattern = re.compile(r"^\d{2}:\d{2}-\d{2}:\d{2}$")
+# 同上，分组取出时、分
+_range_pattern = re.compile(r"^(\d{2}):(\d{2})-(\d{2}):(\d{2})$")
+
+DAY_MINUTES = 1440
 
 
 def is_time_format_valid(time_range: str) -> bool:
@@ -132,3 +138,309 @@ def str_to_datetime(base_date: datetime.date, t: str) -> datetime:
         return datetime.combine(base_date + timedelta(days=1), datetime.min.time())
     return datetime.combine(base_date, datetime.strptime(t, "%H:%M").time())
 
+
+def parse_range_minutes(time_range: str):
+    """
+    @brief 将时间段解析为整数分钟（不检查先后顺序）。
+
+    @param time_range 时间段，可为非标准格式（如 "9:0-18:0"）
+    @return (start, end) 分钟数元组；格式错误、分钟超过 59、小时超过 24
+            或 24 点不是 "24:00" 结束时返回 None
+    """
+    time_range = time_range.strip()
+    match = _range_pattern.fullmatch(time_range) or _range_pattern.fullmatch(auto_pad_time(time_range))
+    if not match:
+        return None
+    sh, sm, eh, em = map(int, match.groups())
+    if sm > 59 or em > 59 or sh > 23 or eh > 24 or (eh == 24 and em):
+        return None
+    return sh * 60 + sm, eh * 60 + em
+
+
+def _format_minutes(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def validate_intervals(ranges: list[str], names: list[str] | None = None) -> list[dict]:
+    """
+    @brief 一次扫描检查整张时间表，返回所有问题（而不是遇到第一个就停止）。
+
+    @param ranges 各行的时间段文本（按界面行顺序）
+    @param names 可选，各行的任务名称；提供时空名称也视为问题
+    @return 问题列表，每项为 {"kind", "rows", "message"}：
+            - kind："empty"（未填写完整）、"malformed"（格式错误）、"reversed"（结束不晚于开始）、
+              "overlap"（与前面的时间段重叠）、"gap"（未覆盖的空档）
+            - rows：涉及的行下标（从 0 开始）；gap 为空档前后的行，位于开头/结尾时只有一行
+            - message：可直接展示的中文说明（行号从 1 开始）
+
+    @details
+    每行只解析一次为整数分钟；合法的区间按开始时间排序后做一次扫描，
+    维护“目前覆盖到的最远结束时间”及对应的行：开始时间早于它即重叠，
+    晚于它即存在空档；最后检查是否覆盖到 24:00。总复杂度 O(n log n)。
+    """
+    issues = []
+    intervals = []
+    for row, text in enumerate(ranges):
+        text = text.strip()
+        if not text or (names is not None and not names[row].strip()):
+            issues.append({"kind": "empty", "rows": [row],
+                           "message": f"第 {row + 1} 项未填写完整，请填写时间段和任务名称。"})
+            if not text:
+                continue
+        parsed = parse_range_minutes(text)
+        if parsed is None:
+            issues.append({"kind": "malformed", "rows": [row],
+                           "message": f"第 {row + 1} 项时间段格式错误：{text}，必须为 HH:MM-HH:MM，例如 09:00-12:00。"})
+        elif parsed[1] <= parsed[0]:
+            issues.append({"kind": "reversed", "rows": [row],
+                           "message": f"第 {row + 1} 项时间段不合理：{text}，结束时间必须晚于开始时间。"})
+        else:
+            intervals.append((parsed[0], parsed[1], row))
+
+    intervals.sort()
+    reach, reach_row = 0, None
+    for start, end, row in intervals:
+        if start < reach:
+            issues.append({"kind": "overlap", "rows": [reach_row, row],
+                           "message": f"第 {reach_row + 1} 项与第 {row + 1} 项时间段重叠。"})
+        elif start > reach:
+            rows = [row] if reach_row is None else [reach_row, row]
+            issues.append({"kind": "gap", "rows": rows,
+                           "message": f"{_format_minutes(reach)}-{_format_minutes(start)} 未被任何时间段覆盖。"})
+        if end > reach:
+            reach, reach_row = end, row
+
+    if reach < DAY_MINUTES:
+        issues.append({"kind": "gap", "rows": [] if reach_row is None else [reach_row],
+                       "message": f"{_format_minutes(reach)}-24:00 未被任何时间段覆盖。"})
+    return issues
+
+
+def minute_of_day(dt: datetime) -> float:
+    """
+    @brief 计算 datetime 在当天内的分钟偏移（含秒的小数部分）。
+    @param dt 时间对象
+    @return 0~1440 之间的浮点分钟数，如 08:30:30 -> 510.5
+    """
+    return dt.hour * 60 + dt.minute + (dt.second + dt.microsecond / 1_000_000) / 60
+
+
+class PlanTimeline:
+    """
+    @class PlanTimeline
+    @brief 预编译的计划时间轴，用整数分钟数组表示各任务段。
+
+    @details
+    在计划加载/切换时由已按开始时间排序的任务列表构建一次，
+    之后“当前段”、“下一个边界”、“已过比例”等查询均通过 bisect 完成，
+    无需再拆分字符串或调用 strptime。
+    所有查询参数 minute 为当天分钟偏移，可由 minute_of_day() 得到。
+    """
+
+    __slots__ = ("starts", "ends", "bounds")
+
+    def __init__(self, tasks: list[dict]):
+        """
+        @brief 由任务列表构建时间轴。
+        @param tasks 按开始时间排序的任务列表，每项含 "time" 字段，如 "08:00-10:00"
+        """
+        self.starts = array("H")
+        self.ends = array("H")
+        for task in tasks:
+            start_str, end_str = task["time"].split("-")
+            self.starts.append(time_to_minutes(start_str))
+            self.ends.append(time_to_minutes(end_str))
+        self.bounds = array("H", sorted(set(self.starts) | set(self.ends)))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def segment_at(self, minute: float) -> int:
+        """
+        @brief 查找包含指定时刻的任务段。
+        @param minute 当天分钟偏移
+        @return 任务段下标；若该时刻不在任何段内则返回 -1
+        """
+        i = bisect_right(self.starts, minute) - 1
+        if i >= 0 and minute < self.ends[i]:
+            return i
+        return -1
+
+    def phase(self, index: int, minute: float) -> str:
+        """
+        @brief 判断任务段相对指定时刻所处的阶段。
+        @param index 任务段下标
+        @param minute 当天分钟偏移
+        @return "future"（未开始）、"now"（进行中）或 "past"（已结束）
+        """
+        if self.starts[index] > minute:
+            return "future"
+        if minute < self.ends[index]:
+            return "now"
+        return "past"
+
+    def next_boundary(self, minute: float):
+        """
+        @brief 查找严格晚于指定时刻的下一个段开始/结束时刻。
+        @param minute 当天分钟偏移
+        @return 下一个边界的分钟偏移；若当天已无边界则返回 None
+        """
+        i = bisect_right(self.bounds, minute)
+        return self.bounds[i] if i < len(self.bounds) else None
+
+    def elapsed_fraction(self, index: int, minute: float) -> float:
+        """
+        @brief 计算任务段已经过去的比例。
+        @param index 任务段下标
+        @param minute 当天分钟偏移
+        @return 0~1 之间的比例
+        """
+        start, end = self.starts[index], self.ends[index]
+        return min(max(0.0, (minute - start) / max(1, end - start)), 1.0)
+
+    def span_fraction(self, minute: float) -> float:
+        """
+        @brief 计算从第一个段开始到最后一个段结束整体已过去的比例。
+        @param minute 当天分钟偏移
+        @return 0~1 之间的比例；空计划返回 0
+        """
+        if not self.starts:
+            return 0.0
+        first, last = self.starts[0], self.ends[-1]
+        return min(max(0.0, (minute - first) / max(1, last - first)), 1.0)
+
+
+class IntervalIndex:
+    """
+    @class IntervalIndex
+    @brief 按开始时间排序、可按行增量更新的区间集合，用于编辑时的实时校验。
+
+    @details
+    每行（以调用方给定的、可相互比较的行键区分，如整数 id）最多对应一个区间。
+    与 validate_intervals 的扫描相同，按排序维护“前缀最远结束时间”（reach）及其所属行：
+    - 第 i 个区间开始早于前 i 个区间的 reach 即为重叠（与拥有 reach 的行重叠），
+      晚于 reach 即存在空档；reach 最终不到 24:00 时末尾也有空档；
+    - 嵌套区间（如 00:00-12:00 内的 01:00-02:00）不会被误报为空档。
+    更新某行时二分定位插入/删除，从变化位置起重算 reach 与各处的空档/重叠，
+    一旦某处的 reach 与更新前相同即停止（其后的结果都不会改变），
+    因此通常只涉及被编辑的行及其相邻行；只有改动影响到其后许多行的 reach 时
+    （如改为覆盖全天的区间），代价才是 O(n - i)。
+    空档总分钟数、空档数与重叠数按差值更新；只返回冲突情况确实改变的行。
+    """
+
+    def __init__(self):
+        self.keys = []        # [(start, end, row)]，按 (start, end) 排序
+        self.rows = {}        # row -> (start, end)
+        self.reach = []       # reach[i]：keys[0..i] 的最远结束时间
+        self.reach_row = []   # reach_row[i]：拥有 reach[i] 的行
+        self._edges = [(DAY_MINUTES, 1, 0)]  # 第 i 处（keys[i] 之前；末尾为 24:00 之前）的 (空档分钟, 空档数, 重叠数)
+        self._conflicts = {}  # row -> 上次计算的冲突行元组
+        self.gap_minutes = DAY_MINUTES
+        self.gap_count = 1
+        self.overlap_count = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _index(self, row) -> int:
+        start, end = self.rows[row]
+        return bisect_right(self.keys, (start, end, row)) - 1
+
+    def _edge(self, i: int):
+        prev_end = self.reach[i - 1] if i > 0 else 0
+        next_start = self.keys[i][0] if i < len(self.keys) else DAY_MINUTES
+        gap = max(0, next_start - prev_end)
+        return gap, 1 if gap else 0, 1 if 0 < i < len(self.keys) and next_start < prev_end else 0
+
+    def _rebuild_from(self, first: int, tail: int, shift: int) -> int:
+        """
+        @brief 从第 first 个区间起重算 reach 与各处的空档/重叠，并按差值更新汇总。
+        @param first 第一个可能变化的下标（之前的区间与 reach 均未改变）
+        @param tail 下标不小于 tail 的区间即更新前下标为 i + shift 的区间
+        @param shift 更新前后同一区间的下标差（删除一行为 1，插入一行为 -1）
+        @return 最后一个重算的区间下标；其后的 reach、空档/重叠与冲突均与更新前相同
+        """
+        count = len(self.keys)
+        old_reach, old_reach_row = self.reach, self.reach_row
+        reach, reach_row = old_reach[:first], old_reach_row[:first]
+        last, stopped = count - 1, False
+        for i in range(first, count):
+            end, row = self.keys[i][1:]
+            if reach and reach[-1] >= end:
+                reach.append(reach[-1])
+                reach_row.append(reach_row[-1])
+            else:
+                reach.append(end)
+                reach_row.append(row)
+            if i >= tail and reach[i] == old_reach[i + shift] and reach_row[i] == old_reach_row[i + shift]:
+                last, stopped = i, True
+                break
+        self.reach = reach + old_reach[last + 1 + shift:]
+        self.reach_row = reach_row + old_reach_row[last + 1 + shift:]
+
+        # 停止处之后的一处空档/重叠只取决于未变的 reach 与区间；未停止时末尾（24:00 之前）也要重算
+        edge_end = last if stopped else count
+        for gap, gaps, overlaps in self._edges[first:edge_end + shift + 1]:
+            self.gap_minutes -= gap
+            self.gap_count -= gaps
+            self.overlap_count -= overlaps
+        edges = [self._edge(i) for i in range(first, edge_end + 1)]
+        for gap, gaps, overlaps in edges:
+            self.gap_minutes += gap
+            self.gap_count += gaps
+            self.overlap_count += overlaps
+        self._edges[first:edge_end + shift + 1] = edges
+        return last
+
+    def _compute_conflicts(self, i: int) -> tuple:
+        start, end, _ = self.keys[i]
+        result = []
+        if i > 0 and start < self.reach[i - 1]:
+            result.append(self.reach_row[i - 1])
+        # 之后的区间按开始时间排序，若有与本行重叠的，紧随其后的一个必然重叠
+        if i + 1 < len(self.keys) and self.keys[i + 1][0] < end:
+            result.append(self.keys[i + 1][2])
+        return tuple(result)
+
+    def set(self, row, interval) -> set:
+        """
+        @brief 设置/清除某行的区间。
+        @param row 行键（任意可哈希、可比较的对象）
+        @param interval (start, end) 分钟元组；None 表示该行当前没有合法区间
+        @return 冲突情况可能因此改变的行键集合（包括该行本身）
+        """
+        affected = {row}
+        first, tail, shift = len(self.keys), 0, 0
+        if row in self.rows:
+            i = self._index(row)
+            del self.keys[i]
+            del self.rows[row]
+            self._conflicts.pop(row, None)
+            first, tail, shift = i, i, 1
+        if interval is not None:
+            key = (interval[0], interval[1], row)
+            i = bisect_right(self.keys, key)
+            self.keys.insert(i, key)
+            self.rows[row] = tuple(interval)
+            first, tail, shift = min(first, i), max(tail + shift, i + 1), shift - 1
+        last = self._rebuild_from(first, tail, shift)
+
+        # 前一个区间的“后邻”可能改变；直到停止处的各区间的 reach 可能改变
+        for i in range(max(0, first - 1), last + 1):
+            other = self.keys[i][2]
+            conflicts = self._compute_conflicts(i)
+            if self._conflicts.get(other) != conflicts:
+                self._conflicts[other] = conflicts
+                affected.add(other)
+                affected.update(conflicts)
+        return affected
+
+    def conflicts(self, row) -> list:
+        """
+        @brief 查询与某行重叠的行：拥有此前最远结束时间的行，以及排序中紧随其后且重叠的行。
+        @param row 行键
+        @return 重叠的行键列表（无区间或无重叠时为空）
+        """
+        if row not in self.rows:
+            return []
+        return list(self._conflicts.get(row, ()))